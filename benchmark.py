@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# Banc d'essai des performances du générateur et de l'analyseur pour MatrixSec - By ScriptSeinsei
+
+import argparse
+import contextlib
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows : pas de mesure de la mémoire maximale
+    resource = None
+
+# Graine des données synthétiques : les mêmes entrées d'une version à l'autre
+DATA_SEED = 1337
+
+SYLLABLES = ("ad", "min", "pass", "word", "se", "cret", "net", "work", "ma", "trix", "cy", "ber",
+             "ro", "ot", "log", "in", "sys", "tem", "fi", "re", "wall", "da", "ta", "base")
+LEAK_SPECIALS = "!@#$%*._-"
+LEAK_ACCENTS = "éèàçùêôï"
+
+# Tailles des données pour --scale 1
+SEED_WORDS = 40
+LOAD_WORDS = 200000
+LEAK_LINES = 500000
+GENERATE_LINES = 3000000  # Plafond --max-combinations des scénarios de génération
+
+def make_words(count, rng):
+    """
+    Mots synthétiques distincts de 2 à 4 syllabes, ordre reproductible.
+    """
+    words = {}
+    while len(words) < count:
+        word = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if len(words) >= len(SYLLABLES) ** 2:
+            word += str(len(words))
+        words[word] = None
+    return list(words)
+
+def _leak_password(rng, words):
+    """Un mot de passe aux formes courantes des fuites (mot, casse, chiffres, années, symboles)."""
+    word = rng.choice(words)
+    form = rng.random()
+    if form < 0.25:
+        return word
+    if form < 0.45:
+        return word.capitalize() + str(rng.randint(0, 999))
+    if form < 0.6:
+        return word + str(rng.randint(1950, 2025))
+    if form < 0.7:
+        return word.upper() + rng.choice(LEAK_SPECIALS)
+    if form < 0.8:
+        return str(rng.randint(0, 10 ** rng.randint(4, 9)))
+    if form < 0.9:
+        return word.replace('a', '@').replace('o', '0').replace('e', '3') + rng.choice(LEAK_SPECIALS)
+    if form < 0.97:
+        alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789" + LEAK_SPECIALS
+        return ''.join(rng.choice(alphabet) for _ in range(rng.randint(8, 16)))
+    return word + rng.choice(LEAK_ACCENTS) + str(rng.randint(0, 99))
+
+def write_leak_corpus(path, count, rng):
+    """
+    Écrit un corpus de type fuite : formes courantes, mots de passe populaires
+    répétés, quelques lignes accentuées en UTF-8 et une sur mille en latin-1.
+    :return: Taille du fichier en octets
+    """
+    words = make_words(2000, rng)
+    popular = [_leak_password(rng, words) for _ in range(200)]
+    with open(path, 'wb') as f:
+        lines = []
+        for number in range(count):
+            # Loi de popularité : un tiers des lignes reprend un mot de passe fréquent
+            if rng.random() < 0.33:
+                password = popular[int(len(popular) * rng.random() ** 3)]
+            else:
+                password = _leak_password(rng, words)
+            lines.append(password.encode('latin-1' if number % 1000 == 999 else 'utf-8'))
+            if len(lines) >= 65536:
+                f.write(b'\n'.join(lines) + b'\n')
+                lines = []
+        if lines:
+            f.write(b'\n'.join(lines) + b'\n')
+    return os.path.getsize(path)
+
+def prepare_data(directory, scale):
+    """
+    Crée les données synthétiques des scénarios dans directory.
+    :return: Dict des chemins et des tailles
+    """
+    rng = random.Random(DATA_SEED)
+    seeds = make_words(SEED_WORDS, rng)
+    words = make_words(int(LOAD_WORDS * scale), rng)
+    data = {
+        'seeds_file': os.path.join(directory, 'graines.txt'),
+        'words_file': os.path.join(directory, 'mots.txt'),
+        'leak_file': os.path.join(directory, 'fuite.txt'),
+        'leak_lines': int(LEAK_LINES * scale),
+        'generate_lines': int(GENERATE_LINES * scale),
+        'output': os.path.join(directory, 'sortie.txt'),
+    }
+    with open(data['seeds_file'], 'w', encoding='utf-8') as f:
+        f.write('\n'.join(seeds) + '\n')
+    with open(data['words_file'], 'w', encoding='utf-8') as f:
+        f.write('\n'.join(words) + '\n')
+    data['words_bytes'] = os.path.getsize(data['words_file'])
+    data['leak_bytes'] = write_leak_corpus(data['leak_file'], data['leak_lines'], rng)
+    return data
+
+def _timed(stages, name, fn, *args, **kwargs):
+    """Exécute fn en mesurant sa durée dans stages[name]."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    stages[name] = stages.get(name, 0.0) + time.perf_counter() - start
+    return result
+
+def bench_load(data, params):
+    from wordlist_gen import load_words_from_file
+    stages = {}
+    words = _timed(stages, 'load_words_from_file', load_words_from_file, data['words_file'])
+    return {'items': len(words), 'bytes': data['words_bytes'], 'stages': stages, 'stage': 'load_words_from_file'}
+
+def bench_generate(data, params):
+    from wordlist_gen import WordlistOptions, _count_lines, generate_wordlist, load_words_from_file
+    from sources import parse_source
+    stages = {}
+    words = _timed(stages, 'load_words_from_file', load_words_from_file, data['seeds_file'])
+    options = dict(params.get('options', {}), max_combinations=data['generate_lines'])
+    options['suffixes'] = [parse_source(spec, 1950, 2025) for spec in options.get('suffixes', [])]
+    if os.path.exists(data['output']):
+        os.remove(data['output'])
+    _timed(stages, 'generate_wordlist', generate_wordlist, words, data['output'], WordlistOptions(**options))
+    return {'items': _count_lines(data['output']), 'bytes': os.path.getsize(data['output']), 'stages': stages,
+            'stage': 'generate_wordlist'}
+
+def bench_strength(data, params):
+    from password_analyzer import analyze_password_strength
+    with open(data['leak_file'], 'rb') as f:
+        passwords = [line.decode('utf-8', 'replace') for line in f.read().splitlines()[:params['count']]]
+    stages = {}
+    start = time.perf_counter()
+    for password in passwords:
+        analyze_password_strength(password)
+    stages['analyze_password_strength'] = time.perf_counter() - start
+    return {'items': len(passwords), 'bytes': None, 'stages': stages, 'stage': 'analyze_password_strength'}
+
+def bench_analyze(data, params):
+    from password_analyzer import analyze_wordlist
+    stages = {}
+    sample = params.get('sample')
+    stats = _timed(stages, 'analyze_wordlist', analyze_wordlist, data['leak_file'], sample_size=sample,
+                   workers=params.get('workers', 1), seed=DATA_SEED)
+    if stats is None:
+        raise RuntimeError(f"l'analyse de {data['leak_file']} a échoué")
+    # Mots de passe réellement analysés : un échantillon peut dépasser la taille du corpus
+    return {'items': stats['total'], 'bytes': None if sample else data['leak_bytes'], 'stages': stages,
+            'stage': 'analyze_wordlist'}
+
+# Scénarios : (nom, fonction, paramètres, unité du débit)
+# Chaque fonction renvoie le nombre d'éléments traités, les octets lus ou écrits,
+# la durée de chaque étape et le nom de l'étape mesurée ('stage')
+SCENARIOS = (
+    ('load_words', bench_load, {}, 'mots/s'),
+    ('generate_combinations', bench_generate,
+     {'options': {'max_length': 4, 'case_variants': True, 'special_chars': list('!@#$%'), 'append_special': True}}, 'candidats/s'),
+    ('generate_suffixes', bench_generate,
+     {'options': {'max_length': 3, 'case_variants': True, 'suffixes': ['year']}}, 'candidats/s'),
+    ('generate_template', bench_generate,
+     {'options': {'template': '{word}?d?d?d?s', 'case_variants': True}}, 'candidats/s'),
+    ('generate_workers', bench_generate,
+     {'options': {'max_length': 4, 'case_variants': True, 'special_chars': list('!@#$%'), 'append_special': True,
+                  'workers': 4}}, 'candidats/s'),
+    ('password_strength', bench_strength, {'count': 100000}, 'mdp/s'),
+    ('analyze_full', bench_analyze, {}, 'mdp/s'),
+    ('analyze_workers', bench_analyze, {'workers': 4}, 'mdp/s'),
+    ('analyze_sample', bench_analyze, {'sample': 50000}, 'mdp/s'),
+)
+
+def peak_rss_mb():
+    """
+    Mémoire résidente maximale du processus et de ses sous-processus (le plus
+    gros d'entre eux), en Mo ; None si le système ne la fournit pas.
+    """
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss est en Ko sous Linux, en octets sous macOS
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+def _run_scenario(queue, fn, data, params):
+    """Exécute un scénario dans un processus neuf, sans affichage, et renvoie ses mesures."""
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            start = time.perf_counter()
+            result = fn(data, params)
+            result['seconds'] = time.perf_counter() - start
+        result['peak_rss_mb'] = peak_rss_mb()
+        queue.put(result)
+    except Exception as e:
+        queue.put({'error': f"{type(e).__name__}: {e}"})
+
+def run_scenario(fn, data, params):
+    """
+    Lance un scénario dans un processus séparé : la mémoire maximale mesurée
+    est celle du scénario seul, et aucun cache ne passe d'une mesure à l'autre.
+    """
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=_run_scenario, args=(queue, fn, data, params))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def measure(name, fn, params, unit, data, repeat):
+    """
+    Mesure un scénario repeat fois et garde la meilleure exécution (la moins
+    perturbée par le reste du système).
+    :return: Dict des mesures (débits, durées par étape, mémoire maximale)
+    """
+    runs = [run_scenario(fn, data, params) for _ in range(repeat)]
+    errors = [run['error'] for run in runs if 'error' in run]
+    if errors:
+        return {'name': name, 'error': errors[0]}
+    best = min(runs, key=lambda run: run['seconds'])
+    seconds = best['seconds']
+    # Les débits portent sur l'étape mesurée par le scénario (sans le chargement des graines)
+    work = best['stages'][best['stage']]
+    result = {
+        'name': name,
+        'unit': unit,
+        'items': best['items'],
+        'bytes': best['bytes'],
+        'stage': best['stage'],
+        'seconds': round(seconds, 4),
+        'times': [round(run['seconds'], 4) for run in runs],
+        'rate': best['items'] / work if work else None,
+        'mb_per_s': best['bytes'] / (1024 * 1024) / work if work and best['bytes'] else None,
+        'stages': {stage: round(value, 4) for stage, value in best['stages'].items()},
+        'peak_rss_mb': max((run['peak_rss_mb'] for run in runs if run['peak_rss_mb'] is not None), default=None),
+    }
+    return result
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare_results(current, baseline, tolerance):
+    """
+    Compare les débits à ceux d'un fichier de référence.
+    :return: Liste de tuples (nom, débit de référence, débit actuel, écart relatif, régression ?)
+    """
+    reference = {result['name']: result for result in baseline.get('results', []) if result.get('rate')}
+    rows = []
+    for result in current['results']:
+        old = reference.get(result['name'])
+        if old is None or not result.get('rate'):
+            continue
+        change = result['rate'] / old['rate'] - 1
+        rows.append((result['name'], old['rate'], result['rate'], change, change < -tolerance))
+    return rows
+
+def _format_rate(value):
+    return "-" if value is None else f"{value:,.0f}".replace(',', ' ')
+
+def print_results(results):
+    print(f"\n{'Scénario':<24}{'Débit':>16} {'':<12}{'Mo/s':>8}{'Temps (s)':>11}{'RSS max (Mo)':>14}")
+    for result in results['results']:
+        if 'error' in result:
+            print(f"{result['name']:<24}Erreur : {result['error']}")
+            continue
+        mb_per_s = "-" if result['mb_per_s'] is None else f"{result['mb_per_s']:.1f}"
+        rss = "-" if result['peak_rss_mb'] is None else f"{result['peak_rss_mb']:.0f}"
+        print(f"{result['name']:<24}{_format_rate(result['rate']):>16} {result['unit']:<12}{mb_per_s:>8}"
+              f"{result['seconds']:>11.2f}{rss:>14}")
+        for stage, seconds in result['stages'].items():
+            print(f"  {stage:<30}{seconds:>9.3f} s")
+
+def print_comparison(rows, baseline_file, tolerance):
+    print(f"\nComparaison avec {baseline_file} (tolérance {tolerance:.0%}) :")
+    for name, old, new, change, regression in rows:
+        flag = "  RÉGRESSION" if regression else ""
+        print(f"{name:<24}{_format_rate(old):>16} -> {_format_rate(new):>14}  {change:+.1%}{flag}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Banc d'essai des performances - MatrixSec",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--output', type=str, help='Fichier JSON des résultats')
+    parser.add_argument('--compare', type=str, help='Fichier JSON de référence (résultats d\'une version précédente)')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='Baisse de débit tolérée avant de signaler une régression')
+    parser.add_argument('--scale', type=float, default=1.0, help='Facteur de taille des corpus synthétiques')
+    parser.add_argument('--repeat', type=int, default=3, help='Nombre d\'exécutions par scénario (la meilleure est gardée)')
+    parser.add_argument('--only', nargs='+', choices=[name for name, _, _, _ in SCENARIOS], help='Scénarios à exécuter')
+    parser.add_argument('--workdir', type=str, help='Répertoire des données et des sorties (défaut : répertoire temporaire)')
+
+    args = parser.parse_args()
+
+    if args.repeat < 1 or args.scale <= 0:
+        print("Erreur : --repeat doit être supérieur ou égal à 1 et --scale positif.")
+        return 2
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Erreur : fichier de référence {args.compare} : {e}")
+            return 2
+
+    directory = tempfile.mkdtemp(prefix='matrixsec-bench-', dir=args.workdir)
+    try:
+        print(f"Préparation des données (échelle {args.scale})...")
+        data = prepare_data(directory, args.scale)
+        results = {
+            'revision': _git_revision(),
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'scale': args.scale,
+            'repeat': args.repeat,
+            'results': [],
+        }
+        for name, fn, params, unit in SCENARIOS:
+            if args.only and name not in args.only:
+                continue
+            print(f"Scénario {name}...")
+            results['results'].append(measure(name, fn, params, unit, data, args.repeat))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\nRésultats enregistrés dans {args.output}")
+    if baseline is not None:
+        rows = compare_results(results, baseline, args.tolerance)
+        print_comparison(rows, args.compare, args.tolerance)
+        if any(row[4] for row in rows):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
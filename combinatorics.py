@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# Outils combinatoires pour MatrixSec - By ScriptSeinsei
+
+import bisect
+import itertools
+from math import comb
+
+
+def count_combinations(n, k):
+    """
+    Nombre de combinaisons de k éléments parmi n (coefficient binomial).
+    """
+    if k < 0 or k > n:
+        return 0
+    return comb(n, k)
+
+def unrank_combination(n, k, index):
+    """
+    Retourne les indices de la combinaison de rang `index` dans l'ordre
+    lexicographique produit par itertools.combinations(range(n), k).
+    """
+    if not 0 <= index < count_combinations(n, k):
+        raise IndexError(f"rang {index} hors de l'espace C({n}, {k})")
+    result = []
+    x = 0
+    for i in range(k):
+        # Sauter les blocs de combinaisons dont l'élément i est x
+        while True:
+            block = comb(n - x - 1, k - i - 1)
+            if index < block:
+                break
+            index -= block
+            x += 1
+        result.append(x)
+        x += 1
+    return tuple(result)
+
+def iter_combinations(pool, k, start=0, stop=None):
+    """
+    Parcourt les combinaisons de `pool` de rang start (inclus) à stop (exclu),
+    dans l'ordre d'itertools.combinations, sans énumérer celles qui précèdent.
+    """
+    pool = tuple(pool)
+    n = len(pool)
+    total = count_combinations(n, k)
+    stop = total if stop is None else min(stop, total)
+    if start >= stop:
+        return
+    if start == 0:
+        yield from itertools.islice(itertools.combinations(pool, k), stop)
+        return
+    yield from itertools.islice(_iter_from(pool, unrank_combination(n, k, start)), stop - start)
+
+def _iter_from(pool, first):
+    """
+    Combinaisons de `pool` supérieures ou égales à `first` (indices), dans l'ordre.
+    """
+    n = len(pool)
+    k = len(first)
+    yield tuple(pool[x] for x in first)
+    # Après `first` viennent, pour d = k-1 .. 0, les combinaisons qui partagent
+    # le préfixe first[:d] et dont l'élément d est strictement plus grand.
+    for d in range(k - 1, -1, -1):
+        prefix = tuple(pool[x] for x in first[:d])
+        for v in range(first[d] + 1, n - (k - d - 1)):
+            head = prefix + (pool[v],)
+            for tail in itertools.combinations(pool[v + 1:], k - d - 1):
+                yield head + tail
+
+def _length_index(lengths, depth):
+    """
+    Index des longueurs triées de chaque suffixe de la liste : smallest[j][p] et
+    largest[j][p] sont les sommes des j plus petites et des j plus grandes
+    longueurs parmi lengths[p:], pour j < depth (None s'il y a moins de j éléments).
+    """
+    n = len(lengths)
+    smallest = [[0] * (n + 1)] + [[None] * (n + 1) for _ in range(depth - 1)]
+    largest = [[0] * (n + 1)] + [[None] * (n + 1) for _ in range(depth - 1)]
+    low, high = [], []
+    for p in range(n - 1, -1, -1):
+        bisect.insort(low, lengths[p])
+        bisect.insort(high, lengths[p])
+        del low[depth:], high[:-depth]
+        for j in range(1, min(depth, n - p + 1)):
+            smallest[j][p] = sum(low[:j])
+            largest[j][p] = sum(high[-j:])
+    return smallest, largest
+
+def iter_combinations_pruned(pool, k, lengths, low=0, high=None, start=0, stop=None):
+    """
+    Comme enumerate(iter_combinations(pool, k, start, stop)), mais ne produit que
+    les combinaisons dont la somme des longueurs (lengths[i] pour pool[i]) est
+    comprise entre low et high (None : pas de maximum).
+    Les combinaisons écartées ne sont jamais assemblées : un index des longueurs
+    triées élague d'un coup tous les préfixes qui ne peuvent plus aboutir, et le
+    dernier élément est choisi directement parmi les mots de la bonne longueur.
+    Les rangs ne changent pas : une reprise ou un découpage reste valable.
+    :return: Itérateur de tuples (rang - start, combinaison)
+    """
+    pool = tuple(pool)
+    n = len(pool)
+    total = count_combinations(n, k)
+    stop = total if stop is None else min(stop, total)
+    if high is None:
+        high = float('inf')
+    if start >= stop or k == 0:
+        return iter([(0, ())] if start < stop and low <= 0 <= high else [])
+    smallest, largest = _length_index(lengths, k)
+    # Mots de chaque longueur, par indice croissant : choix direct du dernier élément
+    by_length = {}
+    for x, length in enumerate(lengths):
+        by_length.setdefault(length, []).append(x)
+    known = sorted(by_length)
+
+    def last(first, prefix, used, base):
+        # Dernier élément parmi les indices [first, n) : rang base + (x - first)
+        x_low = first + max(0, start - base)
+        x_high = min(n, first + stop - base)
+        if x_low >= x_high:
+            return None
+        offset = base - first - start
+        lo, hi = bisect.bisect_left(known, low - used), bisect.bisect_right(known, high - used)
+        if lo == 0 and hi == len(known):
+            # Tous les mots restants conviennent : pas de sélection
+            return zip(range(x_low + offset, x_high + offset), map(prefix.__add__, zip(pool[x_low:x_high])))
+        runs = [by_length[length] for length in known[lo:hi]]
+        runs = [run[bisect.bisect_left(run, x_low):bisect.bisect_left(run, x_high)] for run in runs]
+        indices = runs[0] if len(runs) == 1 else sorted(itertools.chain.from_iterable(runs))
+        return zip(map(offset.__add__, indices), map(prefix.__add__, zip(map(pool.__getitem__, indices))))
+
+    def walk(depth, first, prefix, used, base):
+        # Élément `depth` parmi les indices [first, n - reste] ; base = rang de la première combinaison.
+        # Produit un itérateur par préfixe complet : le parcours des derniers éléments reste en C.
+        rest = k - depth - 1
+        if not rest:
+            run = last(first, prefix, used, base)
+            if run is not None:
+                yield run
+            return
+        for x in range(first, n - rest):
+            size = comb(n - x - 1, rest)
+            if base >= stop:
+                return
+            if base + size > start:
+                length = used + lengths[x]
+                if length + smallest[rest][x + 1] <= high and length + largest[rest][x + 1] >= low:
+                    yield from walk(depth + 1, x + 1, prefix + (pool[x],), length, base)
+            base += size
+
+    return itertools.chain.from_iterable(walk(0, 0, (), 0, 0))
+
+def split_ranks(total, parts):
+    """
+    Découpe [0, total) en au plus `parts` plages contiguës de tailles égales.
+    :return: Liste de tuples (start, stop)
+    """
+    parts = max(1, min(parts, total))
+    step, extra = divmod(total, parts)
+    ranges = []
+    start = 0
+    for p in range(parts):
+        stop = start + step + (1 if p < extra else 0)
+        if stop > start:
+            ranges.append((start, stop))
+        start = stop
+    return ranges
+
+def short_combination_counts(item_lengths, max_k, cap):
+    """
+    Compte les combinaisons dont la longueur totale est strictement inférieure à `cap`.
+    :param item_lengths: Liste de tuples (longueur en caractères, longueur en octets)
+    :return: Tuple (counts, byte_sums) où counts[k][L] est le nombre de combinaisons
+             de k éléments de longueur L, et byte_sums[k][L] leur taille cumulée en octets.
+    """
+    counts = [[0] * cap for _ in range(max_k + 1)]
+    byte_sums = [[0] * cap for _ in range(max_k + 1)]
+    counts[0][0] = 1
+    for length, size in item_lengths:
+        if length >= cap:
+            continue
+        for k in range(max_k - 1, -1, -1):
+            row, next_row = counts[k], counts[k + 1]
+            bytes_row, next_bytes = byte_sums[k], byte_sums[k + 1]
+            for total in range(cap - length - 1, -1, -1):
+                if row[total]:
+                    next_row[total + length] += row[total]
+                    next_bytes[total + length] += bytes_row[total] + row[total] * size
+    return counts, byte_sums
+
+def estimate_output(words, k, separator='', variant_growths=((0, 0),), min_chars=0, encoding='utf-8', max_chars=None):
+    """
+    Calcule exactement le nombre de lignes et d'octets produits pour les
+    combinaisons de k mots, sans les énumérer.
+    :param variant_growths: Liste de tuples (caractères ajoutés, octets ajoutés), un par variante.
+    :param max_chars: Longueur maximale des lignes (None : pas de maximum).
+    :return: Tuple (combinaisons, lignes, octets)
+    """
+    n = len(words)
+    combos = count_combinations(n, k)
+    if combos == 0:
+        return 0, 0, 0
+    if k == 0:
+        separator = ''  # La combinaison vide n'a pas de séparateur
+    sep_len = len(separator)
+    sep_bytes = len(separator.encode(encoding))
+    lengths = [(len(word) + sep_len, len(word.encode(encoding)) + sep_bytes) for word in words]
+
+    # Taille cumulée (sans retour à la ligne) de toutes les combinaisons
+    all_bytes = count_combinations(n - 1, k - 1) * sum(size for _, size in lengths) - combos * sep_bytes
+
+    # Combinaisons trop courtes (ou trop longues) pour au moins une variante : les
+    # compter par longueur. La longueur d'une combinaison vaut sum(len + sep) - sep,
+    # d'où le décalage.
+    cap = max(0, min_chars - min(growth for growth, _ in variant_growths))
+    if max_chars is not None:
+        cap = max(cap, max_chars + 1 - min(growth for growth, _ in variant_growths))
+    cap += sep_len
+    if cap > 0:
+        counts, byte_sums = short_combination_counts(lengths, k, cap)
+        short_counts, short_bytes = counts[k], byte_sums[k]
+    else:
+        short_counts, short_bytes = [], []
+
+    def below(length):
+        # Nombre et taille cumulée des combinaisons de moins de `length` caractères
+        threshold = min(max(0, length + sep_len), cap)
+        count = sum(short_counts[:threshold])
+        return count, sum(short_bytes[:threshold]) - count * sep_bytes
+
+    lines = 0
+    size = 0
+    for growth, growth_bytes in variant_growths:
+        kept, kept_bytes = combos, all_bytes
+        if max_chars is not None:
+            kept, kept_bytes = below(max_chars - growth + 1)
+        dropped, dropped_bytes = below(min_chars - growth)
+        kept, kept_bytes = max(0, kept - dropped), max(0, kept_bytes - dropped_bytes)
+        lines += kept
+        size += kept_bytes + kept * (growth_bytes + 1)
+    return combos, lines, size
+
+def line_length_counts(words, k, separator='', variant_growths=((0, 0),), cap=0):
+    """
+    Nombre de lignes de chaque longueur inférieure à `cap`, avant filtrage,
+    pour les combinaisons de k mots (voir short_combination_counts).
+    :return: Liste indexée par la longueur des lignes.
+    """
+    lines = [0] * max(0, cap)
+    if count_combinations(len(words), k) == 0:
+        return lines
+    if k == 0:
+        separator = ''
+    sep_len = len(separator)
+    shift = sep_len - min(growth for growth, _ in variant_growths)
+    if cap + shift <= 0:
+        return lines
+    counts, _ = short_combination_counts([(len(word) + sep_len, 0) for word in words], k, cap + shift)
+    for length, count in enumerate(counts[k]):
+        if count:
+            for growth, _ in variant_growths:
+                line_length = length - sep_len + growth
+                if 0 <= line_length < cap:
+                    lines[line_length] += count
+    return lines
+
+def count_product(sizes):
+    """
+    Nombre d'éléments du produit cartésien de pools de tailles `sizes`.
+    """
+    total = 1
+    for size in sizes:
+        total *= size
+    return total
+
+def unrank_product(sizes, index):
+    """
+    Indices de l'élément de rang `index` dans l'ordre d'itertools.product
+    (le dernier pool varie le plus vite).
+    """
+    if not 0 <= index < count_product(sizes):
+        raise IndexError(f"rang {index} hors du produit de taille {count_product(sizes)}")
+    digits = []
+    for size in reversed(sizes):
+        index, digit = divmod(index, size)
+        digits.append(digit)
+    return tuple(reversed(digits))
+
+def iter_product(pools, start=0, stop=None):
+    """
+    Parcourt le produit cartésien de `pools` de rang start (inclus) à stop (exclu),
+    dans l'ordre d'itertools.product, sans énumérer les éléments qui précèdent.
+    """
+    pools = [tuple(pool) for pool in pools]
+    total = count_product(len(pool) for pool in pools)
+    stop = total if stop is None else min(stop, total)
+    if start >= stop:
+        return
+    if start == 0:
+        yield from itertools.islice(itertools.product(*pools), stop)
+        return
+    first = unrank_product([len(pool) for pool in pools], start)
+    yield from itertools.islice(_product_from(pools, first), stop - start)
+
+def _product_from(pools, first):
+    """
+    Éléments du produit supérieurs ou égaux à `first` (indices), dans l'ordre.
+    """
+    yield tuple(pool[x] for pool, x in zip(pools, first))
+    # Comme pour les combinaisons : préfixe first[:d] fixé, élément d strictement plus grand
+    for d in range(len(pools) - 1, -1, -1):
+        prefix = tuple(pools[j][first[j]] for j in range(d))
+        for value in pools[d][first[d] + 1:]:
+            head = prefix + (value,)
+            for tail in itertools.product(*pools[d + 1:]):
+                yield head + tail
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# Écriture et lecture de wordlists compressées (gzip, zstd, lz4) pour MatrixSec - By ScriptSeinsei
+
+import collections
+import gzip
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import zstandard
+except ImportError:  # zstd optionnel : pip install zstandard
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:  # lz4 optionnel : pip install lz4
+    lz4 = None
+
+# Codec : (extension, niveau par défaut, nombre magique en tête de fichier)
+CODECS = {
+    'gzip': ('.gz', 6, b'\x1f\x8b'),
+    'zstd': ('.zst', 3, b'\x28\xb5\x2f\xfd'),
+    'lz4': ('.lz4', 0, b'\x04\x22\x4d\x18'),
+}
+
+_PACKAGES = {'zstd': 'zstandard', 'lz4': 'lz4'}
+
+# Taille des blocs compressés indépendamment (un membre gzip ou une trame zstd/lz4 chacun)
+COMPRESS_BLOCK_SIZE = 4 * 1024 * 1024
+
+def codec_from_path(path):
+    """Codec déduit de l'extension du fichier, ou None."""
+    lower = path.lower()
+    for codec, (extension, _, _) in CODECS.items():
+        if lower.endswith(extension):
+            return codec
+    return None
+
+def detect_codec(path):
+    """Codec déduit des premiers octets du fichier (quelle que soit son extension), ou None."""
+    with open(path, 'rb') as f:
+        head = f.read(4)
+    for codec, (_, _, magic) in CODECS.items():
+        if head.startswith(magic):
+            return codec
+    return None
+
+def check_codec(codec):
+    """
+    Vérifie que le module du codec est installé.
+    :raise ValueError: Si le codec est inconnu ou son module absent.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"compression inconnue {codec!r} (disponibles : {', '.join(CODECS)})")
+    if (codec == 'zstd' and zstandard is None) or (codec == 'lz4' and lz4 is None):
+        raise ValueError(f"la compression {codec} nécessite le paquet {_PACKAGES[codec]} (pip install {_PACKAGES[codec]})")
+
+def _compressor(codec, level):
+    """Fonction qui compresse un bloc en un membre (gzip) ou une trame (zstd, lz4) complet."""
+    if codec == 'gzip':
+        def compress(block):
+            # wbits=31 : en-tête et somme de contrôle gzip
+            compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+            return compressor.compress(block) + compressor.flush()
+        return compress
+    if codec == 'zstd':
+        # Un compresseur zstandard ne peut servir qu'à un thread à la fois : un par appel
+        return lambda block: zstandard.ZstdCompressor(level=level).compress(block)
+    return lambda block: lz4.frame.compress(block, compression_level=level)
+
+class CompressedWriter:
+    """
+    Compresse ce qui lui est écrit par blocs de block_size octets, dans un
+    groupe de threads (zlib, zstd et lz4 libèrent le GIL) : la compression se
+    fait pendant que la génération continue. Les blocs compressés sont écrits
+    dans l'ordre ; au plus 2 × threads blocs sont en attente.
+    Chaque bloc est un membre gzip ou une trame zstd/lz4 complet, et leur
+    concaténation est un fichier valide pour zcat, zstd -d, lz4 -d ou hashcat.
+    Après flush(), le fichier se termine sur une fin de bloc : la position
+    donnée par tell() est un point de reprise valable.
+    """
+
+    def __init__(self, raw, codec, level=None, threads=None, block_size=COMPRESS_BLOCK_SIZE):
+        check_codec(codec)
+        self.raw = raw
+        self.codec = codec
+        self.block_size = block_size
+        self.threads = threads or os.cpu_count() or 1
+        self.uncompressed = 0
+        self.compressed = 0
+        self._compress = _compressor(codec, CODECS[codec][1] if level is None else level)
+        self._executor = ThreadPoolExecutor(max_workers=self.threads)
+        self._pending = collections.deque()
+        self._buffer = bytearray()
+
+    def write(self, data):
+        self._buffer += data
+        if len(self._buffer) >= self.block_size:
+            self._submit()
+        return len(data)
+
+    def _submit(self):
+        block = bytes(self._buffer)
+        self._buffer.clear()
+        self.uncompressed += len(block)
+        self._pending.append(self._executor.submit(self._compress, block))
+        # Écrire les blocs déjà prêts ; attendre le plus ancien si trop de blocs sont en attente
+        while self._pending and (len(self._pending) > 2 * self.threads or self._pending[0].done()):
+            self._write_block(self._pending.popleft().result())
+
+    def _write_block(self, data):
+        self.raw.write(data)
+        self.compressed += len(data)
+
+    def flush(self):
+        """Compresse le bloc en cours et écrit tous les blocs en attente."""
+        if self._buffer:
+            self._submit()
+        while self._pending:
+            self._write_block(self._pending.popleft().result())
+        self.raw.flush()
+
+    def fileno(self):
+        return self.raw.fileno()
+
+    def tell(self):
+        return self.raw.tell()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+            self.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_decompressed(path, codec):
+    """
+    Ouvre un fichier compressé en lecture.
+    :return: Tuple (fichier brut, flux décompressé) ; raw.tell() donne la
+             position dans le fichier compressé (pour la progression).
+    """
+    check_codec(codec)
+    raw = open(path, 'rb')
+    if codec == 'gzip':
+        return raw, gzip.GzipFile(fileobj=raw, mode='rb')
+    if codec == 'zstd':
+        return raw, zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+    return raw, lz4.frame.LZ4FrameFile(raw, mode='rb')
+
+def iter_decompressed_blocks(path, codec, block_size):
+    """
+    Lit un fichier compressé par blocs d'environ block_size octets décompressés,
+    coupés sur des fins de ligne.
+    :return: Générateur de tuples (bloc, octets compressés lus depuis le bloc précédent)
+    """
+    raw, stream = open_decompressed(path, codec)
+    with raw, stream:
+        rest = b''
+        position = 0
+        while True:
+            data = stream.read(block_size)
+            if not data:
+                break
+            data = rest + data
+            end = data.rfind(b'\n') + 1
+            if not end:
+                # Ligne plus longue qu'un bloc : attendre la suite
+                rest = data
+                continue
+            rest = data[end:]
+            read = raw.tell() - position
+            position += read
+            yield data[:end], read
+        if rest:
+            yield rest, raw.tell() - position
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# Compteurs, chronomètres par étape et export des métriques pour MatrixSec - By ScriptSeinsei
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Nombre de combinaisons entre deux mises à jour de la progression (puissance de 2)
+BATCH_SIZE = 1024
+BATCH_MASK = BATCH_SIZE - 1
+
+class Metrics:
+    """
+    Compteurs et durées par étape d'un traitement, mis à jour par lots et jamais
+    par élément. Les boucles n'appellent que add() et add_time() ; un
+    MetricsReporter peut en publier l'état pendant l'exécution.
+    :param prefix: Préfixe des noms de métriques Prometheus (ex. 'matrixsec_generate').
+    :param stages: Étapes chronométrées, dans l'ordre d'affichage.
+    """
+
+    def __init__(self, prefix, stages):
+        self.prefix = prefix
+        self.stages = tuple(stages)
+        self.counters = {}
+        self.seconds = dict.fromkeys(self.stages, 0.0)
+        self.started = time.monotonic()
+
+    def add(self, **counts):
+        counters = self.counters
+        for name, count in counts.items():
+            counters[name] = counters.get(name, 0) + count
+
+    def add_time(self, stage, seconds):
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    def merge(self, snapshot):
+        """Ajoute les compteurs et durées d'un autre Metrics (ex. d'un processus fils, voir snapshot())."""
+        self.add(**snapshot['counters'])
+        for stage, seconds in snapshot['seconds'].items():
+            self.add_time(stage, seconds)
+
+    def snapshot(self):
+        """État courant, sérialisable en JSON."""
+        elapsed = time.monotonic() - self.started
+        counters = dict(self.counters)
+        return {
+            'elapsed': elapsed,
+            'counters': counters,
+            'seconds': dict(self.seconds),
+            'rates': {name: count / elapsed for name, count in counters.items()} if elapsed > 0 else {},
+        }
+
+    def prometheus(self):
+        """État courant au format texte de Prometheus."""
+        snapshot = self.snapshot()
+        prefix = self.prefix
+        lines = [f"# TYPE {prefix}_elapsed_seconds gauge", f"{prefix}_elapsed_seconds {snapshot['elapsed']:.3f}"]
+        for name, count in sorted(snapshot['counters'].items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {count}")
+        lines.append(f"# TYPE {prefix}_stage_seconds_total counter")
+        for stage, seconds in snapshot['seconds'].items():
+            lines.append(f'{prefix}_stage_seconds_total{{stage="{stage}"}} {seconds:.6f}')
+        return '\n'.join(lines) + '\n'
+
+    def summary(self):
+        """Résumé d'une ligne des durées par étape, pour la fin d'exécution."""
+        total = sum(self.seconds.values())
+        if not total:
+            return "aucune mesure"
+        return ", ".join(f"{stage} {seconds:.2f} s ({seconds / total:.0%})" for stage, seconds in self.seconds.items())
+
+class BatchClock:
+    """
+    Répartit la durée de chaque lot d'une boucle de génération entre les étapes,
+    avec deux mesures d'horloge par lot :
+    - write est mesuré exactement (TimedWriter, une mesure par bloc écrit) ;
+    - mutate et filter sont estimés sur une combinaison témoin du lot ;
+    - combine reçoit le reste (parcours des combinaisons, assemblage, tampons).
+    """
+
+    def __init__(self, metrics, lines=0):
+        self.metrics = metrics
+        self.lines = lines
+        self.sample = {}
+        self._mark = time.perf_counter()
+        self._write_mark = metrics.seconds.get('write', 0.0)
+
+    def batch(self, items, lines, sample=None):
+        """
+        :param items: Combinaisons traitées depuis le lot précédent.
+        :param lines: Total des lignes retenues à ce point (compteur de la boucle).
+        :param sample: Dict {étape: secondes} mesuré sur la combinaison témoin ;
+                       à défaut, la dernière mesure est réutilisée.
+        """
+        metrics = self.metrics
+        elapsed = time.perf_counter() - self._mark
+        written = metrics.seconds.get('write', 0.0) - self._write_mark
+        if sample:
+            self.sample = sample
+        estimated = 0.0
+        for stage, seconds in self.sample.items():
+            # L'estimation ne peut dépasser la durée réelle du lot
+            seconds = min(seconds * items, max(0.0, elapsed - written - estimated))
+            metrics.add_time(stage, seconds)
+            estimated += seconds
+        metrics.add_time('combine', max(0.0, elapsed - written - estimated))
+        metrics.add(combinations=items, lines=lines - self.lines)
+        self.lines = lines
+        self._mark = time.perf_counter()
+        self._write_mark = metrics.seconds.get('write', 0.0)
+
+class TimedWriter:
+    """
+    Enveloppe un fichier pour chronométrer ses écritures (étape 'write') et
+    compter les octets. À réserver aux écritures par blocs : une mesure par appel.
+    """
+
+    def __init__(self, f_out, metrics):
+        self.f_out = f_out
+        self.metrics = metrics
+
+    def write(self, data):
+        start = time.perf_counter()
+        written = self.f_out.write(data)
+        self.metrics.seconds['write'] += time.perf_counter() - start
+        self.metrics.add(bytes=len(data))
+        return written
+
+    def __getattr__(self, name):
+        return getattr(self.f_out, name)
+
+class _PrometheusHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = self.server.metrics.prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Pas de journal des requêtes : la sortie est celle du générateur
+
+class MetricsReporter:
+    """
+    Publie les métriques pendant l'exécution, depuis un thread à part : toutes
+    les `interval` secondes dans metrics_file (JSON si l'extension est .json,
+    sinon texte Prometheus, remplacé de façon atomique), et/ou à la demande sur
+    http://127.0.0.1:<port>/metrics. À utiliser comme gestionnaire de contexte :
+    une dernière écriture a lieu à la sortie.
+    """
+
+    def __init__(self, metrics, metrics_file=None, port=None, interval=10):
+        self.metrics = metrics
+        self.metrics_file = metrics_file
+        self.port = port
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+
+    def dump(self):
+        if not self.metrics_file:
+            return
+        if self.metrics_file.lower().endswith('.json'):
+            content = json.dumps(self.metrics.snapshot(), indent=2) + '\n'
+        else:
+            content = self.metrics.prometheus()
+        with open(self.metrics_file + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(self.metrics_file + '.tmp', self.metrics_file)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.dump()
+            except OSError:
+                pass  # Une écriture manquée ne doit pas interrompre la génération
+
+    def __enter__(self):
+        if self.port is not None:
+            self._server = ThreadingHTTPServer(('127.0.0.1', self.port), _PrometheusHandler)
+            self._server.daemon_threads = True
+            self._server.metrics = self.metrics
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        if self.metrics_file:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        self.dump()
@@ -2,12 +2,28 @@
 # Module d'analyse de mots de passe pour MatrixSec - By ScriptSeinsei
 
 import sys
+import os
 import re
 import math
+import mmap
+import heapq
+import random
+import string
+import itertools
+import io
+import csv
+import json
 import argparse
+import collections
+import contextlib
 import time
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from tqdm import tqdm
+from compression import check_codec, detect_codec, iter_decompressed_blocks
+from metrics import Metrics, MetricsReporter
 
 def print_banner():
     banner = """
@@ -25,196 +41,783 @@ def print_banner():
     """
     print(banner)
 
+# Classes de caractères, calculées en un seul passage avec str.translate :
+# a-z -> 'a', A-Z -> 'A', 0-9 -> '0', autres caractères ASCII -> '#'.
+# Les caractères non ASCII restent inchangés et comptent comme spéciaux.
+LOWER, UPPER, DIGIT, SPECIAL = 1, 2, 4, 8
+_CLASS_TABLE = str.maketrans({chr(c): '#' for c in range(128)})
+_CLASS_TABLE.update(str.maketrans(string.ascii_lowercase, 'a' * 26))
+_CLASS_TABLE.update(str.maketrans(string.ascii_uppercase, 'A' * 26))
+_CLASS_TABLE.update(str.maketrans(string.digits, '0' * 10))
+_CLASS_BITS = {'a': LOWER, 'A': UPPER, '0': DIGIT}
+
+# Taille du pool de caractères et log2 associé pour chaque combinaison de classes
+_POOL_SIZES = [(26 if m & LOWER else 0) + (26 if m & UPPER else 0) + (10 if m & DIGIT else 0)
+               + (33 if m & SPECIAL else 0) or 10 for m in range(16)]
+_POOL_BITS = [math.log2(size) for size in _POOL_SIZES]
+
+_REPEAT_RE = re.compile(r'(.)\1\1')
+_COMMON_RE = re.compile(r'(123|abc|qwerty|password|admin)')
+
+# Codes des problèmes (un bit chacun) et commentaires correspondants
+SHORT, GOOD_LENGTH, NO_CASE_MIX, NO_DIGIT, NO_SPECIAL, REPEATS, COMMON_SEQUENCE, LOW_ENTROPY, GOOD_ENTROPY, MEDIUM_ENTROPY = (1 << i for i in range(10))
+ISSUE_COMMENTS = {
+    SHORT: "Trop court",
+    GOOD_LENGTH: "Bonne longueur",
+    NO_CASE_MIX: "Manque de variation de casse",
+    NO_DIGIT: "Pas de chiffres",
+    NO_SPECIAL: "Pas de caractères spéciaux",
+    REPEATS: "Répétitions de caractères",
+    COMMON_SEQUENCE: "Contient des séquences communes",
+    LOW_ENTROPY: "Faible entropie ({:.1f} bits)",
+    GOOD_ENTROPY: "Bonne entropie ({:.1f} bits)",
+    MEDIUM_ENTROPY: "Entropie moyenne ({:.1f} bits)",
+}
+ENTROPY_ISSUES = LOW_ENTROPY | GOOD_ENTROPY | MEDIUM_ENTROPY
+# Libellés des codes de problèmes pour les sorties machine (sans valeur d'entropie)
+ISSUE_LABELS = {code: comment.split(" (")[0] for code, comment in ISSUE_COMMENTS.items()}
+STRENGTHS = ("Faible", "Moyen", "Fort")
+CLASS_NAMES = ((LOWER, "minuscules"), (UPPER, "majuscules"), (DIGIT, "chiffres"), (SPECIAL, "spéciaux"))
+
+# Nombre de meilleurs mots de passe conservés et largeur des tranches d'entropie (bits)
+TOP_K = 10
+ENTROPY_BUCKET = 10
+
+# Quantile de la loi normale pour les intervalles de confiance à 95 %
+CONFIDENCE_Z = 1.96
+# En mode aléatoire, en dessous de cette taille moyenne par mot de passe échantillonné,
+# un réservoir (un passage, sans remise) est plus sûr que des positions aléatoires
+RESERVOIR_BYTES_PER_SAMPLE = 64
+
+def character_classes(password):
+    """
+    Retourne le masque des classes de caractères (LOWER, UPPER, DIGIT, SPECIAL) en un seul passage.
+    """
+    mask = 0
+    for cls in set(password.translate(_CLASS_TABLE)):
+        mask |= _CLASS_BITS.get(cls, SPECIAL)
+    return mask
+
 def calculate_entropy(password):
     """
     Calcule l'entropie d'un mot de passe.
     L'entropie est une mesure de la prévisibilité d'un mot de passe.
     Plus l'entropie est élevée, plus le mot de passe est difficile à deviner.
     """
-    # Déterminer le pool de caractères
-    pool_size = 0
-    if re.search(r'[a-z]', password):
-        pool_size += 26
-    if re.search(r'[A-Z]', password):
-        pool_size += 26
-    if re.search(r'[0-9]', password):
-        pool_size += 10
-    if re.search(r'[^a-zA-Z0-9]', password):
-        pool_size += 33  # Caractères spéciaux communs
-
-    # Si aucun caractère n'est trouvé (ce qui est impossible), assignons un petit pool
-    if pool_size == 0:
-        pool_size = 10
-
-    # Calculer l'entropie
-    entropy = math.log2(pool_size) * len(password)
-    return entropy
+    # Le pool de caractères dépend des classes présentes (10 si aucune, ce qui est impossible)
+    return _POOL_BITS[character_classes(password)] * len(password)
 
-def analyze_password_strength(password):
+def score_password(password):
     """
-    Analyse la force d'un mot de passe et retourne un score et des commentaires.
+    Évalue un mot de passe sans construire de commentaires.
+    :return: Tuple (score, indice de force dans STRENGTHS, masque des problèmes, entropie, masque des classes)
     """
+    mask = character_classes(password)
+    length = len(password)
+    entropy = _POOL_BITS[mask] * length
     score = 0
-    comments = []
+    issues = 0
 
     # Longueur
-    if len(password) < 8:
-        comments.append("Trop court")
-    elif len(password) >= 12:
+    if length < 8:
+        issues |= SHORT
+    elif length >= 12:
         score += 2
-        comments.append("Bonne longueur")
+        issues |= GOOD_LENGTH
     else:
         score += 1
 
     # Complexité
-    if re.search(r'[a-z]', password) and re.search(r'[A-Z]', password):
+    if mask & LOWER and mask & UPPER:
         score += 1
     else:
-        comments.append("Manque de variation de casse")
-
-    if re.search(r'[0-9]', password):
+        issues |= NO_CASE_MIX
+    if mask & DIGIT:
         score += 1
     else:
-        comments.append("Pas de chiffres")
-
-    if re.search(r'[^a-zA-Z0-9]', password):
+        issues |= NO_DIGIT
+    if mask & SPECIAL:
         score += 1
     else:
-        comments.append("Pas de caractères spéciaux")
+        issues |= NO_SPECIAL
 
     # Motifs
-    if re.search(r'(.)\1\1', password):  # Trois caractères identiques consécutifs
+    if _REPEAT_RE.search(password):  # Trois caractères identiques consécutifs
         score -= 1
-        comments.append("Répétitions de caractères")
-
-    if re.search(r'(123|abc|qwerty|password|admin)', password.lower()):
+        issues |= REPEATS
+    if _COMMON_RE.search(password.lower()):
         score -= 1
-        comments.append("Contient des séquences communes")
+        issues |= COMMON_SEQUENCE
 
     # Entropie
-    entropy = calculate_entropy(password)
     if entropy < 40:
-        comments.append(f"Faible entropie ({entropy:.1f} bits)")
+        issues |= LOW_ENTROPY
     elif entropy > 60:
         score += 1
-        comments.append(f"Bonne entropie ({entropy:.1f} bits)")
+        issues |= GOOD_ENTROPY
     else:
-        comments.append(f"Entropie moyenne ({entropy:.1f} bits)")
+        issues |= MEDIUM_ENTROPY
 
     # Classification finale
-    strength = "Faible"
-    if score >= 4:
-        strength = "Fort"
-    elif score >= 2:
-        strength = "Moyen"
+    strength = 2 if score >= 4 else 1 if score >= 2 else 0
+    return score, strength, issues, entropy, mask
+
+def issue_comments(issues, entropy):
+    """
+    Traduit un masque de problèmes en commentaires, dans l'ordre des vérifications.
+    """
+    return [ISSUE_COMMENTS[code].format(entropy) for code in ISSUE_COMMENTS if issues & code]
 
+def analyze_password_strength(password):
+    """
+    Analyse la force d'un mot de passe et retourne un score et des commentaires.
+    """
+    score, strength, issues, entropy, _ = score_password(password)
     return {
         "score": score,
-        "strength": strength,
-        "comments": comments,
+        "strength": STRENGTHS[strength],
+        "comments": issue_comments(issues, entropy),
         "entropy": entropy
     }
 
-def analyze_wordlist(input_file, output_file=None, sample_size=None):
+def class_mix_label(mask):
+    """Nom d'une combinaison de classes de caractères (ex. « minuscules+chiffres »)."""
+    return "+".join(name for bit, name in CLASS_NAMES if mask & bit) or "aucune"
+
+def _new_partial_stats(top_k=TOP_K):
+    """Statistiques partielles d'un lot, fusionnables avec _merge_stats."""
+    return {
+        "total": 0,
+        "strengths": [0, 0, 0],
+        "sum_length": 0,
+        "sum_length_sq": 0,
+        # Longueurs cumulées par combinaison de classes : l'entropie en découle exactement
+        # (entiers), quel que soit le découpage en lots ou en processus
+        "class_lengths": [0] * 16,
+        "class_lengths_sq": [0] * 16,
+        "issues": {},
+        "lengths": {},
+        "entropies": {},
+        "classes": {},
+        "top_k": top_k,
+        "top_passwords": []
+    }
+
+def _top_key(entry):
+    return entry[1], entry[2]
+
+def score_batch(passwords, top_k=TOP_K, rows=None):
+    """
+    Analyse un lot de mots de passe et retourne ses statistiques partielles.
+    Les problèmes sont comptés par (code, entropie) : les commentaires ne sont
+    construits qu'une fois, à la fin. Les meilleurs mots de passe sont gardés
+    dans un tas borné à top_k éléments.
+    :param rows: Liste facultative qui reçoit un tuple (mot de passe, score, force,
+                 entropie, problèmes, classes) par mot de passe, pour la sortie détaillée.
+    """
+    stats = _new_partial_stats(top_k)
+    strengths = stats["strengths"]
+    issues_count = stats["issues"]
+    lengths = stats["lengths"]
+    entropies = stats["entropies"]
+    classes = stats["classes"]
+    # Tas minimum de (score, entropie, -position, mot de passe) : à égalité, le premier rencontré gagne
+    heap = []
+    class_lengths = stats["class_lengths"]
+    class_lengths_sq = stats["class_lengths_sq"]
+    for position, password in enumerate(passwords):
+        score, strength, issues, entropy, mask = score_password(password)
+        length = len(password)
+        class_lengths[mask] += length
+        class_lengths_sq[mask] += length * length
+        strengths[strength] += 1
+        lengths[length] = lengths.get(length, 0) + 1
+        bucket = int(entropy // ENTROPY_BUCKET)
+        entropies[bucket] = entropies.get(bucket, 0) + 1
+        classes[mask] = classes.get(mask, 0) + 1
+        if rows is not None:
+            rows.append((password, score, strength, entropy, issues, mask))
+        # Une clé par problème, l'entropie n'étant utile qu'aux commentaires d'entropie
+        for code in ISSUE_COMMENTS:
+            if issues & code:
+                key = (code, entropy) if code & ENTROPY_ISSUES else (code, None)
+                issues_count[key] = issues_count.get(key, 0) + 1
+        if score >= 4 and top_k > 0:
+            if len(heap) < top_k:
+                heapq.heappush(heap, (score, entropy, -position, password))
+            elif (score, entropy) > heap[0][:2]:
+                heapq.heapreplace(heap, (score, entropy, -position, password))
+    stats["total"] = len(passwords)
+    stats["sum_length"] = sum(class_lengths)
+    stats["sum_length_sq"] = sum(class_lengths_sq)
+    stats["top_passwords"] = [(password, score, entropy)
+                              for score, entropy, _, password in sorted(heap, reverse=True)]
+    return stats
+
+def _merge_counts(counts, partial):
+    for key, count in partial.items():
+        counts[key] = counts.get(key, 0) + count
+
+def _merge_stats(stats, partial):
+    """Ajoute les statistiques partielles d'un lot (dans l'ordre du fichier) à stats."""
+    stats["total"] += partial["total"]
+    for i, count in enumerate(partial["strengths"]):
+        stats["strengths"][i] += count
+    for name in ("sum_length", "sum_length_sq"):
+        stats[name] += partial[name]
+    for name in ("class_lengths", "class_lengths_sq"):
+        stats[name] = [a + b for a, b in zip(stats[name], partial[name])]
+    for name in ("issues", "lengths", "entropies", "classes"):
+        _merge_counts(stats[name], partial[name])
+    if partial["top_passwords"]:
+        # nlargest est stable : à égalité, les entrées déjà présentes (plus tôt dans le fichier) restent devant
+        stats["top_passwords"] = heapq.nlargest(stats["top_k"], stats["top_passwords"] + partial["top_passwords"],
+                                                key=_top_key)
+    return stats
+
+def _iter_batches(lines, batch_size, sample_size=None):
+    """
+    Regroupe les mots de passe non vides en lots, en s'arrêtant après sample_size mots de passe.
+    """
+    batch = []
+    remaining = sample_size
+    for line in lines:
+        password = line.strip()
+        if not password:
+            continue
+        batch.append(password)
+        if remaining is not None:
+            remaining -= 1
+            if remaining <= 0:
+                break
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+READ_BLOCK_SIZE = 8 * 1024 * 1024
+# Taille des blocs décompressés envoyés aux processus fils (fichiers compressés)
+DECOMPRESSED_BLOCK_SIZE = 32 * 1024 * 1024
+
+def _decode_block(block):
+    """
+    Décode un bloc de lignes en UTF-8 d'un seul coup ; en cas d'échec, décode
+    ligne par ligne et lit en latin-1 les lignes invalides (fréquentes dans les fuites).
+    """
+    try:
+        return block.decode('utf-8').split('\n')
+    except UnicodeDecodeError:
+        lines = []
+        for raw in block.split(b'\n'):
+            try:
+                lines.append(raw.decode('utf-8'))
+            except UnicodeDecodeError:
+                lines.append(raw.decode('latin-1'))
+        return lines
+
+def split_ranges(input_file, parts):
+    """
+    Découpe un fichier en au plus `parts` plages d'octets qui commencent et
+    finissent sur une limite de ligne, pour être lues indépendamment.
+    :return: Liste de tuples (début, fin)
+    """
+    size = os.path.getsize(input_file)
+    if size == 0:
+        return []
+    bounds = [0]
+    with open(input_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for i in range(1, parts):
+            newline = mm.find(b'\n', max(size * i // parts, bounds[-1]))
+            if newline == -1 or newline + 1 >= size:
+                break
+            if newline + 1 > bounds[-1]:
+                bounds.append(newline + 1)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+def iter_range_lines(input_file, start, end):
+    """
+    Lit les lignes de la plage [start, end) d'un fichier via mmap, par blocs
+    alignés sur les fins de ligne, décodés à la demande.
+    """
+    if start >= end or os.path.getsize(input_file) == 0:
+        return  # Plage vide : mmap refuse les fichiers vides
+    with open(input_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        position = start
+        while position < end:
+            stop = min(position + READ_BLOCK_SIZE, end)
+            if stop < end:
+                newline = mm.rfind(b'\n', position, stop)
+                # Ligne plus longue qu'un bloc : aller jusqu'à sa fin
+                stop = newline + 1 if newline != -1 else (mm.find(b'\n', stop, end) + 1 or end)
+            yield from _decode_block(mm[position:stop])
+            position = stop
+
+SCORE_FIELDS = ("password", "score", "strength", "entropy", "issues", "classes")
+
+def format_scores(rows, fmt):
+    """
+    Met en forme les scores détaillés d'un lot, en CSV ou en NDJSON (une ligne
+    par mot de passe). Force, problèmes et classes restent des codes entiers
+    (indice dans STRENGTHS et masques de bits) pour des fichiers compacts.
+    """
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerows(
+            (password, score, strength, round(entropy, 2), issues, mask)
+            for password, score, strength, entropy, issues, mask in rows)
+        return buffer.getvalue()
+    return ''.join(json.dumps(dict(zip(SCORE_FIELDS, (password, score, strength, round(entropy, 2), issues, mask))),
+                              ensure_ascii=False) + '\n'
+                   for password, score, strength, entropy, issues, mask in rows)
+
+def score_range(task, scores=None):
+    """
+    Analyse une plage d'octets du fichier (processus fils ou principal).
+    Les scores détaillés sont écrits au fil des lots dans scores (fichier ouvert,
+    processus principal) ou, à défaut, dans le fichier partiel de la tâche : la
+    mémoire reste bornée à un lot quelle que soit la taille de la plage.
+    :param task: Tuple (fichier, début, fin, taille des lots, nombre de meilleurs
+                 mots de passe, format des scores détaillés ou None, fichier partiel ou None)
+    :return: Tuple (statistiques partielles de la plage, fichier partiel écrit ou None,
+             durées par étape {'read', 'score', 'format'} en secondes)
+    """
+    input_file, start, end, batch_size, top_k, scores_format, part_file = task
+    return _score_part(iter_range_lines(input_file, start, end), batch_size, top_k, scores_format, part_file, scores)
+
+def score_block(task, scores=None):
+    """
+    Analyse un bloc de lignes déjà lu (fichier compressé, processus fils ou principal).
+    :param task: Tuple (bloc d'octets, taille des lots, nombre de meilleurs mots de
+                 passe, format des scores détaillés ou None, fichier partiel ou None,
+                 octets compressés lus)
+    :return: Comme score_range
+    """
+    block, batch_size, top_k, scores_format, part_file, _ = task
+    start = time.perf_counter()
+    lines = _decode_block(block)
+    decoded = time.perf_counter() - start
+    stats, part_file, seconds = _score_part(lines, batch_size, top_k, scores_format, part_file, scores)
+    seconds['read'] += decoded
+    return stats, part_file, seconds
+
+def _score_part(lines, batch_size, top_k, scores_format, part_file, scores):
+    """Analyse des lignes en écrivant les scores dans scores, sinon dans part_file (voir score_range)."""
+    if scores is None and scores_format and part_file:
+        with open(part_file, 'w', encoding='utf-8', newline='') as part:
+            stats, seconds = _score_lines(lines, batch_size, top_k, scores_format, part)
+        return stats, part_file, seconds
+    stats, seconds = _score_lines(lines, batch_size, top_k, scores_format, scores)
+    return stats, None, seconds
+
+def _score_lines(lines, batch_size, top_k, scores_format, scores=None):
+    """Analyse des lignes par lots : statistiques partielles et durées par étape ; scores détaillés écrits dans scores."""
+    stats = _new_partial_stats(top_k)
+    seconds = {'read': 0.0, 'score': 0.0, 'format': 0.0}
+    # Une mesure d'horloge par étape et par lot, jamais par mot de passe
+    mark = time.perf_counter()
+    for batch in _iter_batches(lines, batch_size):
+        read = time.perf_counter()
+        rows = [] if scores_format and scores is not None else None
+        _merge_stats(stats, score_batch(batch, top_k, rows))
+        scored = time.perf_counter()
+        if rows:
+            scores.write(format_scores(rows, scores_format))
+        formatted = time.perf_counter()
+        seconds['read'] += read - mark
+        seconds['score'] += scored - read
+        seconds['format'] += formatted - scored
+        mark = formatted
+    seconds['read'] += time.perf_counter() - mark
+    return stats, seconds
+
+def _open_uniform(rng):
+    """Tirage uniforme dans ]0, 1[ (sans 0, pour les logarithmes)."""
+    u = rng.random()
+    while u == 0.0:
+        u = rng.random()
+    return u
+
+def sample_random_offsets(input_file, sample_size, rng, max_attempts=None):
+    """
+    Échantillonne sample_size mots de passe (avec remise) en lisant des positions
+    aléatoires du fichier, sans le parcourir : O(échantillon) quelle que soit sa taille.
+    Une position tombe dans une ligne avec une probabilité proportionnelle à sa taille ;
+    la ligne n'est donc retenue qu'avec une probabilité 1 / taille, ce qui rend le
+    tirage uniforme sur les lignes. Les lignes vides sont ignorées.
+    """
+    size = os.path.getsize(input_file)
+    if size == 0:
+        return []
+    if max_attempts is None:
+        max_attempts = sample_size * 1000
+    sample = []
+    with open(input_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for _ in range(max_attempts):
+            offset = rng.randrange(size)
+            start = mm.rfind(b'\n', 0, offset) + 1
+            end = mm.find(b'\n', offset)
+            if end == -1:
+                end = size
+            # Positions couvertes par la ligne : ses octets et son retour à la ligne
+            weight = end - start + (1 if end < size else 0)
+            if rng.random() * weight >= 1:
+                continue
+            password = _decode_block(mm[start:end])[0].strip()
+            if password:
+                sample.append(password)
+                if len(sample) >= sample_size:
+                    break
+    return sample
+
+def sample_reservoir(lines, sample_size, rng):
+    """
+    Échantillonne sample_size mots de passe sans remise en un seul passage
+    (réservoir, algorithme L : les lignes non retenues sont sautées par blocs).
+    """
+    passwords = (password for password in (line.strip() for line in lines) if password)
+    reservoir = list(itertools.islice(passwords, sample_size))
+    if len(reservoir) < sample_size:
+        return reservoir
+    w = math.exp(math.log(_open_uniform(rng)) / sample_size)
+    while True:
+        skip = int(math.log(_open_uniform(rng)) / math.log(1 - w))
+        password = next(itertools.islice(passwords, skip, None), None)
+        if password is None:
+            return reservoir
+        reservoir[rng.randrange(sample_size)] = password
+        w *= math.exp(math.log(_open_uniform(rng)) / sample_size)
+
+def _wilson_interval(count, total, z=CONFIDENCE_Z):
+    """Intervalle de confiance de Wilson d'une proportion, en pourcentage."""
+    if not total:
+        return 0.0, 0.0
+    p = count / total
+    center = (p + z * z / (2 * total)) / (1 + z * z / total)
+    half = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / (1 + z * z / total)
+    return max(0.0, center - half) * 100, min(1.0, center + half) * 100
+
+def confidence_intervals(stats, z=CONFIDENCE_Z):
+    """
+    Intervalles de confiance à 95 % d'un rapport finalisé issu d'un échantillon :
+    proportions (Wilson) et demi-largeur pour les moyennes.
+    """
+    total = stats["total"]
+    intervals = {name: _wilson_interval(stats[name], total, z) for name in ("weak", "medium", "strong")}
+    for name in ("length", "entropy"):
+        intervals[f"avg_{name}"] = z * stats[f"std_{name}"] / math.sqrt(total) if total else 0.0
+    intervals["issues"] = {issue: _wilson_interval(count, total, z) for issue, count in stats["common_issues"]}
+    return intervals
+
+def _map_ordered(executor, fn, iterable, window, weight=len):
+    """
+    Comme executor.map, mais avec au plus `window` tâches en attente pour ne
+    pas charger tout le fichier en mémoire. Les résultats sont rendus dans
+    l'ordre, avec le poids de chaque tâche (pour la barre de progression).
+    """
+    pending = collections.deque()
+    for item in iterable:
+        pending.append((executor.submit(fn, item), weight(item)))
+        if len(pending) >= window:
+            future, size = pending.popleft()
+            yield future.result(), size
+    while pending:
+        future, size = pending.popleft()
+        yield future.result(), size
+
+def finalize_stats(stats):
+    """
+    Convertit les statistiques fusionnées au format du rapport (moyennes,
+    pourcentages, problèmes triés par fréquence).
+    """
+    total = stats["total"]
+    weak, medium, strong = stats.pop("strengths")
+    stats["weak"], stats["medium"], stats["strong"] = weak, medium, strong
+    # Entropie = bits du pool de la combinaison de classes x longueur
+    class_lengths, class_lengths_sq = stats.pop("class_lengths"), stats.pop("class_lengths_sq")
+    stats["sum_entropy"] = sum(bits * lengths for bits, lengths in zip(_POOL_BITS, class_lengths))
+    stats["sum_entropy_sq"] = sum(bits * bits * lengths for bits, lengths in zip(_POOL_BITS, class_lengths_sq))
+    stats["avg_length"] = stats.pop("sum_length") / total if total else 0
+    stats["avg_entropy"] = stats.pop("sum_entropy") / total if total else 0
+    # Écarts-types (échantillon), pour les intervalles de confiance
+    for name in ("length", "entropy"):
+        sum_sq = stats.pop(f"sum_{name}_sq")
+        variance = (sum_sq - total * stats[f"avg_{name}"] ** 2) / (total - 1) if total > 1 else 0
+        stats[f"std_{name}"] = math.sqrt(max(0.0, variance))
+    stats["weak_percent"] = (weak / total) * 100 if total > 0 else 0
+    stats["medium_percent"] = (medium / total) * 100 if total > 0 else 0
+    stats["strong_percent"] = (strong / total) * 100 if total > 0 else 0
+
+    # Construire les commentaires une seule fois par clé, en conservant l'ordre d'apparition
+    common_issues = {}
+    issue_codes = {}
+    for (code, entropy), count in stats["issues"].items():
+        issue_codes[code] = issue_codes.get(code, 0) + count
+    stats["issue_codes"] = sorted(issue_codes.items())
+    for (code, entropy), count in stats.pop("issues").items():
+        comment = ISSUE_COMMENTS[code].format(entropy)
+        common_issues[comment] = common_issues.get(comment, 0) + count
+    stats["common_issues"] = sorted(common_issues.items(), key=lambda x: x[1], reverse=True)
+
+    # Distributions, triées par valeur
+    stats.pop("top_k")
+    stats["length_histogram"] = sorted(stats.pop("lengths").items())
+    stats["entropy_histogram"] = [(f"{bucket * ENTROPY_BUCKET}-{(bucket + 1) * ENTROPY_BUCKET - 1} bits", count)
+                                  for bucket, count in sorted(stats.pop("entropies").items())]
+    stats["class_histogram"] = [(class_mix_label(mask), count)
+                                for mask, count in sorted(stats.pop("classes").items(), key=lambda x: x[1], reverse=True)]
+    return stats
+
+def _bar(count, total, width=30):
+    return "█" * round(width * count / total) if total else ""
+
+def histogram_lines(stats, max_lengths=30):
+    """
+    Lignes de texte des distributions (longueur, entropie, classes de caractères).
+    Les longueurs au-delà de max_lengths sont regroupées.
+    """
+    total = stats["total"]
+    lengths = [(str(length), count) for length, count in stats["length_histogram"] if length < max_lengths]
+    longer = sum(count for length, count in stats["length_histogram"] if length >= max_lengths)
+    if longer:
+        lengths.append((f"{max_lengths}+", longer))
+    lines = []
+    for title, rows in (("DISTRIBUTION DES LONGUEURS :", lengths),
+                        ("DISTRIBUTION DE L'ENTROPIE :", stats["entropy_histogram"]),
+                        ("CLASSES DE CARACTÈRES :", stats["class_histogram"])):
+        lines.append(title)
+        label_width = max((len(label) for label, _ in rows), default=0)
+        for label, count in rows:
+            lines.append(f"  {label:>{label_width}} : {count:>10} ({count / total * 100:5.1f}%) {_bar(count, total)}")
+        lines.append("-"*80)
+    return lines
+
+# Étapes chronométrées de l'analyse (durées cumulées sur les processus)
+ANALYZE_STAGES = ('read', 'score', 'format', 'merge')
+
+def _score_into(stats, batch, top_k, scores=None, scores_format=None, metrics=None):
+    """Analyse un lot, l'ajoute à stats et écrit ses scores détaillés si demandé."""
+    start = time.perf_counter()
+    rows = [] if scores else None
+    partial = score_batch(batch, top_k, rows)
+    scored = time.perf_counter()
+    _merge_stats(stats, partial)
+    merged = time.perf_counter()
+    if rows:
+        scores.write(format_scores(rows, scores_format))
+    if metrics is not None:
+        metrics.add_time('score', scored - start)
+        metrics.add_time('merge', merged - scored)
+        metrics.add_time('format', time.perf_counter() - merged)
+        metrics.add(passwords=len(batch))
+
+def _merge_range(stats, result, size, scores=None, metrics=None):
+    """
+    Ajoute le résultat de score_range (plage de size octets) à stats, et recopie
+    puis supprime son fichier partiel de scores (les plages arrivent dans l'ordre).
+    """
+    partial, part_file, seconds = result
+    start = time.perf_counter()
+    _merge_stats(stats, partial)
+    if part_file:
+        with open(part_file, 'r', encoding='utf-8', newline='') as part:
+            shutil.copyfileobj(part, scores, 16 * 1024 * 1024)
+        os.remove(part_file)
+    if metrics is not None:
+        for stage, value in seconds.items():
+            metrics.add_time(stage, value)
+        metrics.add_time('merge', time.perf_counter() - start)
+        metrics.add(passwords=partial["total"], bytes=size)
+
+def _iter_lines(input_file, codec, file_size):
+    """Lignes d'un fichier, décompressé à la volée si codec est fourni."""
+    if codec is None:
+        return iter_range_lines(input_file, 0, file_size)
+    return (line for block, _ in iter_decompressed_blocks(input_file, codec, READ_BLOCK_SIZE) for line in _decode_block(block))
+
+def iter_passwords(input_file, sample_size=None):
+    """
+    Mots de passe non vides d'un fichier, décompressé à la volée s'il est
+    compressé, en s'arrêtant après sample_size mots de passe.
+    """
+    file_size = os.path.getsize(input_file)
+    if file_size == 0:
+        return
+    codec = detect_codec(input_file)
+    if codec is not None:
+        check_codec(codec)
+    for batch in _iter_batches(_iter_lines(input_file, codec, file_size), 10000, sample_size):
+        yield from batch
+
+def _timed_batches(batches, metrics):
+    """Itère sur les lots en comptant le temps d'attente de chacun dans l'étape 'read'."""
+    if metrics is None:
+        yield from batches
+        return
+    mark = time.perf_counter()
+    for batch in batches:
+        metrics.add_time('read', time.perf_counter() - mark)
+        yield batch
+        mark = time.perf_counter()
+
+def analyze_wordlist(input_file, output_file=None, sample_size=None, workers=1, batch_size=10000, top_k=TOP_K,
+                     sample_mode='random', seed=None, report_format='text', scores_file=None, scores_format=None, metrics=None):
     """
     Analyse une wordlist complète et produit des statistiques.
+    Le fichier est lu une seule fois via mmap, découpé en plages alignées sur
+    les fins de ligne ; avec workers > 1, les plages sont analysées par
+    plusieurs processus et leurs statistiques fusionnées. Les lignes qui ne
+    sont pas en UTF-8 valide sont lues en latin-1.
+    Un fichier compressé (gzip, zstd, lz4, reconnu à ses premiers octets) est
+    décompressé à la volée et ses blocs de lignes répartis entre les processus.
+    Le rapport liste les top_k meilleurs mots de passe et les distributions
+    de longueur, d'entropie et de classes de caractères.
+    Avec sample_size, seul un échantillon est analysé : tiré au hasard
+    (sample_mode 'random', reproductible avec seed) ou les premières lignes
+    ('head'). Les résultats d'un échantillon aléatoire sont accompagnés
+    d'intervalles de confiance à 95 %.
+    Le rapport est enregistré au format report_format (text, json, csv, ndjson) ;
+    avec scores_file, le score de chaque mot de passe est écrit au fil des lots
+    (csv ou ndjson, déduit de l'extension si scores_format n'est pas fourni).
+    Avec metrics={'file': chemin, 'port': port, 'interval': secondes}, les compteurs
+    et durées par étape (read, score, format, merge) sont publiés pendant l'analyse
+    (voir metrics.MetricsReporter).
+    :return: Statistiques finales (voir finalize_stats), ou None si l'analyse a échoué.
     """
     print_banner()
     start_time = time.time()
+    scores = None
+    parts_dir = None
+    instrument = Metrics('matrixsec_analyze', ANALYZE_STAGES) if metrics is not None else None
+    reporter = MetricsReporter(instrument, metrics.get('file'), metrics.get('port'), metrics.get('interval', 10)) \
+        if metrics is not None else contextlib.nullcontext()
     
     try:
-        # Compter le nombre total de lignes pour la barre de progression
-        total_lines = sum(1 for _ in open(input_file, 'r', encoding='utf-8'))
-        
-        # Limiter à l'échantillon si spécifié
-        if sample_size and sample_size < total_lines:
-            total_lines = sample_size
-            print(f"Analyse sur un échantillon de {sample_size} mots de passe...")
-        else:
-            print(f"Analyse de tous les {total_lines} mots de passe...")
-        
-        # Initialiser les statistiques
-        stats = {
-            "total": 0,
-            "weak": 0,
-            "medium": 0,
-            "strong": 0,
-            "avg_length": 0,
-            "avg_entropy": 0,
-            "common_issues": {},
-            "top_passwords": []
-        }
-        
-        passwords_analyzed = 0
+        with reporter:
+            file_size = os.path.getsize(input_file)
+            codec = detect_codec(input_file)
+            if codec is not None:
+                check_codec(codec)
+            stats = _new_partial_stats(top_k)
+            if scores_file:
+                scores_format = scores_format or ('csv' if scores_file.lower().endswith('.csv') else 'ndjson')
+                scores = open(scores_file, 'w', encoding='utf-8', newline='')
+                if scores_format == 'csv':
+                    scores.write(','.join(SCORE_FIELDS) + '\n')
         
-        with open(input_file, 'r', encoding='utf-8') as f:
-            with tqdm(total=total_lines, desc="Analyse en cours", unit="mot de passe") as pbar:
-                for line in f:
-                    password = line.strip()
-                    if not password:
-                        continue
-                    
-                    # Analyser le mot de passe
-                    analysis = analyze_password_strength(password)
-                    
-                    # Mettre à jour les statistiques
-                    stats["total"] += 1
-                    stats["avg_length"] += len(password)
-                    stats["avg_entropy"] += analysis["entropy"]
-                    
-                    if analysis["strength"] == "Faible":
-                        stats["weak"] += 1
-                    elif analysis["strength"] == "Moyen":
-                        stats["medium"] += 1
+            sampling = None
+            if sample_size and sample_mode == 'head':
+                # Échantillon : les sample_size premiers mots de passe, lus en un seul passage
+                print(f"Analyse sur un échantillon de {sample_size} mots de passe (premières lignes)...")
+                with tqdm(total=sample_size, desc="Analyse en cours", unit="mot de passe") as pbar:
+                    for batch in _timed_batches(_iter_batches(_iter_lines(input_file, codec, file_size), batch_size, sample_size),
+                                                instrument):
+                        _score_into(stats, batch, top_k, scores, scores_format, instrument)
+                        pbar.update(len(batch))
+            elif sample_size:
+                if seed is None:
+                    seed = random.randrange(2 ** 32)
+                rng = random.Random(seed)
+                read_start = time.perf_counter()
+                # Sur un petit fichier, les tirages avec remise se répéteraient : réservoir.
+                # Un fichier compressé ne permet pas l'accès direct : réservoir aussi.
+                if sample_mode == 'reservoir' or codec is not None or file_size < sample_size * RESERVOIR_BYTES_PER_SAMPLE:
+                    sample_mode = 'reservoir'
+                    print(f"Échantillonnage de {sample_size} mots de passe (réservoir, graine {seed})...")
+                    passwords = sample_reservoir(_iter_lines(input_file, codec, file_size), sample_size, rng)
+                else:
+                    print(f"Échantillonnage de {sample_size} mots de passe (positions aléatoires, graine {seed})...")
+                    passwords = sample_random_offsets(input_file, sample_size, rng)
+                sampling = {"mode": sample_mode, "seed": seed}
+                if instrument is not None:
+                    instrument.add_time('read', time.perf_counter() - read_start)
+                with tqdm(total=len(passwords), desc="Analyse en cours", unit="mot de passe") as pbar:
+                    for batch in _iter_batches(passwords, batch_size):
+                        _score_into(stats, batch, top_k, scores, scores_format, instrument)
+                        pbar.update(len(batch))
+            else:
+                # Un seul passage : la progression suit les octets lus, sans compter les lignes.
+                # Avec plusieurs processus, chaque plage écrit ses scores dans un fichier partiel,
+                # recopié dans l'ordre : aucune plage n'est gardée en mémoire sous forme de texte.
+                if scores and workers > 1:
+                    parts_dir = tempfile.mkdtemp(prefix='matrixsec-scores-', dir=os.path.dirname(os.path.abspath(scores_file)))
+
+                def part_file(index):
+                    return os.path.join(parts_dir, f"{index:06d}") if parts_dir else None
+
+                if codec is None:
+                    print(f"Analyse de tous les mots de passe ({file_size / (1024 * 1024):.2f} Mo)...")
+                    tasks = [(input_file, start, end, batch_size, top_k, scores and scores_format, part_file(index))
+                             for index, (start, end) in enumerate(split_ranges(input_file, max(workers * 4, file_size // (64 * 1024 * 1024) + 1)))]
+                    score_task, weight = score_range, lambda task: task[2] - task[1]
+                else:
+                    # Décompression dans ce processus, blocs de lignes analysés par les processus fils
+                    print(f"Analyse de tous les mots de passe ({file_size / (1024 * 1024):.2f} Mo compressés, {codec})...")
+                    tasks = ((block, batch_size, top_k, scores and scores_format, part_file(index), read)
+                             for index, (block, read) in enumerate(iter_decompressed_blocks(input_file, codec, DECOMPRESSED_BLOCK_SIZE)))
+                    score_task, weight = score_block, lambda task: task[5]
+                with tqdm(total=file_size, desc="Analyse en cours", unit="o", unit_scale=True) as pbar:
+                    if workers > 1:
+                        with ProcessPoolExecutor(max_workers=workers) as executor:
+                            for result, size in _map_ordered(executor, score_task, tasks, workers * 2, weight=weight):
+                                _merge_range(stats, result, size, scores, instrument)
+                                pbar.update(size)
                     else:
-                        stats["strong"] += 1
-                    
-                    # Compter les problèmes communs
-                    for comment in analysis["comments"]:
-                        if comment not in stats["common_issues"]:
-                            stats["common_issues"][comment] = 0
-                        stats["common_issues"][comment] += 1
-                    
-                    # Ajouter aux top passwords si le score est élevé
-                    if analysis["score"] >= 4:
-                        stats["top_passwords"].append((password, analysis["score"], analysis["entropy"]))
-                        # Garder seulement les 10 meilleurs
-                        stats["top_passwords"] = sorted(stats["top_passwords"], key=lambda x: (x[1], x[2]), reverse=True)[:10]
-                    
-                    pbar.update(1)
-                    passwords_analyzed += 1
-                    
-                    # Arrêter si on a atteint la limite d'échantillonnage
-                    if sample_size and passwords_analyzed >= sample_size:
-                        break
+                        for task in tasks:
+                            _merge_range(stats, score_task(task, scores), weight(task), scores, instrument)
+                            pbar.update(weight(task))
         
-        # Calculer les moyennes
-        if stats["total"] > 0:
-            stats["avg_length"] /= stats["total"]
-            stats["avg_entropy"] /= stats["total"]
+            stats = finalize_stats(stats)
+            if sampling:
+                sampling["confidence"] = confidence_intervals(stats)
+            stats["sampling"] = sampling
         
-        # Calculer les pourcentages
-        stats["weak_percent"] = (stats["weak"] / stats["total"]) * 100 if stats["total"] > 0 else 0
-        stats["medium_percent"] = (stats["medium"] / stats["total"]) * 100 if stats["total"] > 0 else 0
-        stats["strong_percent"] = (stats["strong"] / stats["total"]) * 100 if stats["total"] > 0 else 0
+            end_time = time.time()
+            stats["analysis_time"] = end_time - start_time
         
-        # Trier les problèmes communs
-        stats["common_issues"] = sorted(stats["common_issues"].items(), key=lambda x: x[1], reverse=True)
+            # Afficher les résultats
+            print_results(stats)
         
-        end_time = time.time()
-        stats["analysis_time"] = end_time - start_time
-        
-        # Afficher les résultats
-        print_results(stats)
-        
-        # Enregistrer les résultats dans un fichier
-        if output_file:
-            save_results(stats, output_file)
-            print(f"\nRésultats enregistrés dans {output_file}")
+            # Enregistrer les résultats dans un fichier
+            if output_file:
+                save_results(stats, output_file, report_format)
+                print(f"\nRésultats enregistrés dans {output_file}")
+            if scores:
+                print(f"Scores détaillés enregistrés dans {scores_file}")
+            if instrument is not None:
+                print(f"Étapes : {instrument.summary()}")
+            return stats
         
     except Exception as e:
         print(f"Erreur lors de l'analyse : {e}")
         return
+    finally:
+        if scores:
+            scores.close()
+        if parts_dir:
+            shutil.rmtree(parts_dir, ignore_errors=True)
+
+SAMPLE_MODES = {"random": "positions aléatoires", "reservoir": "réservoir"}
+
+def _sampling_line(stats):
+    """Description de l'échantillon aléatoire, ou None pour une analyse complète."""
+    sampling = stats.get("sampling")
+    if not sampling:
+        return None
+    return (f"Échantillon aléatoire ({SAMPLE_MODES[sampling['mode']]}, graine {sampling['seed']}), "
+            f"intervalles de confiance à 95 %")
+
+def _ci(stats, key, issue=None):
+    """Suffixe « [IC 95 % : ...] » d'une valeur du rapport, vide hors échantillon aléatoire."""
+    sampling = stats.get("sampling")
+    if not sampling:
+        return ""
+    confidence = sampling["confidence"]
+    if key.startswith("avg_"):
+        return f" ± {confidence[key]:.2f}"
+    low, high = confidence["issues"][issue] if key == "issues" else confidence[key]
+    return f" [IC 95 % : {low:.1f}% – {high:.1f}%]"
 
 def print_results(stats):
     """Affiche les résultats de l'analyse."""
@@ -223,18 +826,22 @@ def print_results(stats):
     print("="*80)
     print(f"Nombre total de mots de passe analysés : {stats['total']}")
     print(f"Temps d'analyse : {stats['analysis_time']:.2f} secondes")
+    if _sampling_line(stats):
+        print(_sampling_line(stats))
     print("-"*80)
     print("RÉPARTITION PAR FORCE :")
-    print(f"  • Faible  : {stats['weak']} ({stats['weak_percent']:.1f}%)")
-    print(f"  • Moyen   : {stats['medium']} ({stats['medium_percent']:.1f}%)")
-    print(f"  • Fort    : {stats['strong']} ({stats['strong_percent']:.1f}%)")
+    print(f"  • Faible  : {stats['weak']} ({stats['weak_percent']:.1f}%){_ci(stats, 'weak')}")
+    print(f"  • Moyen   : {stats['medium']} ({stats['medium_percent']:.1f}%){_ci(stats, 'medium')}")
+    print(f"  • Fort    : {stats['strong']} ({stats['strong_percent']:.1f}%){_ci(stats, 'strong')}")
     print("-"*80)
-    print(f"Longueur moyenne : {stats['avg_length']:.1f} caractères")
-    print(f"Entropie moyenne : {stats['avg_entropy']:.1f} bits")
+    print(f"Longueur moyenne : {stats['avg_length']:.1f}{_ci(stats, 'avg_length')} caractères")
+    print(f"Entropie moyenne : {stats['avg_entropy']:.1f}{_ci(stats, 'avg_entropy')} bits")
     print("-"*80)
+    for line in histogram_lines(stats):
+        print(line)
     print("PROBLÈMES FRÉQUENTS :")
     for issue, count in stats["common_issues"][:5]:  # Top 5 des problèmes
-        print(f"  • {issue} : {count} occurrences ({(count/stats['total'])*100:.1f}%)")
+        print(f"  • {issue} : {count} occurrences ({(count/stats['total'])*100:.1f}%){_ci(stats, 'issues', issue)}")
     print("-"*80)
     if stats["top_passwords"]:
         print("MEILLEURS MOTS DE PASSE (score + entropie) :")
@@ -242,26 +849,127 @@ def print_results(stats):
             print(f"  {i}. {password} (Score: {score}, Entropie: {entropy:.1f} bits)")
     print("="*80)
 
-def save_results(stats, output_file):
-    """Enregistre les résultats dans un fichier."""
+def report_data(stats):
+    """
+    Rapport sous forme de dictionnaire sérialisable en JSON. Les problèmes sont
+    donnés à la fois par code entier (issue_codes, libellés dans issue_labels)
+    et par commentaire, comme dans le rapport texte.
+    """
+    total = stats["total"]
+    sampling = stats.get("sampling")
+    confidence = sampling["confidence"] if sampling else {}
+    data = {
+        "total": total,
+        "analysis_time": round(stats["analysis_time"], 3),
+        "strengths": {
+            name: {"count": stats[name], "percent": stats[f"{name}_percent"], "ci": confidence.get(name)}
+            for name in ("weak", "medium", "strong")
+        },
+        "avg_length": stats["avg_length"],
+        "std_length": stats["std_length"],
+        "avg_entropy": stats["avg_entropy"],
+        "std_entropy": stats["std_entropy"],
+        "length_histogram": stats["length_histogram"],
+        "entropy_histogram": stats["entropy_histogram"],
+        "class_histogram": stats["class_histogram"],
+        "issue_codes": {str(code): count for code, count in stats["issue_codes"]},
+        "issue_labels": {str(code): label for code, label in ISSUE_LABELS.items()},
+        "common_issues": [{"issue": issue, "count": count, "percent": count / total * 100 if total else 0}
+                          for issue, count in stats["common_issues"]],
+        "top_passwords": [{"password": password, "score": score, "entropy": entropy}
+                          for password, score, entropy in stats["top_passwords"]],
+        "sampling": None,
+    }
+    if sampling:
+        data["sampling"] = {
+            "mode": sampling["mode"],
+            "seed": sampling["seed"],
+            "avg_length_margin": confidence["avg_length"],
+            "avg_entropy_margin": confidence["avg_entropy"],
+        }
+        for entry in data["common_issues"]:
+            entry["ci"] = confidence["issues"][entry["issue"]]
+    return data
+
+REPORT_COLUMNS = ("section", "label", "value", "percent", "ci_low", "ci_high", "score", "entropy")
+
+def report_rows(stats):
+    """
+    Rapport à plat, une ligne par valeur (colonnes REPORT_COLUMNS), pour CSV et NDJSON.
+    """
+    data = report_data(stats)
+    total = data["total"]
+
+    def row(section, label, value=None, percent=None, ci=None, score=None, entropy=None):
+        low, high = ci if ci else (None, None)
+        return dict(zip(REPORT_COLUMNS, (section, label, value, percent, low, high, score, entropy)))
+
+    yield row("summary", "total", total)
+    yield row("summary", "analysis_time", data["analysis_time"])
+    for name in ("length", "entropy"):
+        margin = data["sampling"][f"avg_{name}_margin"] if data["sampling"] else None
+        average = data[f"avg_{name}"]
+        yield row("summary", f"avg_{name}", average,
+                  ci=(average - margin, average + margin) if margin is not None else None)
+        yield row("summary", f"std_{name}", data[f"std_{name}"])
+    if data["sampling"]:
+        yield row("summary", "sample_mode", data["sampling"]["mode"])
+        yield row("summary", "seed", data["sampling"]["seed"])
+    for name, label in zip(("weak", "medium", "strong"), STRENGTHS):
+        strength = data["strengths"][name]
+        yield row("strength", label, strength["count"], strength["percent"], strength["ci"])
+    for section, key in (("length", "length_histogram"), ("entropy", "entropy_histogram"),
+                         ("classes", "class_histogram")):
+        for label, count in data[key]:
+            yield row(section, label, count, count / total * 100 if total else 0)
+    for code, count in data["issue_codes"].items():
+        yield row("issue_code", code, count, count / total * 100 if total else 0)
+    for entry in data["common_issues"]:
+        yield row("issue", entry["issue"], entry["count"], entry["percent"], entry.get("ci"))
+    for entry in data["top_passwords"]:
+        yield row("top", entry["password"], score=entry["score"], entropy=entry["entropy"])
+
+def save_results(stats, output_file, fmt='text'):
+    """Enregistre les résultats dans un fichier (text, json, csv ou ndjson)."""
+    if fmt == 'json':
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(report_data(stats), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        return
+    if fmt == 'csv':
+        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, REPORT_COLUMNS, lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(report_rows(stats))
+        return
+    if fmt == 'ndjson':
+        with open(output_file, 'w', encoding='utf-8') as f:
+            for entry in report_rows(stats):
+                f.write(json.dumps({key: value for key, value in entry.items() if value is not None},
+                                   ensure_ascii=False) + "\n")
+        return
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write("="*80 + "\n")
         f.write("                       RAPPORT D'ANALYSE DE WORDLIST                       \n")
         f.write("="*80 + "\n")
         f.write(f"Nombre total de mots de passe analysés : {stats['total']}\n")
         f.write(f"Temps d'analyse : {stats['analysis_time']:.2f} secondes\n")
+        if _sampling_line(stats):
+            f.write(_sampling_line(stats) + "\n")
         f.write("-"*80 + "\n")
         f.write("RÉPARTITION PAR FORCE :\n")
-        f.write(f"  • Faible  : {stats['weak']} ({stats['weak_percent']:.1f}%)\n")
-        f.write(f"  • Moyen   : {stats['medium']} ({stats['medium_percent']:.1f}%)\n")
-        f.write(f"  • Fort    : {stats['strong']} ({stats['strong_percent']:.1f}%)\n")
+        f.write(f"  • Faible  : {stats['weak']} ({stats['weak_percent']:.1f}%){_ci(stats, 'weak')}\n")
+        f.write(f"  • Moyen   : {stats['medium']} ({stats['medium_percent']:.1f}%){_ci(stats, 'medium')}\n")
+        f.write(f"  • Fort    : {stats['strong']} ({stats['strong_percent']:.1f}%){_ci(stats, 'strong')}\n")
         f.write("-"*80 + "\n")
-        f.write(f"Longueur moyenne : {stats['avg_length']:.1f} caractères\n")
-        f.write(f"Entropie moyenne : {stats['avg_entropy']:.1f} bits\n")
+        f.write(f"Longueur moyenne : {stats['avg_length']:.1f}{_ci(stats, 'avg_length')} caractères\n")
+        f.write(f"Entropie moyenne : {stats['avg_entropy']:.1f}{_ci(stats, 'avg_entropy')} bits\n")
         f.write("-"*80 + "\n")
+        for line in histogram_lines(stats):
+            f.write(line + "\n")
         f.write("PROBLÈMES FRÉQUENTS :\n")
         for issue, count in stats["common_issues"]:
-            f.write(f"  • {issue} : {count} occurrences ({(count/stats['total'])*100:.1f}%)\n")
+            f.write(f"  • {issue} : {count} occurrences ({(count/stats['total'])*100:.1f}%){_ci(stats, 'issues', issue)}\n")
         f.write("-"*80 + "\n")
         if stats["top_passwords"]:
             f.write("MEILLEURS MOTS DE PASSE (score + entropie) :\n")
@@ -277,6 +985,22 @@ def main():
     parser.add_argument('--input', type=str, required=True, help='Fichier wordlist à analyser')
     parser.add_argument('--output', type=str, help='Fichier de sortie pour le rapport (optionnel)')
     parser.add_argument('--sample', type=int, help='Nombre de mots de passe à analyser (échantillon)')
+    parser.add_argument('--sample-mode', choices=['random', 'reservoir', 'head'], default='random',
+                        help='Tirage de l\'échantillon : positions aléatoires, réservoir (un passage) ou premières lignes')
+    parser.add_argument('--seed', type=int, help='Graine du tirage aléatoire (reproductibilité)')
+    parser.add_argument('--workers', type=int, default=1, help='Nombre de processus d\'analyse')
+    parser.add_argument('--batch-size', type=int, default=10000, help='Nombre de mots de passe par lot')
+    parser.add_argument('--format', choices=['text', 'json', 'csv', 'ndjson'], default='text',
+                        help='Format du rapport enregistré avec --output')
+    parser.add_argument('--scores', type=str,
+                        help='Fichier des scores détaillés, un mot de passe par ligne (CSV si extension .csv, sinon NDJSON)')
+    parser.add_argument('--scores-format', choices=['csv', 'ndjson'],
+                        help='Format du fichier --scores (par défaut, selon son extension)')
+    parser.add_argument('--top', type=int, default=TOP_K, help='Nombre de meilleurs mots de passe à afficher')
+    parser.add_argument('--metrics-file', type=str,
+                        help='Écrire les métriques (compteurs, durées par étape) dans ce fichier pendant l\'analyse (JSON si .json, sinon texte Prometheus)')
+    parser.add_argument('--metrics-port', type=int, help='Publier les métriques au format Prometheus sur http://127.0.0.1:PORT/metrics')
+    parser.add_argument('--metrics-interval', type=float, default=10, help='Intervalle entre deux écritures de --metrics-file, en secondes')
 
     args = parser.parse_args()
 
@@ -284,7 +1008,27 @@ def main():
         print(f"Erreur : le fichier {args.input} n'existe pas.")
         return
 
-    analyze_wordlist(args.input, args.output, args.sample)
+    if args.workers < 1 or args.batch_size < 1:
+        print("Erreur : --workers et --batch-size doivent être supérieurs ou égaux à 1.")
+        return
+
+    if args.top < 0:
+        print("Erreur : --top doit être positif ou nul.")
+        return
+
+    if args.sample is not None and args.sample < 1:
+        print("Erreur : --sample doit être supérieur ou égal à 1.")
+        return
+
+    if args.metrics_interval <= 0:
+        print("Erreur : --metrics-interval doit être positif.")
+        return
+
+    metrics = None
+    if args.metrics_file or args.metrics_port is not None:
+        metrics = {'file': args.metrics_file, 'port': args.metrics_port, 'interval': args.metrics_interval}
+    analyze_wordlist(args.input, args.output, args.sample, args.workers, args.batch_size, args.top,
+                     args.sample_mode, args.seed, args.format, args.scores, args.scores_format, metrics)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
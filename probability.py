@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# Génération par ordre de probabilité, d'après une fuite de référence, pour MatrixSec - By ScriptSeinsei
+
+import collections
+import heapq
+import math
+import re
+from password_analyzer import LOWER, UPPER, character_classes, iter_passwords
+
+# Lissage de Laplace : une valeur jamais observée garde une petite probabilité
+SMOOTHING = 1.0
+
+# Nombre d'états gardés dans la file de priorité (au-delà, les moins probables sont abandonnés)
+BEAM_WIDTH = 100000
+
+# Mot témoin auquel chaque règle est appliquée pour connaître son effet (casse, caractères spéciaux)
+PROBE_WORD = 'password'
+
+CASE_PATTERNS = ('lower', 'capitalized', 'upper', 'mixed', 'none')
+
+# Segments d'un mot de passe : lettres, chiffres, autres caractères
+_SEGMENT_RE = re.compile(r'[^\W\d_]+|\d+|[\W_]+')
+_TRAILING_NUMBER_RE = re.compile(r'(\d+)[\W_]*$')
+
+# Segments déjà découpés en mots du vocabulaire, au-delà desquels le cache est vidé
+_SPLIT_CACHE_SIZE = 1000000
+
+def case_pattern(password):
+    """
+    Schéma de casse des lettres d'un mot de passe (voir CASE_PATTERNS), d'après
+    son masque de classes de caractères (password_analyzer.character_classes).
+    """
+    mask = character_classes(password) & (LOWER | UPPER)
+    if mask == LOWER:
+        return 'lower'
+    if mask == UPPER:
+        return 'upper'
+    if not mask:
+        return 'none'
+    letters = ''.join(segment for segment in _SEGMENT_RE.findall(password) if segment.isalpha())
+    return 'capitalized' if letters[0].isupper() and letters[1:].islower() else 'mixed'
+
+def password_features(password):
+    """
+    Caractéristiques observables d'un mot de passe.
+    :return: Tuple (segments en minuscules, schéma de casse, caractère spécial en tête,
+             caractère spécial en fin, nombre final) ; '' si absent.
+    """
+    if not password:
+        return [], 'none', '', '', ''
+    segments = [segment.lower() for segment in _SEGMENT_RE.findall(password)]
+    first = password[0] if not password[0].isalnum() else ''
+    last = password[-1] if not password[-1].isalnum() else ''
+    match = _TRAILING_NUMBER_RE.search(password)
+    return segments, case_pattern(password), first, last, match.group(1) if match else ''
+
+def _logp(counter, key, total, categories):
+    return math.log((counter.get(key, 0) + SMOOTHING) / (total + SMOOTHING * max(1, categories)))
+
+class ProbabilityModel:
+    """
+    Fréquences apprises sur une fuite de référence : mots du générateur, nombre
+    de ces mots par mot de passe, schémas de casse, caractères spéciaux en tête
+    et en fin, nombres finaux. Les probabilités sont lissées (SMOOTHING) et
+    données en logarithme népérien.
+    :param vocabulary: Mots du générateur ; un segment qui en concatène deux
+                       (ex. 'johnsmith') compte pour chacun d'eux.
+    """
+
+    def __init__(self, vocabulary=()):
+        self.vocabulary = {word.lower() for word in vocabulary}
+        self.total = 0
+        self.words = collections.Counter()
+        self.lengths = collections.Counter()
+        self.cases = collections.Counter()
+        self.first = collections.Counter()
+        self.last = collections.Counter()
+        self.numbers = collections.Counter()
+        self._splits = {}
+
+    def _split(self, segment):
+        """Mots du vocabulaire qui forment le segment (lui-même, ou deux mots accolés)."""
+        words = self._splits.get(segment)
+        if words is None:
+            if len(self._splits) >= _SPLIT_CACHE_SIZE:
+                self._splits.clear()
+            vocabulary = self.vocabulary
+            if segment in vocabulary:
+                words = (segment,)
+            else:
+                words = next(((segment[:i], segment[i:]) for i in range(1, len(segment))
+                              if segment[:i] in vocabulary and segment[i:] in vocabulary), ())
+            self._splits[segment] = words
+        return words
+
+    def learn(self, passwords):
+        """
+        Ajoute les mots de passe (itérable de chaînes non vides) aux fréquences.
+        :return: Nombre de mots de passe lus.
+        """
+        count = 0
+        for password in passwords:
+            segments, case, first, last, number = password_features(password)
+            words = [word for segment in segments for word in self._split(segment)]
+            self.words.update(words)
+            self.lengths[len(words)] += 1
+            self.cases[case] += 1
+            self.first[first] += 1
+            self.last[last] += 1
+            self.numbers[number] += 1
+            count += 1
+        self.total += count
+        return count
+
+    def word_logp(self, word):
+        """Log-probabilité qu'un mot donné du vocabulaire soit choisi."""
+        return _logp(self.words, word.lower(), sum(self.words.values()), len(self.vocabulary))
+
+    def length_logp(self, k, min_length, max_length):
+        """Log-probabilité d'une combinaison de k mots, parmi les longueurs min_length à max_length."""
+        total = sum(self.lengths[length] for length in range(min_length, max_length + 1))
+        return _logp(self.lengths, k, total, max_length - min_length + 1)
+
+    def variant_logp(self, variant):
+        """
+        Log-probabilité de l'effet d'une règle, d'après sa sortie sur PROBE_WORD :
+        schéma de casse, caractère spécial en tête et en fin.
+        """
+        _, case, first, last, _ = password_features(variant)
+        return (_logp(self.cases, case, self.total, len(CASE_PATTERNS))
+                + _logp(self.first, first, self.total, len(self.first) + 1)
+                + _logp(self.last, last, self.total, len(self.last) + 1))
+
+    def suffix_logp(self, suffix):
+        """Log-probabilité d'un nombre final (None : pas de suffixe)."""
+        return _logp(self.numbers, suffix or '', self.total, len(self.numbers) + 1)
+
+def learn_model(leak_file, vocabulary, sample_size=None):
+    """
+    Apprend un modèle sur une fuite de référence (une ligne par mot de passe,
+    éventuellement compressée), limitée à ses sample_size premières lignes.
+    :return: ProbabilityModel
+    """
+    model = ProbabilityModel(vocabulary)
+    model.learn(iter_passwords(leak_file, sample_size))
+    return model
+
+def iter_by_probability(word_logps, length_logps, dimensions, beam_width=BEAM_WIDTH, stats=None):
+    """
+    Parcourt les candidats (une combinaison de k mots, puis un indice dans
+    chaque dimension) par log-probabilité décroissante, avec une file de
+    priorité. Chaque état retiré de la file y ajoute ses successeurs, un peu
+    moins probables ; chaque état a un seul prédécesseur (on n'incrémente que
+    les coordonnées à partir de la dernière non nulle), il n'est donc jamais
+    produit deux fois et aucun ensemble des états déjà vus n'est conservé.
+    Les mots d'une combinaison sont codés par leurs écarts : augmenter un écart
+    décale les mots suivants vers des mots moins probables.
+    Tant que la file compte moins de 2 × beam_width états, l'ordre est exact ;
+    au-delà, seuls les beam_width plus probables sont gardés (mémoire bornée,
+    ordre approché) et les autres sont abandonnés avec leurs successeurs : ces
+    candidats ne sont jamais produits. stats['dropped'] compte les états
+    abandonnés, soit au moins autant de candidats perdus.
+    :param word_logps: Log-probabilités des mots, triées par ordre décroissant.
+    :param length_logps: Dict {k: log-probabilité d'une combinaison de k mots}.
+    :param dimensions: Listes de log-probabilités triées par ordre décroissant (règles, suffixes...).
+    :param stats: Dict optionnel, mis à jour avec 'dropped'.
+    :return: Générateur de tuples (log-probabilité, indices des mots, indices dans les dimensions)
+    """
+    n = len(word_logps)
+    if any(not dimension for dimension in dimensions):
+        return
+
+    def score(k, coords):
+        index = -1
+        total = length_logps[k]
+        for gap in coords[:k]:
+            index += gap + 1
+            total += word_logps[index]
+        for dimension, position in zip(dimensions, coords[k:]):
+            total += dimension[position]
+        return total
+
+    heap = []
+    for k in length_logps:
+        if k <= n:
+            coords = (0,) * (k + len(dimensions))
+            heap.append((-score(k, coords), k, coords))
+    heapq.heapify(heap)
+    while heap:
+        cost, k, coords = heapq.heappop(heap)
+        index = -1
+        indices = []
+        for gap in coords[:k]:
+            index += gap + 1
+            indices.append(index)
+        yield -cost, indices, coords[k:]
+        last = len(coords) - 1
+        while last > 0 and not coords[last]:
+            last -= 1
+        # Successeurs : le coût augmente de la perte de probabilité de la coordonnée incrémentée
+        for position in range(last, len(coords)):
+            if position < k:
+                if index + 1 >= n:
+                    continue  # Le dernier mot est déjà le moins probable
+                # Augmenter cet écart décale ce mot et les suivants d'un rang
+                delta = sum(word_logps[i] - word_logps[i + 1] for i in indices[position:])
+            else:
+                dimension = dimensions[position - k]
+                value = coords[position]
+                if value + 1 >= len(dimension):
+                    continue
+                delta = dimension[value] - dimension[value + 1]
+            child = coords[:position] + (coords[position] + 1,) + coords[position + 1:]
+            heapq.heappush(heap, (cost + delta, k, child))
+        if len(heap) > 2 * beam_width:
+            if stats is not None:
+                stats['dropped'] = stats.get('dropped', 0) + len(heap) - beam_width
+            heap = heapq.nsmallest(beam_width, heap)
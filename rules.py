@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# Moteur de règles de transformation (sous-ensemble hashcat) pour MatrixSec - By ScriptSeinsei
+
+from functools import lru_cache
+from pathlib import Path
+
+# Fonctions reconnues et nombre de paramètres de chacune (syntaxe hashcat)
+RULE_ARITY = {
+    ':': 0,  # Ne rien faire
+    'l': 0,  # Tout en minuscules
+    'u': 0,  # Tout en majuscules
+    'c': 0,  # Première lettre en majuscule, le reste en minuscules
+    'C': 0,  # Première lettre en minuscule, le reste en majuscules
+    't': 0,  # Inverser la casse de tout le mot
+    'T': 1,  # TN : inverser la casse à la position N
+    'r': 0,  # Inverser le mot
+    'd': 0,  # Dupliquer le mot
+    'f': 0,  # Mot suivi de son inverse
+    '{': 0,  # Rotation à gauche
+    '}': 0,  # Rotation à droite
+    '$': 1,  # $X : ajouter X à la fin
+    '^': 1,  # ^X : ajouter X au début
+    '[': 0,  # Supprimer le premier caractère
+    ']': 0,  # Supprimer le dernier caractère
+    'D': 1,  # DN : supprimer le caractère à la position N
+    "'": 1,  # 'N : tronquer à N caractères
+    's': 2,  # sXY : remplacer tous les X par Y (leet)
+    '@': 1,  # @X : supprimer tous les X
+}
+
+# Fonctions dont le paramètre est une position (0-9 puis A-Z = 10-35)
+POSITIONAL = {'T', 'D', "'"}
+
+def _position(char, rule):
+    if char.isdigit():
+        return int(char)
+    if 'A' <= char <= 'Z':
+        return ord(char) - ord('A') + 10
+    raise ValueError(f"position invalide {char!r} dans la règle {rule!r}")
+
+def parse_rule(rule):
+    """
+    Découpe une règle hashcat en liste d'opérations (fonction, paramètres).
+    Les ajouts consécutifs ($ ou ^) sont regroupés en une seule opération.
+    """
+    ops = []
+    i = 0
+    while i < len(rule):
+        name = rule[i]
+        if name == ' ':
+            i += 1
+            continue
+        if name not in RULE_ARITY:
+            raise ValueError(f"fonction {name!r} non prise en charge dans la règle {rule!r}")
+        arity = RULE_ARITY[name]
+        params = rule[i + 1:i + 1 + arity]
+        if len(params) < arity:
+            raise ValueError(f"paramètre manquant pour {name!r} dans la règle {rule!r}")
+        i += 1 + arity
+        if name in POSITIONAL:
+            params = (_position(params, rule),)
+        else:
+            params = tuple(params)
+        if name == ':':
+            continue
+        if name == '$' and ops and ops[-1][0] == '$':
+            ops[-1] = ('$', (ops[-1][1][0] + params[0],))
+        elif name == '^' and ops and ops[-1][0] == '^':
+            ops[-1] = ('^', (params[0] + ops[-1][1][0],))
+        else:
+            ops.append((name, params))
+    return ops
+
+def load_rules(file_path):
+    """
+    Charge un fichier de règles (une règle par ligne, '#' pour les commentaires).
+    """
+    rules = []
+    with Path(file_path).open('r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            rule = line.rstrip('\r\n')
+            if not rule.strip() or rule.startswith('#'):
+                continue
+            try:
+                parse_rule(rule)
+            except ValueError as e:
+                raise ValueError(f"{file_path}, ligne {number} : {e}")
+            rules.append(rule)
+    return rules
+
+def _append_rule(text):
+    return ''.join(f"${char}" for char in text)
+
+def _prepend_rule(text):
+    return ''.join(f"^{char}" for char in reversed(text))
+
+def default_rules(case_variants=False, special_chars=None, append_special=False):
+    """
+    Règles équivalentes aux variantes historiques du générateur, dans le même ordre :
+    casse (l, c, u), puis chaque caractère spécial à la fin et au début, puis sans.
+    """
+    case_rules = ['l', 'c', 'u'] if case_variants else [':']
+    if not (special_chars and append_special):
+        return case_rules
+    rules = []
+    for case_rule in case_rules:
+        for char in special_chars:
+            rules.append(f"{case_rule} {_append_rule(char)}")
+            rules.append(f"{case_rule} {_prepend_rule(char)}")
+    rules.extend(case_rules)
+    return rules
+
+def _swap_first(word):
+    return word[:1].lower() + word[1:].upper()
+
+def _toggle_at(word, n):
+    return word[:n] + word[n:n + 1].swapcase() + word[n + 1:] if n < len(word) else word
+
+def _delete_at(word, n):
+    return word[:n] + word[n + 1:]
+
+def _reflect(word):
+    return word + word[::-1]
+
+def _rotate_left(word):
+    return word[1:] + word[:1]
+
+def _rotate_right(word):
+    return word[-1:] + word[:-1]
+
+_HELPERS = {
+    '_swap_first': _swap_first,
+    '_toggle_at': _toggle_at,
+    '_delete_at': _delete_at,
+    '_reflect': _reflect,
+    '_rotate_left': _rotate_left,
+    '_rotate_right': _rotate_right,
+}
+
+def _rule_expression(ops, expr, encoding=None):
+    """
+    Construit l'expression Python équivalente à une liste d'opérations appliquée à `expr`.
+    Avec `encoding`, les constantes sont des bytes et l'expression s'applique à des bytes.
+    """
+    for name, params in ops:
+        if encoding is not None:
+            params = tuple(param if isinstance(param, int) else param.encode(encoding) for param in params)
+        if name == 'l':
+            expr = f"({expr}).lower()"
+        elif name == 'u':
+            expr = f"({expr}).upper()"
+        elif name == 'c':
+            expr = f"({expr}).capitalize()"
+        elif name == 'C':
+            expr = f"_swap_first({expr})"
+        elif name == 't':
+            expr = f"({expr}).swapcase()"
+        elif name == 'T':
+            expr = f"_toggle_at({expr}, {params[0]})"
+        elif name == 'r':
+            expr = f"({expr})[::-1]"
+        elif name == 'd':
+            expr = f"({expr}) * 2"
+        elif name == 'f':
+            expr = f"_reflect({expr})"
+        elif name == '{':
+            expr = f"_rotate_left({expr})"
+        elif name == '}':
+            expr = f"_rotate_right({expr})"
+        elif name == '$':
+            expr = f"({expr}) + {params[0]!r}"
+        elif name == '^':
+            expr = f"{params[0]!r} + ({expr})"
+        elif name == '[':
+            expr = f"({expr})[1:]"
+        elif name == ']':
+            expr = f"({expr})[:-1]"
+        elif name == 'D':
+            expr = f"_delete_at({expr}, {params[0]})"
+        elif name == "'":
+            expr = f"({expr})[:{params[0]}]"
+        elif name == 's':
+            expr = f"({expr}).replace({params[0]!r}, {params[1]!r})"
+        elif name == '@':
+            expr = f"({expr}).replace({params[0]!r}, {params[0][:0]!r})"
+    return expr
+
+@lru_cache(maxsize=32)
+def compile_rules(rules, encoding=None):
+    """
+    Compile une fois pour toutes une suite de règles en une seule fonction
+    qui retourne le tuple des mots transformés (un par règle, dans l'ordre).
+    :param rules: Tuple de règles hashcat.
+    :param encoding: Si fourni, la fonction travaille sur des bytes (casse ASCII uniquement).
+    """
+    expressions = [_rule_expression(parse_rule(rule), 'w', encoding) for rule in rules]
+    source = f"lambda w: ({', '.join(expressions)},)" if expressions else "lambda w: ()"
+    return eval(compile(source, '<règles>', 'eval'), dict(_HELPERS))
+
+@lru_cache(maxsize=256)
+def compile_block(rules, keep, encoding='utf-8'):
+    """
+    Compile les règles retenues par `keep` (un booléen par règle) en une fonction
+    qui retourne directement le bloc d'octets à écrire : chaque mot transformé
+    suivi d'un retour à la ligne, en une seule concaténation.
+    """
+    expressions = [_rule_expression(parse_rule(rule), 'w', encoding)
+                   for rule, kept in zip(rules, keep) if kept]
+    if not expressions:
+        return lambda w: b''
+    parts = ', '.join(f"{expression}, b'\\n'" for expression in expressions)
+    source = f"lambda w: b''.join(({parts},))"
+    return eval(compile(source, '<règles>', 'eval'), dict(_HELPERS))
+
+def rules_are_ascii(rules):
+    """
+    Indique si les constantes des règles sont toutes ASCII (condition du mode bytes).
+    """
+    return all(param.isascii() for rule in rules for _, params in parse_rule(rule)
+               for param in params if isinstance(param, str))
+
+def rule_growth(rule, encoding='utf-8', ascii=True):
+    """
+    Nombre de caractères et d'octets ajoutés par une règle, si cette valeur ne dépend
+    pas du mot transformé (casse, ajouts, remplacements de même longueur).
+    :param ascii: Mots et constantes tous ASCII : sinon la casse peut changer la
+                  longueur du mot ('groß'.upper() == 'GROSS').
+    :return: Tuple (caractères, octets), ou None si la longueur produite varie.
+    """
+    chars = 0
+    size = 0
+    for name, params in parse_rule(rule):
+        if name in ('$', '^'):
+            chars += len(params[0])
+            size += len(params[0].encode(encoding))
+        elif name == 's' and len(params[0].encode(encoding)) == len(params[1].encode(encoding)):
+            continue
+        elif name in ('l', 'u', 'c', 'C', 't', 'T'):
+            if not ascii:
+                return None
+        elif name not in ('r', '{', '}'):
+            return None
+    return chars, size
+
+def _position_char(n):
+    return str(n) if n < 10 else chr(ord('A') + n - 10)
+
+def serialize_rule(rule):
+    """
+    Réécrit une règle sous forme canonique, sans espaces : chaque fonction suivie
+    de ses paramètres (les ajouts regroupés par parse_rule sont redécoupés).
+    """
+    parts = []
+    for name, params in parse_rule(rule):
+        if name == '$':
+            parts.append(_append_rule(params[0]))
+        elif name == '^':
+            parts.append(_prepend_rule(params[0]))
+        elif name in POSITIONAL:
+            parts.append(name + _position_char(params[0]))
+        else:
+            parts.append(name + ''.join(params))
+    return ''.join(parts) or ':'
+
+# Caractères interprétés par le préprocesseur de règles de john ([a-z], \x...)
+_JOHN_ESCAPES = str.maketrans({'[': '\\[', ']': '\\]', '\\': '\\\\'})
+
+def export_rules(rules, fmt='hashcat', suffixes=(), min_char_length=0, max_char_length=None):
+    """
+    Règles équivalentes à l'expansion du générateur, pour une attaque base + règles :
+    chaque règle, puis la même règle suivie de l'ajout de chaque suffixe (même ordre
+    que les variantes générées).
+    Pour john, une règle de rejet '>N' écarte les mots de moins de min_char_length
+    caractères, et '<N' ceux de plus de max_char_length ; hashcat n'accepte pas
+    ces règles dans un fichier (-r) et n'applique donc pas ce filtre.
+    :return: Liste de lignes du fichier de règles.
+    """
+    lines = []
+    for rule in rules:
+        base = serialize_rule(rule)
+        for suffix in ('',) + tuple(suffixes):
+            line = base + _append_rule(suffix) if suffix else base
+            if fmt == 'john':
+                line = line.translate(_JOHN_ESCAPES)
+                if min_char_length > 1:
+                    line += '>' + _position_char(min(min_char_length - 1, 35))
+                if max_char_length is not None and max_char_length < 35:
+                    line += '<' + _position_char(max_char_length + 1)
+            lines.append(line)
+    return lines
+
+def write_rule_file(path, rules, fmt='hashcat', suffixes=(), min_char_length=0, section='MatrixSec', max_char_length=None):
+    """
+    Écrit un fichier de règles hashcat (-r) ou une section john ([List.Rules:section]).
+    :return: Nombre de règles écrites.
+    """
+    lines = export_rules(rules, fmt, suffixes, min_char_length, max_char_length)
+    with Path(path).open('w', encoding='utf-8', newline='\n') as f:
+        if fmt == 'john':
+            f.write(f"[List.Rules:{section}]\n")
+        for line in lines:
+            f.write(line + '\n')
+    return len(lines)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# Sources de dates et de nombres pour MatrixSec - By ScriptSeinsei
+
+import calendar
+import datetime
+import re
+
+# Champs reconnus dans un format de date (le reste est recopié tel quel)
+_DATE_FIELD_RE = re.compile(r'YYYY|YY|MM|DD')
+
+DATE_FORMATS = ('DDMMYYYY', 'YYYY', 'DDMM', 'MMDDYY', 'DDMMYY', 'YYYYMMDD', 'MMDDYYYY', 'DD/MM/YYYY')
+
+def _compile_date_format(fmt):
+    """
+    Convertit un format comme 'DD/MM/YYYY' en modèle str.format sur (jour, mois, année).
+    :return: Tuple (modèle, champs présents)
+    """
+    fields = set()
+    parts = []
+    position = 0
+    for match in _DATE_FIELD_RE.finditer(fmt):
+        parts.append(fmt[position:match.start()].replace('{', '{{').replace('}', '}}'))
+        field = match.group()
+        fields.add(field)
+        parts.append({'DD': '{0:02d}', 'MM': '{1:02d}', 'YYYY': '{2:04d}', 'YY': '{3:02d}'}[field])
+        position = match.end()
+    parts.append(fmt[position:].replace('{', '{{').replace('}', '}}'))
+    if not fields:
+        raise ValueError(f"format de date sans champ (DD, MM, YY, YYYY) : {fmt!r}")
+    return ''.join(parts), fields
+
+class DateSource:
+    """
+    Dates valides du calendrier (29 février des années bissextiles compris) dans
+    un format donné, décrites par leur plage d'années : len() et itération dans
+    l'ordre chronologique. L'étage de suffixes et les gabarits en dressent la
+    liste une seule fois (moins de 50 000 dates pour 1900-2025).
+    Les valeurs sont distinctes : 'YYYY' donne une valeur par année, 'DDMM' une
+    par jour de l'année, 'MMYYYY' une par mois, et avec 'YY' seule la plus récente des années de même
+    fin est gardée (la plus récente des bissextiles s'il y en a, pour le 29 février).
+    """
+
+    def __init__(self, start_year, end_year, fmt='DDMMYYYY'):
+        if start_year > end_year:
+            raise ValueError("l'année de début doit être inférieure ou égale à l'année de fin")
+        if not 1 <= start_year <= end_year <= 9999:
+            raise ValueError("les années doivent être comprises entre 1 et 9999")
+        self.start_year = start_year
+        self.end_year = end_year
+        self.format = fmt
+        self._template, fields = _compile_date_format(fmt)
+        years = range(start_year, end_year + 1)
+        if 'YYYY' not in fields and 'YY' in fields:
+            # Garder une seule année par valeur de YY (la plus récente) ; une année
+            # bissextile l'emporte (2000 sur 2100), ses dates comprenant toutes les autres
+            latest = {}
+            for year in years:
+                kept = latest.get(year % 100)
+                if kept is None or calendar.isleap(year) or not calendar.isleap(kept):
+                    latest[year % 100] = year
+            years = sorted(latest.values())
+        # Dates parcourues dans chaque année : seulement ce que le format distingue
+        if {'DD', 'MM'} <= fields:
+            self._unit = 'day'
+        elif 'MM' in fields:
+            self._unit = 'month'
+        elif 'DD' in fields:
+            self._unit = 'day_of_month'
+        else:
+            self._unit = 'year'
+        if not fields & {'YYYY', 'YY'}:
+            # Jours d'une seule année, bissextile si la plage en contient une
+            years = [2000 if any(calendar.isleap(year) for year in years) else 2001]
+        self._years = list(years)
+        per_year = {'month': 12, 'day_of_month': 31, 'year': 1}.get(self._unit)
+        self._size = sum(per_year or 365 + calendar.isleap(year) for year in self._years)
+
+    def __len__(self):
+        return self._size
+
+    def _format(self, date):
+        return self._template.format(date.day, date.month, date.year, date.year % 100)
+
+    def __iter__(self):
+        for year in self._years:
+            if self._unit == 'year':
+                yield self._format(datetime.date(year, 1, 1))
+                continue
+            if self._unit == 'month':
+                for month in range(1, 13):
+                    yield self._format(datetime.date(year, month, 1))
+                continue
+            if self._unit == 'day_of_month':
+                for day in range(1, 32):
+                    yield self._format(datetime.date(year, 1, day))
+                continue
+            ordinal = datetime.date(year, 1, 1).toordinal()
+            for day in range(365 + calendar.isleap(year)):
+                yield self._format(datetime.date.fromordinal(ordinal + day))
+
+    def __repr__(self):
+        return f"DateSource({self.start_year}, {self.end_year}, {self.format!r})"
+
+class NumberSource:
+    """
+    Nombres de start à stop inclus, complétés par des zéros jusqu'à width
+    chiffres : len() et itération dans l'ordre croissant.
+    """
+
+    def __init__(self, start, stop, width=0):
+        if start > stop or start < 0:
+            raise ValueError("la plage de nombres doit être croissante et positive")
+        self.start = start
+        self.stop = stop
+        self.width = width
+
+    def __len__(self):
+        return self.stop - self.start + 1
+
+    def __iter__(self):
+        width = self.width
+        return (f"{number:0{width}d}" for number in range(self.start, self.stop + 1))
+
+    def __repr__(self):
+        return f"NumberSource({self.start}, {self.stop}, {self.width})"
+
+def parse_number_range(text):
+    """
+    Convertit 'A-B' en NumberSource ; des zéros en tête de A fixent la largeur ('00-99').
+    """
+    try:
+        start, stop = text.split('-')
+        source = NumberSource(int(start), int(stop), len(start) if start.startswith('0') and len(start) > 1 else 0)
+    except ValueError as e:
+        raise ValueError(f"plage de nombres invalide {text!r} (forme A-B) : {e}")
+    return source
+
+def parse_year_range(text):
+    """
+    Convertit 'AAAA-AAAA' en tuple (année de début, année de fin).
+    """
+    try:
+        start, end = (int(part) for part in text.split('-'))
+    except ValueError:
+        raise ValueError(f"--years attend la forme AAAA-AAAA, pas {text!r}")
+    if start > end:
+        raise ValueError("l'année de début doit être inférieure ou égale à l'année de fin")
+    return start, end
+
+def parse_source(spec, start_year=1900, end_year=2025):
+    """
+    Construit une source à partir de sa description :
+    'year' (années), 'date' ou 'date:FORMAT' (DDMMYYYY par défaut), 'num:A-B'.
+    Les dates couvrent les années start_year à end_year.
+    """
+    name, _, argument = spec.partition(':')
+    if name == 'year':
+        return DateSource(start_year, end_year, 'YYYY')
+    if name == 'date':
+        return DateSource(start_year, end_year, argument or 'DDMMYYYY')
+    if name == 'num':
+        if not argument:
+            raise ValueError("num attend une plage, ex. num:0-99")
+        return parse_number_range(argument)
+    raise ValueError(f"source inconnue {spec!r} (disponibles : year, date:FORMAT, num:A-B)")
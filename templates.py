@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# Gabarits de génération (emplacements typés et masques hashcat) pour MatrixSec - By ScriptSeinsei
+
+import re
+import string
+from combinatorics import count_product, iter_product
+from sources import parse_source
+
+# Jeux de caractères des masques (syntaxe hashcat)
+MASK_CHARSETS = {
+    'l': string.ascii_lowercase,
+    'u': string.ascii_uppercase,
+    'd': string.digits,
+    's': " !\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~",
+}
+MASK_CHARSETS['a'] = MASK_CHARSETS['l'] + MASK_CHARSETS['u'] + MASK_CHARSETS['d'] + MASK_CHARSETS['s']
+
+# Emplacements reconnus entre accolades : {word} et {special} prennent leurs candidats
+# dans les sources fournies à la compilation, les autres sont des sources de dates ou
+# de nombres (voir sources.parse_source), ex. {date:DDMMYYYY} ou {num:00-99}
+SLOT_TYPES = ('word', 'special', 'year', 'date', 'num')
+
+# Taille maximale d'un pool obtenu en fusionnant les derniers emplacements
+MERGE_LIMIT = 65536
+
+_TOKEN_RE = re.compile(r'\{(\w+)(?::([^{}]*))?\}|\?(.)|([^{}?]+)')
+
+def parse_template(text):
+    """
+    Découpe un gabarit en éléments (type, valeur) : ('slot', nom) pour {word},
+    ('slot', 'nom:paramètre') pour {date:DDMM}, ('mask', jeu) pour ?d,
+    ('literal', texte) pour le reste.
+    '??' désigne un point d'interrogation littéral.
+    """
+    tokens = []
+    position = 0
+    while position < len(text):
+        match = _TOKEN_RE.match(text, position)
+        if match is None:
+            raise ValueError(f"gabarit invalide à la position {position} : {text[position:]!r}")
+        slot, argument, mask, literal = match.groups()
+        if slot is not None:
+            if slot not in SLOT_TYPES:
+                raise ValueError(f"emplacement inconnu {{{slot}}} (disponibles : {', '.join(SLOT_TYPES)})")
+            tokens.append(('slot', f"{slot}:{argument}" if argument else slot))
+        elif mask is not None:
+            if mask == '?':
+                tokens.append(('literal', '?'))
+            elif mask in MASK_CHARSETS:
+                tokens.append(('mask', mask))
+            else:
+                raise ValueError(f"masque inconnu ?{mask} (disponibles : ?l ?u ?d ?s ?a ??)")
+        else:
+            tokens.append(('literal', literal))
+        position = match.end()
+    if not tokens:
+        raise ValueError("gabarit vide")
+    return tokens
+
+def _merge(left, right):
+    return tuple(a + b for a in left for b in right)
+
+class Template:
+    """
+    Gabarit compilé : une suite de pools de candidats dont le produit cartésien,
+    dans l'ordre d'itertools.product, donne les lignes générées. Chaque ligne a
+    un rang, ce qui permet le découpage (--workers, --skip, --node) et la reprise.
+    """
+
+    def __init__(self, text, pools):
+        self.text = text
+        self.pools = pools
+
+    @property
+    def size(self):
+        return count_product(len(pool) for pool in self.pools)
+
+    def __iter__(self):
+        return self.iter()
+
+    def iter(self, start=0, stop=None):
+        """Lignes (tuples de candidats) de rang start à stop."""
+        return iter_product(self.pools, start, stop)
+
+    def candidates(self):
+        """Tous les candidats distincts des pools (pour vérifier l'encodage)."""
+        return {candidate for pool in self.pools for candidate in pool}
+
+    def encoded(self, encoding='utf-8'):
+        """Copie du gabarit dont les candidats sont encodés une seule fois (moteur bytes)."""
+        return Template(self.text, [tuple(candidate.encode(encoding) for candidate in pool) for pool in self.pools])
+
+    def _distribution(self, encoding='utf-8'):
+        """Longueur en caractères -> (nombre de lignes, octets cumulés), sur le produit des pools."""
+        distribution = {0: (1, 0)}
+        for pool in self.pools:
+            lengths = {}
+            for candidate in pool:
+                count, size = lengths.get(len(candidate), (0, 0))
+                lengths[len(candidate)] = (count + 1, size + len(candidate.encode(encoding)))
+            combined = {}
+            for length, (count, size) in distribution.items():
+                for extra, (extra_count, extra_size) in lengths.items():
+                    total_count, total_size = combined.get(length + extra, (0, 0))
+                    combined[length + extra] = (total_count + count * extra_count,
+                                                total_size + size * extra_count + extra_size * count)
+            distribution = combined
+        return distribution
+
+    def estimate(self, variant_growths=((0, 0),), min_chars=0, encoding='utf-8', max_chars=None):
+        """
+        Calcule exactement le nombre de lignes et d'octets produits, sans rien énumérer,
+        en combinant les distributions de longueur des pools.
+        :param variant_growths: Liste de tuples (caractères ajoutés, octets ajoutés), un par variante.
+        :param max_chars: Longueur maximale des lignes (None : pas de maximum).
+        :return: Tuple (lignes du produit, lignes écrites, octets)
+        """
+        distribution = self._distribution(encoding)
+        lines = 0
+        size = 0
+        for growth, growth_bytes in variant_growths:
+            for length, (count, total_size) in distribution.items():
+                if length + growth >= min_chars and (max_chars is None or length + growth <= max_chars):
+                    lines += count
+                    size += total_size + count * (growth_bytes + 1)
+        return self.size, lines, size
+
+    def line_length_counts(self, variant_growths=((0, 0),), cap=0):
+        """
+        Nombre de lignes de chaque longueur inférieure à `cap`, avant filtrage.
+        :return: Liste indexée par la longueur des lignes.
+        """
+        lines = [0] * max(0, cap)
+        for length, (count, _) in self._distribution().items():
+            for growth, _ in variant_growths:
+                if 0 <= length + growth < cap:
+                    lines[length + growth] += count
+        return lines
+
+def compile_template(text, sources, start_year=1900, end_year=2025):
+    """
+    Compile un gabarit en pools de candidats.
+    :param sources: Dict {nom d'emplacement: liste de candidats} pour {word} et {special}.
+    :param start_year: Première année des emplacements {year} et {date}.
+    :param end_year: Dernière année des emplacements {year} et {date}.
+    Les textes fixes sont collés aux pools voisins et les derniers emplacements sont
+    fusionnés (jusqu'à MERGE_LIMIT candidats) : moins d'éléments à assembler par
+    ligne, sans changer ni l'ordre ni le contenu de la sortie.
+    """
+    pools = []
+    for kind, value in parse_template(text):
+        if kind == 'slot' and value in sources:
+            pool = tuple(dict.fromkeys(sources[value] or ()))
+            if not pool:
+                raise ValueError(f"aucun candidat pour l'emplacement {{{value}}}")
+        elif kind == 'slot':
+            pool = tuple(parse_source(value, start_year, end_year))
+        elif kind == 'mask':
+            pool = tuple(MASK_CHARSETS[value])
+        else:
+            pool = (value,)
+        if pools and (len(pool) == 1 or len(pools[-1]) == 1):
+            pools[-1] = _merge(pools[-1], pool)
+        else:
+            pools.append(pool)
+    while len(pools) > 1 and len(pools[-2]) * len(pools[-1]) <= MERGE_LIMIT:
+        right = pools.pop()
+        pools[-1] = _merge(pools[-1], right)
+    return Template(text, pools)
@@ -0,0 +1,36 @@
+# Outils communs aux tests pour MatrixSec - By ScriptSeinsei
+
+import os
+import sys
+
+import pytest
+
+# Les modules du projet sont des scripts à la racine du dépôt
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wordlist_gen import WordlistOptions, generate_wordlist  # noqa: E402
+
+# Mots ASCII de longueurs variées (le moteur bytes reste actif)
+WORDS = ['alice', 'Bob', 'carol', '2020', 'x', 'dave!', 'evelyne', 'fr', 'Zoe', 'max99',
+         'paris', 'Q', 'summer', 'ab_c', 'Lyon', 'wolf']
+
+# Réglages de référence : variantes de casse et caractères spéciaux, sans filtre de longueur
+BASE_OPTIONS = {'max_length': 3, 'case_variants': True, 'special_chars': ['!', '#'], 'append_special': True,
+                'min_char_length': 0}
+
+
+@pytest.fixture
+def generate(tmp_path):
+    """
+    Génère une wordlist dans un fichier temporaire.
+    :return: Fonction (mots, **options) -> contenu du fichier en octets
+    """
+    runs = []
+
+    def run(words=WORDS, **options):
+        path = tmp_path / f"wordlist{len(runs)}.txt"
+        runs.append(path)
+        generate_wordlist(list(words), str(path), WordlistOptions(**options))
+        return path.read_bytes()
+
+    return run
@@ -0,0 +1,80 @@
+# Sorties compressées (gzip, zstd, lz4), reprise comprise, comparées à la sortie en clair, pour MatrixSec - By ScriptSeinsei
+
+import os
+
+import pytest
+
+import wordlist_gen
+from compression import CODECS, detect_codec, open_decompressed
+from conftest import BASE_OPTIONS
+from test_resume import RESUME_WORDS, _interrupt_after
+from wordlist_gen import WordlistOptions, generate_wordlist
+
+
+def _decompress(path):
+    raw, stream = open_decompressed(path, detect_codec(path))
+    with raw, stream:
+        return stream.read()
+
+
+@pytest.mark.parametrize('codec', list(CODECS))
+@pytest.mark.parametrize('workers', [1, 3])
+def test_compressed_output_round_trip(generate, tmp_path, codec, workers):
+    expected = generate(**BASE_OPTIONS)
+    output = str(tmp_path / 'wordlist.txt')
+    generate_wordlist(list(RESUME_WORDS[:16]), output, WordlistOptions(workers=workers, compress={'codec': codec, 'threads': 2}, **BASE_OPTIONS))
+    assert detect_codec(output) == codec
+    assert _decompress(output) == expected
+    # Extension du codec : compression sans option
+    output = str(tmp_path / f'wordlist{CODECS[codec][0]}')
+    generate_wordlist(list(RESUME_WORDS[:16]), output, WordlistOptions(workers=workers, **BASE_OPTIONS))
+    assert _decompress(output) == expected
+
+
+@pytest.mark.parametrize('codec', list(CODECS))
+@pytest.mark.parametrize('workers', [1, 2])
+def test_compressed_resume_matches_uninterrupted_run(generate, tmp_path, monkeypatch, codec, workers):
+    options = dict(BASE_OPTIONS, workers=workers)
+    expected = generate(RESUME_WORDS, **options)
+    output = str(tmp_path / 'resumed.txt')
+    settings = WordlistOptions(resume=True, checkpoint_interval=0, compress={'codec': codec}, **options)
+
+    calls = _interrupt_after(monkeypatch, 2)
+    with pytest.raises(KeyboardInterrupt):
+        generate_wordlist(RESUME_WORDS, output, settings)
+    assert len(calls) == 2
+    monkeypatch.undo()
+    # Trame incomplète après le dernier point de reprise : elle doit être retirée
+    with open(output, 'ab') as f_out:
+        f_out.write(CODECS[codec][2] + b'tronque')
+
+    generate_wordlist(RESUME_WORDS, output, settings)
+    assert _decompress(output) == expected
+    assert not os.path.exists(output + '.ckpt')
+
+
+@pytest.mark.parametrize('first, second', [({'codec': 'gzip'}, None), (None, {'codec': 'gzip'}), ({'codec': 'gzip'}, {'codec': 'zstd'})])
+def test_resume_rejects_other_codec(tmp_path, monkeypatch, capsys, first, second):
+    output = str(tmp_path / 'resumed.txt')
+    options = dict(BASE_OPTIONS, resume=True, checkpoint_interval=0)
+    _interrupt_after(monkeypatch, 2)
+    with pytest.raises(KeyboardInterrupt):
+        generate_wordlist(RESUME_WORDS, output, WordlistOptions(compress=first, **options))
+    monkeypatch.undo()
+    with open(output, 'rb') as f_out:
+        partial = f_out.read()
+
+    capsys.readouterr()
+    generate_wordlist(RESUME_WORDS, output, WordlistOptions(compress=second, **options))
+    assert 'ne correspond pas aux paramètres actuels' in capsys.readouterr().out
+    # Ni la sortie ni le point de reprise ne sont touchés
+    with open(output, 'rb') as f_out:
+        assert f_out.read() == partial
+    assert os.path.exists(output + '.ckpt')
+
+
+def test_plain_fingerprint_unchanged():
+    # Les points de reprise en clair écrits avant l'ajout du codec restent valables
+    args = (['a', 'b'], {'separator': ''}, [(1, 0, 2, None)], 10, 1, False)
+    assert wordlist_gen._fingerprint(*args) == wordlist_gen._fingerprint(*args, None)
+    assert wordlist_gen._fingerprint(*args) != wordlist_gen._fingerprint(*args, 'gzip')
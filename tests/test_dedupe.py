@@ -0,0 +1,106 @@
+# Dédoublonnage en flux (filtre de Bloom par blocs, tri externe), comparé à un dédoublonnage en mémoire, pour MatrixSec - By ScriptSeinsei
+
+import os
+import random
+
+import pytest
+
+from conftest import BASE_OPTIONS
+from dedupe import BloomDedupWriter, ExternalSortDedupWriter
+
+
+def _lines(count, seed=0, distinct=2000):
+    rng = random.Random(seed)
+    pool = [''.join(rng.choice('abcXY19é!') for _ in range(rng.randint(0, 12))).encode('utf-8') for _ in range(distinct)]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def _feed(writer, data, rng):
+    # Morceaux de taille quelconque : les lignes sont coupées entre deux écritures
+    position = 0
+    while position < len(data):
+        size = rng.choice([1, 2, 7, 64, 4096])
+        writer.write(data[position:position + size])
+        position += size
+    writer.close()
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_bloom_keeps_first_seen_order(tmp_path, seed):
+    lines = _lines(20000, seed)
+    path = tmp_path / 'sortie.txt'
+    writer = BloomDedupWriter(open(path, 'wb'), len(lines), 1e-6)
+    _feed(writer, b''.join(line + b'\n' for line in lines), random.Random(seed))
+    expected = list(dict.fromkeys(lines))
+    assert path.read_bytes() == b''.join(line + b'\n' for line in expected)
+    assert writer.duplicates == len(lines) - len(expected)
+
+
+def test_bloom_never_writes_duplicates(tmp_path):
+    # Filtre sous-dimensionné : des lignes nouvelles peuvent être écartées, jamais un doublon écrit
+    lines = _lines(50000, 1, distinct=20000)
+    path = tmp_path / 'sortie.txt'
+    writer = BloomDedupWriter(open(path, 'wb'), 2000, 0.01)
+    _feed(writer, b''.join(line + b'\n' for line in lines), random.Random(1))
+    output = path.read_bytes().split(b'\n')[:-1]
+    assert len(output) == len(set(output))
+    first_seen = list(dict.fromkeys(lines))
+    assert len(output) < len(first_seen)
+    # Sous-suite de l'ordre d'apparition
+    positions = {line: index for index, line in enumerate(first_seen)}
+    assert [positions[line] for line in output] == sorted(positions[line] for line in output)
+    assert writer.duplicates == len(lines) - len(output)
+
+
+@pytest.mark.parametrize('fp_rate', [0.01, 0.001])
+def test_bloom_false_positive_rate(tmp_path, fp_rate):
+    count = 100000
+    lines = [f'mot{i}'.encode('ascii') for i in range(count)]
+    path = tmp_path / 'sortie.txt'
+    with BloomDedupWriter(open(path, 'wb'), count, fp_rate) as writer:
+        writer.write(b''.join(line + b'\n' for line in lines))
+    assert writer.duplicates <= 2 * fp_rate * count
+
+
+@pytest.mark.parametrize('memory_limit', [2000, 20000, 10 ** 9])
+def test_exact_matches_sorted_set(tmp_path, memory_limit):
+    lines = _lines(30000, 2)
+    path = tmp_path / 'sortie.txt'
+    writer = ExternalSortDedupWriter(open(path, 'wb'), memory_limit, str(tmp_path))
+    data = b''.join(line + b'\n' for line in lines)
+    for i in range(0, len(data), 1000):
+        writer.write(data[i:i + 1000])
+    if memory_limit < 10 ** 9:
+        assert len(writer.runs) >= 3
+    tmp_dir = writer.tmp_dir
+    writer.close()
+    expected = sorted(set(lines))
+    assert path.read_bytes() == b''.join(line + b'\n' for line in expected)
+    assert writer.duplicates == len(lines) - len(expected)
+    assert not os.path.exists(tmp_dir)
+
+
+@pytest.mark.parametrize('writer_class', [BloomDedupWriter, ExternalSortDedupWriter])
+def test_lines_split_across_writes(tmp_path, writer_class):
+    path = tmp_path / 'sortie.txt'
+    writer = writer_class(open(path, 'wb'), *((100, 1e-6) if writer_class is BloomDedupWriter else (100,)))
+    for chunk in [b'ab', b'c\nabc', b'\n', b'\nab', b'c\nx', b'yz\n', b'ab', b'c']:
+        writer.write(chunk)
+    writer.close()
+    # La dernière ligne, sans fin de ligne, est complétée à la fermeture
+    expected = [b'abc', b'', b'xyz'] if writer_class is BloomDedupWriter else [b'', b'abc', b'xyz']
+    assert path.read_bytes() == b''.join(line + b'\n' for line in expected)
+    assert writer.duplicates == 3
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_generated_wordlist_dedupe(generate, workers):
+    # 'abc' et 'ABC' donnent les mêmes variantes de casse : doublons garantis
+    words = ['abc', 'ABC', 'Abc', 'x1', 'y2']
+    options = dict(BASE_OPTIONS, workers=workers)
+    lines = generate(words, **options).split(b'\n')[:-1]
+    assert len(lines) > len(set(lines))
+    exact = generate(words, dedupe={'mode': 'exact', 'memory': 1000}, **options)
+    assert exact == b''.join(line + b'\n' for line in sorted(set(lines)))
+    bloom = generate(words, dedupe={'mode': 'bloom', 'fp_rate': 1e-6}, **options)
+    assert bloom == b''.join(line + b'\n' for line in dict.fromkeys(lines))
@@ -0,0 +1,24 @@
+# Équivalence des moteurs bytes et str pour MatrixSec - By ScriptSeinsei
+
+import pytest
+
+from conftest import BASE_OPTIONS
+
+
+@pytest.mark.parametrize('options', [
+    BASE_OPTIONS,
+    dict(BASE_OPTIONS, separator='_', min_char_length=6, max_char_length=12),
+    dict(BASE_OPTIONS, rules=[':', 'u', 'c $1 $2', 'r', 'T0 ^@', 'd', 'sa4']),
+    {'template': '{word}?u?d', 'case_variants': True, 'min_char_length': 0},
+])
+def test_bytes_engine_matches_str_engine(generate, options):
+    expected = generate(engine='str', **options)
+    assert expected
+    assert generate(engine='bytes', **options) == expected
+
+
+def test_non_ascii_words_fall_back_to_str(generate):
+    words = ['élise', 'Noël', 'straße', 'x']
+    options = {'max_length': 2, 'case_variants': True, 'min_char_length': 0}
+    assert generate(words, engine='bytes', **options) == generate(words, engine='str', **options)
+
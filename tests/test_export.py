@@ -0,0 +1,118 @@
+# Attaque base + règles (--formats hashcat/john) et fichier de configuration, pour MatrixSec - By ScriptSeinsei
+
+import json
+import re
+import sys
+
+import pytest
+
+import wordlist_gen
+from conftest import WORDS
+from rules import compile_rules
+from sources import parse_source
+from wordlist_gen import WordlistOptions, export_rule_attack, load_config
+
+EXPORT_OPTIONS = {'max_length': 2, 'case_variants': True, 'special_chars': ['!', '[', ']', '\\'], 'append_special': True,
+                  'suffixes': [parse_source('num:00-03')]}
+
+
+# Positions des règles : 0-9 puis A-Z
+POSITIONS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def _apply(base, rules):
+    """Applique chaque règle à chaque mot de base, mot par mot, comme une attaque -r."""
+    transform = compile_rules(tuple(rules))
+    return [variant for word in base for variant in transform(word)]
+
+
+def _export(tmp_path, formats, **options):
+    output = str(tmp_path / 'wordlist.txt')
+    export_rule_attack(list(WORDS), output, formats, WordlistOptions(**options))
+    base = (tmp_path / 'wordlist.txt.base.txt').read_text(encoding='utf-8').splitlines()
+    return base, {fmt: (tmp_path / f'wordlist.txt.{fmt}.rule').read_text(encoding='utf-8').splitlines() for fmt in formats}
+
+
+def _lines(output):
+    return output.decode('utf-8').splitlines()
+
+
+def test_hashcat_rules_reproduce_wordlist(generate, tmp_path):
+    options = dict(EXPORT_OPTIONS, min_char_length=0)
+    base, rule_files = _export(tmp_path, ['hashcat'], **options)
+    assert base == _lines(generate(max_length=2, min_char_length=0))
+    assert _apply(base, rule_files['hashcat']) == _lines(generate(**options))
+
+
+@pytest.mark.parametrize('bounds', [(0, None), (7, None), (0, 9), (6, 12)])
+def test_john_rules_reproduce_wordlist(generate, tmp_path, bounds):
+    min_chars, max_chars = bounds
+    options = dict(EXPORT_OPTIONS, min_char_length=min_chars, max_char_length=max_chars)
+    base, rule_files = _export(tmp_path, ['john', 'hashcat'], **options)
+    header, *john = rule_files['john']
+    assert header == '[List.Rules:MatrixSec]'
+    rules = []
+    for line in john:
+        # Rejets de fin de règle : '>N' garde les mots de plus de N caractères, '<N' ceux de moins de N
+        rejects = re.search(r'((?:[<>][0-9A-Z])*)$', line).group(1)
+        rule = line[:len(line) - len(rejects)]
+        assert rejects == ('>' + POSITIONS[min_chars - 1] if min_chars > 1 else '') + \
+            ('<' + POSITIONS[max_chars + 1] if max_chars is not None else '')
+        # Préprocesseur de john : crochets et barres obliques inverses échappés
+        assert re.search(r'(?<!\\)(\\\\)*[\[\]]', rule) is None
+        rules.append((re.sub(r'\\(.)', r'\1', rule), [(op, POSITIONS.index(n)) for op, n in re.findall(r'([<>])(.)', rejects)]))
+    # Mêmes règles que pour hashcat, une fois les échappements retirés
+    assert [rule for rule, _ in rules] == rule_files['hashcat']
+    variants = []
+    for word in base:
+        for (rule, rejects), variant in zip(rules, compile_rules(tuple(rule for rule, _ in rules))(word)):
+            if all(len(variant) > n if op == '>' else len(variant) < n for op, n in rejects):
+                variants.append(variant)
+    assert variants == _lines(generate(**options))
+
+
+def test_compressed_export(tmp_path):
+    output = str(tmp_path / 'wordlist.gz')
+    export_rule_attack(list(WORDS), output, ['hashcat'], WordlistOptions(max_length=1))
+    assert (tmp_path / 'wordlist.base.txt.gz').exists() and (tmp_path / 'wordlist.hashcat.rule').exists()
+
+
+def test_example_config_loads():
+    defaults = load_config('config.json')
+    assert defaults['no_interactive'] and defaults['max_length'] == 3 and defaults['min_chars'] == 6
+    assert defaults['years'] == '1990-2025' and 'config_suffix' not in defaults
+    assert defaults['formats'] == ['plain']
+
+
+@pytest.mark.parametrize('content, message', [
+    ('{"default_settings": {"max_length": 3,}}', 'JSON invalide, ligne 1'),
+    ('[1, 2]', 'un objet JSON est attendu'),
+    ('{"default_settings": [1]}', 'default_settings doit être un objet'),
+    ('{"default_settings": {"max_lenght": 3}}', 'paramètre inconnu default_settings.max_lenght'),
+    ('{"default_settings": {"max_length": "3"}}', 'default_settings.max_length doit être un entier ou null'),
+    ('{"default_settings": {"max_combinations": true}}', 'default_settings.max_combinations doit être un entier'),
+    ('{"default_settings": {"case_variants": 1}}', 'default_settings.case_variants doit être un booléen'),
+    ('{"special_chars": ["!"]}', 'special_chars doit être une chaîne'),
+    ('{"special_chars": {"default": 5}}', 'special_chars.default doit être une chaîne'),
+    ('{"years": "1990-2000"}', 'years doit être un objet'),
+    ('{"years": {"start_year": "1990"}}', 'years.start_year doit être un entier'),
+    ('{"years": {"suffixes": "year"}}', 'years.suffixes doit être une liste'),
+    ('{"common_words": "admin"}', 'common_words doit être une liste'),
+    ('{"output_formats": ["plain"]}', 'output_formats doit être un objet'),
+    ('{"output_formats": {"plain": true, "csv": true}}', 'format de sortie inconnu csv'),
+])
+def test_invalid_config(tmp_path, content, message):
+    path = tmp_path / 'config.json'
+    path.write_text(content, encoding='utf-8')
+    with pytest.raises(ValueError, match=re.escape(message)):
+        load_config(str(path))
+
+
+def test_invalid_config_error_in_main(tmp_path, monkeypatch, capsys):
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps({'years': {'start_year': '1990'}}), encoding='utf-8')
+    monkeypatch.setattr(sys, 'argv', ['wordlist_gen.py', '--config', str(path), '--input', 'mots-exemple.txt',
+                                      '--output', str(tmp_path / 'sortie.txt')])
+    wordlist_gen.main()
+    assert f"Erreur : configuration {path} : years.start_year doit être un entier" in capsys.readouterr().out
+    assert not (tmp_path / 'sortie.txt').exists()
@@ -0,0 +1,112 @@
+# Élagage par longueur et estimations exactes, comparés à une énumération complète, pour MatrixSec - By ScriptSeinsei
+
+import itertools
+import random
+
+import pytest
+
+from combinatorics import estimate_output, iter_combinations_pruned
+from conftest import BASE_OPTIONS, WORDS
+from templates import compile_template
+from wordlist_gen import plan_wordlist, resolve_rules
+
+
+def _random_words(rng, count):
+    alphabet = 'abcXYZ19é!'
+    return list(dict.fromkeys(''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 8))) for _ in range(count)))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_pruned_iterator_matches_brute_force(seed):
+    rng = random.Random(seed)
+    pool = _random_words(rng, rng.randint(1, 12))
+    lengths = [len(word) for word in pool]
+    k = rng.randint(1, min(4, len(pool)))
+    low = rng.randint(0, 4 * k)
+    high = rng.choice([None, low + rng.randint(0, 3 * k)])
+    total = len(list(itertools.combinations(pool, k)))
+    start = rng.randint(0, total)
+    stop = rng.choice([None, rng.randint(start, total)])
+    expected = [(rank - start, combo) for rank, combo in enumerate(itertools.combinations(pool, k))
+                if start <= rank < (total if stop is None else stop)
+                and low <= sum(map(len, combo)) and (high is None or sum(map(len, combo)) <= high)]
+    assert list(iter_combinations_pruned(pool, k, lengths, low, high, start, stop)) == expected
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_estimate_output_matches_brute_force(seed):
+    rng = random.Random(seed)
+    words = _random_words(rng, rng.randint(1, 10))
+    k = rng.randint(0, min(4, len(words)))
+    separator = rng.choice(['', '-', 'é'])
+    growths = [(0, 0)] + [(chars, chars + rng.randint(0, 1)) for chars in rng.sample(range(1, 5), rng.randint(0, 3))]
+    min_chars = rng.randint(0, 12)
+    max_chars = rng.choice([None, min_chars + rng.randint(0, 10)])
+    lines = size = 0
+    for combo in itertools.combinations(words, k):
+        line = separator.join(combo)
+        for chars, extra in growths:
+            if min_chars <= len(line) + chars and (max_chars is None or len(line) + chars <= max_chars):
+                lines += 1
+                size += len(line.encode('utf-8')) + extra + 1
+    combos = len(list(itertools.combinations(words, k)))
+    assert estimate_output(words, k, separator, growths, min_chars, max_chars=max_chars) == (combos, lines, size)
+
+
+@pytest.mark.parametrize('bounds', [(0, 8), (7, 12), (12, None), (20, 40)])
+def test_length_bounds_match_filtered_output(generate, bounds):
+    min_chars, max_chars = bounds
+    unbounded = generate(engine='str', **BASE_OPTIONS)
+    expected = b''.join(line for line in unbounded.splitlines(keepends=True)
+                        if min_chars <= len(line) - 1 and (max_chars is None or len(line) - 1 <= max_chars))
+    options = dict(BASE_OPTIONS, min_char_length=min_chars, max_char_length=max_chars)
+    assert generate(**options) == expected
+    assert generate(workers=2, **options) == expected
+
+
+@pytest.mark.parametrize('bounds', [(0, 8), (7, 12), (12, None)])
+def test_plan_matches_generated_output(generate, bounds):
+    min_chars, max_chars = bounds
+    options = dict(BASE_OPTIONS, min_char_length=min_chars, max_char_length=max_chars)
+    settings = {'separator': '', 'engine': 'str', 'ascii': True, 'min_char_length': min_chars,
+                'rules': resolve_rules(None, True, options['special_chars'], True)}
+    if max_chars is not None:
+        settings['max_char_length'] = max_chars
+    output = generate(**options)
+    plan = plan_wordlist(WORDS, settings, 1, 3, 10 ** 9)
+    assert all(step['exact'] for step in plan)
+    assert sum(step['lines'] for step in plan) == output.count(b'\n')
+    assert sum(step['bytes'] for step in plan) == len(output)
+
+    template = compile_template('{word}?d', {'word': WORDS})
+    output = generate(template='{word}?d', case_variants=True, min_char_length=min_chars, max_char_length=max_chars)
+    step, = plan_wordlist(WORDS, dict(settings, rules=resolve_rules(None, True, None, False)), 1, 1, 10 ** 9, template)
+    assert (step['lines'], step['bytes']) == (output.count(b'\n'), len(output))
+
+
+@pytest.mark.parametrize('bounds', [(5, None), (0, 4), (5, 5)])
+def test_case_changing_length_is_not_pruned(generate, bounds):
+    # 'groß'.upper() == 'GROSS' : la casse allonge le mot, aucune combinaison ne doit être écartée
+    min_chars, max_chars = bounds
+    words = ['groß', 'ab']
+    unbounded = generate(words, max_length=1, case_variants=True, min_char_length=0)
+    expected = b''.join(line for line in unbounded.splitlines(keepends=True)
+                        if min_chars <= len(line[:-1].decode('utf-8')) and (max_chars is None or len(line[:-1].decode('utf-8')) <= max_chars))
+    assert b'GROSS\n' in unbounded
+    assert generate(words, max_length=1, case_variants=True, min_char_length=min_chars, max_char_length=max_chars) == expected
+    settings = {'separator': '', 'engine': 'str', 'ascii': False, 'min_char_length': min_chars,
+                'max_char_length': max_chars, 'rules': resolve_rules(None, True, None, False)}
+    step, = plan_wordlist(words, settings, 1, 1, 10 ** 9)
+    assert not step['exact'] and step['lines'] >= expected.count(b'\n')
+
+
+@pytest.mark.parametrize('bounds', [(7, None), (0, 8), (7, 12)])
+def test_length_bands_reported_with_any_bound(generate, capsys, bounds):
+    min_chars, max_chars = bounds
+    generate(**dict(BASE_OPTIONS, min_char_length=min_chars, max_char_length=max_chars))
+    assert 'Lignes par longueur' in capsys.readouterr().out
+
+
+def test_length_bands_not_reported_without_bounds(generate, capsys):
+    generate(**BASE_OPTIONS)
+    assert 'Lignes par longueur' not in capsys.readouterr().out
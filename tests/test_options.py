@@ -0,0 +1,45 @@
+# Tests de compatibilité de la signature de generate_wordlist pour MatrixSec - By ScriptSeinsei
+
+import pytest
+
+from wordlist_gen import WordlistOptions, generate_wordlist
+from conftest import WORDS
+
+
+def _generate(tmp_path, name, *args, **kwargs):
+    output = tmp_path / name
+    generate_wordlist(WORDS, str(output), *args, **kwargs)
+    return output.read_bytes()
+
+
+def test_legacy_positional_call_matches_options(tmp_path):
+    expected = _generate(tmp_path, 'options.txt', WordlistOptions(
+        max_combinations=100, min_length=1, max_length=2, separator='',
+        case_variants=True, special_chars=['!'], append_special=True))
+    assert expected
+    assert _generate(tmp_path, 'legacy.txt', 100, 1, 2, '', True, ['!'], True) == expected
+
+
+def test_legacy_keyword_call_matches_options(tmp_path):
+    expected = _generate(tmp_path, 'options.txt', WordlistOptions(max_length=2, separator='-', case_variants=True))
+    assert _generate(tmp_path, 'legacy.txt', max_length=2, separator='-', case_variants=True) == expected
+
+
+def test_keywords_override_options(tmp_path):
+    expected = _generate(tmp_path, 'options.txt', WordlistOptions(max_length=2, separator='_'))
+    assert _generate(tmp_path, 'mixed.txt', WordlistOptions(max_length=2), separator='_') == expected
+
+
+def test_default_call_unchanged(tmp_path):
+    assert _generate(tmp_path, 'none.txt') == _generate(tmp_path, 'default.txt', WordlistOptions())
+
+
+@pytest.mark.parametrize('args, kwargs', [
+    ((WordlistOptions(), 1), {}),
+    ((100,), {'max_combinations': 10}),
+    (tuple(range(30)), {}),
+    ((), {'unknown': 1}),
+])
+def test_invalid_calls_raise_type_error(tmp_path, args, kwargs):
+    with pytest.raises(TypeError):
+        generate_wordlist(WORDS, str(tmp_path / 'out.txt'), *args, **kwargs)
@@ -0,0 +1,20 @@
+# Équivalence du mode multi-processus et du mode mono-processus pour MatrixSec - By ScriptSeinsei
+
+import pytest
+
+from conftest import BASE_OPTIONS
+from sources import parse_source
+
+
+@pytest.mark.parametrize('options', [
+    BASE_OPTIONS,
+    dict(BASE_OPTIONS, max_combinations=5000),  # Limite au milieu d'une plage
+    dict(BASE_OPTIONS, separator='-', min_char_length=8, max_char_length=14),
+    {'max_length': 2, 'case_variants': True, 'suffixes': [parse_source('num:0-9'), parse_source('year', 2020, 2022)]},
+    {'template': '{word}?d{special}', 'special_chars': ['!', '@'], 'case_variants': True, 'min_char_length': 0},
+])
+def test_workers_match_single_process_str(generate, options):
+    expected = generate(engine='str', **options)
+    assert expected
+    assert generate(workers=3, **options) == expected
+    assert generate(workers=3, engine='str', **options) == expected
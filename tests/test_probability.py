@@ -0,0 +1,88 @@
+# Génération par probabilité décroissante (--model), comparée au mode habituel, pour MatrixSec - By ScriptSeinsei
+
+import collections
+import itertools
+import math
+import random
+
+import pytest
+
+from conftest import BASE_OPTIONS, WORDS
+from probability import iter_by_probability
+from sources import parse_source
+
+
+def _sorted_logps(rng, count):
+    return sorted((math.log(rng.random()) for _ in range(count)), reverse=True)
+
+
+def _problem(seed):
+    rng = random.Random(seed)
+    words = _sorted_logps(rng, rng.randint(1, 7))
+    lengths = {k: math.log(rng.random()) for k in range(1, rng.randint(1, 3) + 1)}
+    dimensions = [_sorted_logps(rng, rng.randint(1, 4)) for _ in range(rng.randint(0, 2))]
+    return words, lengths, dimensions
+
+
+def _score(words, lengths, dimensions, indices, coords):
+    return lengths[len(indices)] + sum(words[i] for i in indices) + sum(d[c] for d, c in zip(dimensions, coords))
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_unlimited_beam_is_exhaustive_and_ordered(seed):
+    words, lengths, dimensions = _problem(seed)
+    stats = {}
+    emitted = list(iter_by_probability(words, lengths, dimensions, beam_width=10 ** 9, stats=stats))
+    states = [(tuple(indices), tuple(coords)) for _, indices, coords in emitted]
+    expected = {(combo, coords) for k in lengths if k <= len(words) for combo in itertools.combinations(range(len(words)), k)
+                for coords in itertools.product(*(range(len(d)) for d in dimensions))}
+    assert len(states) == len(set(states)) == len(expected)
+    assert set(states) == expected
+    assert stats.get('dropped', 0) == 0
+    scores = [logp for logp, _, _ in emitted]
+    assert all(later <= earlier + 1e-9 for earlier, later in zip(scores, scores[1:]))
+    for logp, indices, coords in emitted:
+        assert logp == pytest.approx(_score(words, lengths, dimensions, indices, coords))
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_small_beam_drops_without_duplicates(seed):
+    words, lengths, dimensions = _problem(seed + 100)
+    stats = {}
+    emitted = [(tuple(indices), tuple(coords)) for _, indices, coords in
+               iter_by_probability(words, lengths, dimensions, beam_width=2, stats=stats)]
+    complete = [(tuple(indices), tuple(coords)) for _, indices, coords in
+                iter_by_probability(words, lengths, dimensions, beam_width=10 ** 9)]
+    assert len(emitted) == len(set(emitted))
+    assert set(emitted) <= set(complete)
+    assert (len(emitted) < len(complete)) == bool(stats.get('dropped'))
+
+
+@pytest.fixture
+def leak(tmp_path):
+    rng = random.Random(0)
+    passwords = [rng.choice(WORDS).capitalize() + rng.choice(['', '1', '2020', '!']) for _ in range(300)]
+    path = tmp_path / 'fuite.txt'
+    path.write_text('\n'.join(passwords) + '\n', encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('options', [
+    BASE_OPTIONS,
+    dict(BASE_OPTIONS, min_char_length=6, max_char_length=12),
+    dict(BASE_OPTIONS, max_length=2, suffixes=[parse_source('num:0-3')]),
+])
+def test_probability_mode_emits_same_lines(generate, leak, capsys, options):
+    normal = generate(**options).splitlines()
+    ordered = generate(probability={'file': leak, 'beam_width': 10 ** 9}, **options).splitlines()
+    # Mêmes lignes, autant de fois chacune (les doublons viennent des règles, pas du parcours)
+    assert collections.Counter(ordered) == collections.Counter(normal)
+    assert ordered != normal
+    assert 'abandonné' not in capsys.readouterr().out
+
+
+def test_probability_mode_small_beam(generate, leak, capsys):
+    normal = collections.Counter(generate(**BASE_OPTIONS).splitlines())
+    ordered = collections.Counter(generate(probability={'file': leak, 'beam_width': 10}, **BASE_OPTIONS).splitlines())
+    assert not ordered - normal and sum(ordered.values()) < sum(normal.values())
+    assert 'la file de priorité a abandonné' in capsys.readouterr().out
@@ -0,0 +1,38 @@
+# Lecture par plages (mmap) de l'analyseur, fichiers vides compris, pour MatrixSec - By ScriptSeinsei
+
+import random
+
+import pytest
+
+from password_analyzer import analyze_wordlist, iter_range_lines, sample_random_offsets, split_ranges
+
+
+def test_empty_range_does_not_mmap(tmp_path):
+    path = tmp_path / 'vide.txt'
+    path.write_bytes(b'')
+    assert list(iter_range_lines(str(path), 0, 0)) == []
+    assert split_ranges(str(path), 4) == []
+    assert sample_random_offsets(str(path), 5, random.Random(0)) == []
+    path.write_bytes(b'abc\n')
+    assert list(iter_range_lines(str(path), 4, 4)) == []
+
+
+@pytest.mark.parametrize('sample_mode', ['head', 'reservoir', 'random'])
+@pytest.mark.parametrize('workers', [1, 2])
+def test_empty_file_is_analyzed(tmp_path, sample_mode, workers):
+    path = tmp_path / 'vide.txt'
+    path.write_bytes(b'')
+    stats = analyze_wordlist(str(path), sample_size=5, sample_mode=sample_mode, seed=1, workers=workers)
+    assert stats is not None and stats['total'] == 0
+    stats = analyze_wordlist(str(path), workers=workers)
+    assert stats is not None and stats['total'] == 0
+
+
+@pytest.mark.parametrize('parts', [1, 2, 7])
+def test_ranges_cover_every_line(tmp_path, parts):
+    rng = random.Random(parts)
+    lines = [''.join(rng.choice('abcé9') for _ in range(rng.randint(0, 30))) for _ in range(500)]
+    path = tmp_path / 'mots.txt'
+    path.write_bytes('\n'.join(lines).encode('utf-8') + b'\n')
+    read = [line for start, end in split_ranges(str(path), parts) for line in iter_range_lines(str(path), start, end)]
+    assert [line for line in read if line] == [line for line in lines if line]
@@ -0,0 +1,125 @@
+# Rapports machine (JSON, CSV, NDJSON) et scores par mot de passe de l'analyseur, relus et vérifiés, pour MatrixSec - By ScriptSeinsei
+
+import csv
+import json
+import os
+import random
+
+import pytest
+
+from password_analyzer import (ISSUE_LABELS, REPORT_COLUMNS, SCORE_FIELDS, STRENGTHS, analyze_wordlist,
+                               character_classes, score_password)
+
+
+@pytest.fixture
+def wordlist(tmp_path):
+    rng = random.Random(0)
+    passwords = [''.join(rng.choice('abcXYZ019!é,"') for _ in range(rng.randint(1, 16))) for _ in range(3000)]
+    path = tmp_path / 'mots.txt'
+    # Lignes vides ignorées, virgules et guillemets à échapper en CSV
+    path.write_bytes('\n'.join(passwords[:10] + ['', '  '] + passwords[10:]).encode('utf-8') + b'\n')
+    return str(path), passwords
+
+
+def _report(tmp_path, wordlist, fmt, **options):
+    output = str(tmp_path / f'rapport.{fmt}')
+    stats = analyze_wordlist(wordlist, output_file=output, report_format=fmt, **options)
+    return stats, output
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_json_report(tmp_path, wordlist, workers):
+    path, passwords = wordlist
+    stats, output = _report(tmp_path, path, 'json', workers=workers)
+    with open(output, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['total'] == len(passwords) == stats['total']
+    assert sum(entry['count'] for entry in data['strengths'].values()) == len(passwords)
+    strengths = [score_password(password)[1] for password in passwords]
+    for index, name in enumerate(('weak', 'medium', 'strong')):
+        assert data['strengths'][name]['count'] == strengths.count(index)
+        assert data['strengths'][name]['percent'] == pytest.approx(100 * strengths.count(index) / len(passwords))
+        assert data['strengths'][name]['ci'] is None
+    assert sum(count for _, count in data['length_histogram']) == len(passwords)
+    assert sum(count for _, count in data['entropy_histogram']) == len(passwords)
+    assert sum(count for _, count in data['class_histogram']) == len(passwords)
+    assert set(data['issue_codes']) <= set(data['issue_labels']) == {str(code) for code in ISSUE_LABELS}
+    for code, count in data['issue_codes'].items():
+        assert count == sum(bool(score_password(password)[2] & int(code)) for password in passwords)
+    assert all(set(entry) == {'password', 'score', 'entropy'} for entry in data['top_passwords'])
+    assert data['sampling'] is None
+
+
+def test_json_report_with_sample(tmp_path, wordlist):
+    path, _ = wordlist
+    _, output = _report(tmp_path, path, 'json', sample_size=500, sample_mode='reservoir', seed=4)
+    with open(output, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['total'] == 500
+    assert data['sampling']['mode'] == 'reservoir' and data['sampling']['seed'] == 4
+    assert all(len(entry['ci']) == 2 for entry in data['strengths'].values())
+    assert all(len(entry['ci']) == 2 for entry in data['common_issues'])
+
+
+def test_csv_and_ndjson_reports_agree(tmp_path, wordlist):
+    path, passwords = wordlist
+    _, csv_output = _report(tmp_path, path, 'csv', sample_size=500, seed=1)
+    _, ndjson_output = _report(tmp_path, path, 'ndjson', sample_size=500, seed=1)
+    with open(csv_output, encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        assert tuple(reader.fieldnames) == REPORT_COLUMNS
+        csv_rows = list(reader)
+    with open(ndjson_output, encoding='utf-8') as f:
+        ndjson_rows = [json.loads(line) for line in f]
+    assert len(csv_rows) == len(ndjson_rows)
+    for csv_row, ndjson_row in zip(csv_rows, ndjson_rows):
+        assert set(ndjson_row) <= set(REPORT_COLUMNS)
+        if ndjson_row['label'] == 'analysis_time':
+            continue  # Seule valeur propre à chaque exécution
+        # Le CSV écrit les valeurs absentes comme des chaînes vides, le NDJSON les omet
+        assert {key: value for key, value in csv_row.items() if value != ''} == {key: str(value) for key, value in ndjson_row.items()}
+    sections = {}
+    for row in ndjson_rows:
+        sections.setdefault(row['section'], []).append(row)
+    summary = {row['label']: row['value'] for row in sections['summary']}
+    assert summary['total'] == 500 and summary['seed'] == 1
+    assert [row['label'] for row in sections['strength']] == list(STRENGTHS)
+    assert sum(row['value'] for row in sections['strength']) == 500
+    for section in ('length', 'entropy', 'classes'):
+        assert sum(row['value'] for row in sections[section]) == 500
+    assert all('ci_low' in row and 'ci_high' in row for row in sections['issue'])
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'ndjson'])
+@pytest.mark.parametrize('workers', [1, 3])
+def test_scores_file(tmp_path, wordlist, fmt, workers):
+    path, passwords = wordlist
+    scores = str(tmp_path / f'scores.{fmt}')
+    analyze_wordlist(path, workers=workers, batch_size=250, scores_file=scores)
+    with open(scores, encoding='utf-8', newline='') as f:
+        if fmt == 'csv':
+            reader = csv.DictReader(f)
+            assert tuple(reader.fieldnames) == SCORE_FIELDS
+            rows = list(reader)
+        else:
+            rows = [json.loads(line) for line in f]
+    # Une ligne par mot de passe non vide, dans l'ordre du fichier
+    assert [row['password'] for row in rows] == passwords
+    for row, password in zip(rows, passwords):
+        score, strength, issues, entropy, mask = score_password(password)
+        assert set(row) == set(SCORE_FIELDS)
+        assert (int(row['score']), int(row['strength']), int(row['issues']), int(row['classes'])) == (score, strength, issues, mask)
+        assert float(row['entropy']) == round(entropy, 2)
+        assert mask == character_classes(password)
+    # Fichiers partiels des processus supprimés
+    assert sorted(os.listdir(tmp_path)) == sorted(['mots.txt', f'scores.{fmt}'])
+
+
+def test_scores_file_with_sample(tmp_path, wordlist):
+    path, passwords = wordlist
+    scores = str(tmp_path / 'scores.txt')
+    stats = analyze_wordlist(path, sample_size=200, sample_mode='head', scores_file=scores, scores_format='csv')
+    with open(scores, encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == stats['total'] == 200
+    assert [row['password'] for row in rows] == passwords[:200]
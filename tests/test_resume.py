@@ -0,0 +1,55 @@
+# Reprise après interruption (--resume) pour MatrixSec - By ScriptSeinsei
+
+import os
+
+import pytest
+
+import wordlist_gen
+from conftest import BASE_OPTIONS, WORDS
+from wordlist_gen import WordlistOptions, generate_wordlist
+
+# Assez de mots pour plusieurs points de reprise (un toutes les 1024 combinaisons au plus)
+RESUME_WORDS = WORDS + [f"mot{index}" for index in range(24)]
+
+
+def _interrupt_after(monkeypatch, saves):
+    """Interrompt la génération juste après le point de reprise numéro `saves`."""
+    original = wordlist_gen._save_checkpoint
+    calls = []
+
+    def save_then_interrupt(checkpoint_file, state, f_out=None):
+        original(checkpoint_file, state, f_out)
+        calls.append(state)
+        if len(calls) == saves:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(wordlist_gen, '_save_checkpoint', save_then_interrupt)
+    return calls
+
+
+@pytest.mark.parametrize('options', [
+    BASE_OPTIONS,
+    dict(BASE_OPTIONS, min_char_length=8, max_char_length=12),
+    dict(BASE_OPTIONS, workers=2),
+    dict(BASE_OPTIONS, max_combinations=50000),
+])
+def test_resume_after_interrupt_matches_uninterrupted_run(generate, tmp_path, monkeypatch, capsys, options):
+    expected = generate(RESUME_WORDS, **options)
+    output = str(tmp_path / 'resumed.txt')
+    settings = WordlistOptions(resume=True, checkpoint_interval=0, **options)
+
+    calls = _interrupt_after(monkeypatch, 2)
+    with pytest.raises(KeyboardInterrupt):
+        generate_wordlist(RESUME_WORDS, output, settings)
+    assert len(calls) == 2 and os.path.isfile(output + '.ckpt')
+    monkeypatch.undo()
+    # Lignes écrites après le dernier point de reprise : elles doivent être retirées
+    with open(output, 'ab') as f_out:
+        f_out.write(b'ligne partiel')
+
+    capsys.readouterr()
+    generate_wordlist(RESUME_WORDS, output, settings)
+    assert 'Reprise depuis' in capsys.readouterr().out
+    with open(output, 'rb') as f_out:
+        assert f_out.read() == expected
+    assert not os.path.exists(output + '.ckpt')
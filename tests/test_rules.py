@@ -0,0 +1,104 @@
+# Compilateur de règles (sous-ensemble hashcat), comparé aux définitions de hashcat, pour MatrixSec - By ScriptSeinsei
+
+import random
+
+import pytest
+
+from rules import compile_block, compile_rules, load_rules, parse_rule, rule_growth, serialize_rule
+
+# Exemples de la documentation des règles hashcat, appliqués à 'p@ssW0rd'
+HASHCAT_EXAMPLES = [
+    (':', 'p@ssW0rd'),
+    ('l', 'p@ssw0rd'),
+    ('u', 'P@SSW0RD'),
+    ('c', 'P@ssw0rd'),
+    ('C', 'p@SSW0RD'),
+    ('t', 'P@SSw0RD'),
+    ('T3', 'p@sSW0rd'),
+    ('r', 'dr0Wss@p'),
+    ('d', 'p@ssW0rdp@ssW0rd'),
+    ('f', 'p@ssW0rddr0Wss@p'),
+    ('{', '@ssW0rdp'),
+    ('}', 'dp@ssW0r'),
+    ('$1', 'p@ssW0rd1'),
+    ('^1', '1p@ssW0rd'),
+    ('[', '@ssW0rd'),
+    (']', 'p@ssW0r'),
+    ('D3', 'p@sW0rd'),
+    ("'6", 'p@ssW0'),
+    ('ss$', 'p@$$W0rd'),
+    ('@s', 'p@W0rd'),
+    # Positions hors du mot : le mot est inchangé
+    ('T8', 'p@ssW0rd'),
+    ('TZ', 'p@ssW0rd'),
+    ('D9', 'p@ssW0rd'),
+    ("'A", 'p@ssW0rd'),
+    # Suites d'ajouts regroupées, dans l'ordre de hashcat
+    ('$1$2$3', 'p@ssW0rd123'),
+    ('^3^2^1', '123p@ssW0rd'),
+    ('^a$1^b$2', 'bap@ssW0rd12'),
+    ('$1 $2 ^x', 'xp@ssW0rd12'),
+    ('c $2 $0 ^!', '!P@ssw0rd20'),
+    ('} }', 'rdp@ssW0'),
+    ('f {', '@ssW0rddr0Wss@pp'),
+]
+
+
+@pytest.mark.parametrize('rule, expected', HASHCAT_EXAMPLES)
+def test_rules_match_hashcat(rule, expected):
+    assert compile_rules((rule,))('p@ssW0rd') == (expected,)
+    assert compile_rules((rule,), 'utf-8')(b'p@ssW0rd') == (expected.encode('utf-8'),)
+
+
+def test_parse_rule_merges_appends():
+    assert parse_rule('$1$2$3') == [('$', ('123',))]
+    assert parse_rule('^3^2^1') == [('^', ('123',))]
+    assert parse_rule('$1 ^a $2') == [('$', ('1',)), ('^', ('a',)), ('$', ('2',))]
+    assert parse_rule(': l :') == [('l', ())]
+    assert parse_rule('T5DA\'Z') == [('T', (5,)), ('D', (10,)), ("'", (35,))]
+
+
+@pytest.mark.parametrize('rule', ['x', 'T', 'T?', '$', 'sa', "'", 'Da', 'l $'])
+def test_invalid_rules(rule):
+    with pytest.raises(ValueError):
+        parse_rule(rule)
+
+
+def test_load_rules_reports_errors(tmp_path):
+    path = tmp_path / 'regles.rule'
+    path.write_text('# commentaire\n\nl\nc $1\n', encoding='utf-8')
+    assert load_rules(path) == ['l', 'c $1']
+    path.write_text('l\n\nc $1\nT?\n', encoding='utf-8')
+    with pytest.raises(ValueError, match='ligne 4'):
+        load_rules(path)
+
+
+def _random_rule(rng):
+    functions = [':', 'l', 'u', 'c', 'C', 't', 'r', 'd', 'f', '{', '}', '[', ']',
+                 'T_', 'D_', "'_", '$_', '^_', 's__', '@_']
+    parts = []
+    for _ in range(rng.randint(1, 4)):
+        function = rng.choice(functions)
+        for _ in range(function.count('_')):
+            arg = rng.choice('0123456789AB') if function[0] in "TD'" else rng.choice('aAsS0$ !_')
+            function = function.replace('_', arg, 1)
+        parts.append(function)
+    return ' '.join(parts)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_bytes_mode_matches_str_mode(seed):
+    rng = random.Random(seed)
+    rules = tuple(_random_rule(rng) for _ in range(20))
+    keep = tuple(rng.random() < 0.5 for _ in rules)
+    as_str, as_bytes = compile_rules(rules), compile_rules(rules, 'utf-8')
+    block = compile_block(rules, keep)
+    for word in ['', 'a', 'Pass', 'p@ssW0rd', 'aAsS0$ !', 'zzzzzzzzzzzzzzzz']:
+        expected = as_str(word)
+        assert as_bytes(word.encode('utf-8')) == tuple(variant.encode('utf-8') for variant in expected)
+        assert block(word.encode('utf-8')) == b''.join(variant.encode('utf-8') + b'\n' for variant, kept in zip(expected, keep) if kept)
+        for rule, variant in zip(rules, expected):
+            assert parse_rule(serialize_rule(rule)) == parse_rule(rule)
+            growth = rule_growth(rule)
+            if growth is not None:
+                assert len(variant) == len(word) + growth[0]
@@ -0,0 +1,102 @@
+# Échantillonnage de l'analyseur (réservoir, positions aléatoires) et intervalles de confiance, pour MatrixSec - By ScriptSeinsei
+
+import collections
+import random
+
+import pytest
+
+from password_analyzer import _wilson_interval, analyze_wordlist, sample_random_offsets, sample_reservoir, score_password
+
+
+def _write(path, passwords):
+    path.write_bytes('\n'.join(passwords).encode('utf-8') + b'\n')
+    return str(path)
+
+
+def _corpus(count, seed=0):
+    rng = random.Random(seed)
+    return [''.join(rng.choice('abcXYZ0189!é') for _ in range(rng.randint(3, 16))) for _ in range(count)]
+
+
+def test_samplers_are_reproducible(tmp_path):
+    passwords = _corpus(2000)
+    path = _write(tmp_path / 'mots.txt', passwords)
+    assert sample_reservoir(passwords, 100, random.Random(7)) == sample_reservoir(passwords, 100, random.Random(7))
+    assert sample_reservoir(passwords, 100, random.Random(7)) != sample_reservoir(passwords, 100, random.Random(8))
+    assert sample_random_offsets(path, 100, random.Random(7)) == sample_random_offsets(path, 100, random.Random(7))
+    for mode in ('random', 'reservoir'):
+        first = analyze_wordlist(path, sample_size=50, sample_mode=mode, seed=3)
+        second = analyze_wordlist(path, sample_size=50, sample_mode=mode, seed=3)
+        first.pop('analysis_time'), second.pop('analysis_time')
+        assert first == second
+
+
+def test_reservoir_keeps_distinct_lines(tmp_path):
+    passwords = [f'mot{i}' for i in range(1000)]
+    sample = sample_reservoir(passwords, 100, random.Random(1))
+    assert len(sample) == len(set(sample)) == 100
+    assert set(sample) <= set(passwords)
+
+
+@pytest.mark.parametrize('sample_size', [30, 31, 1000])
+def test_sample_larger_than_file(tmp_path, sample_size):
+    passwords = [f'mot{i}' for i in range(30)]
+    path = _write(tmp_path / 'mots.txt', passwords + [''])
+    assert sorted(sample_reservoir(passwords + ['', '  '], sample_size, random.Random(0))) == sorted(passwords)
+    # Avec remise : la taille demandée est atteinte, avec des mots du fichier seulement
+    sample = sample_random_offsets(path, sample_size, random.Random(0))
+    assert len(sample) == sample_size and set(sample) <= set(passwords)
+    for mode in ('random', 'reservoir'):
+        stats = analyze_wordlist(path, sample_size=sample_size, sample_mode=mode, seed=0)
+        assert stats['total'] == 30
+        assert stats['sampling']['mode'] == 'reservoir'
+
+
+def test_random_offsets_are_uniform_over_lines(tmp_path):
+    # Lignes de tailles très différentes : chacune doit être tirée aussi souvent
+    passwords = [f'{i}' + 'x' * (1 + 60 * (i % 2)) for i in range(20)]
+    path = _write(tmp_path / 'mots.txt', passwords)
+    counts = collections.Counter(sample_random_offsets(path, 20000, random.Random(5)))
+    assert set(counts) == set(passwords)
+    short = sum(counts[password] for password in passwords[::2])
+    assert abs(short / 20000 - 0.5) < 0.02
+
+
+def test_wilson_interval():
+    assert _wilson_interval(0, 0) == (0.0, 0.0)
+    low, high = _wilson_interval(0, 100)
+    assert low == 0.0 and 0 < high < 5
+    low, high = _wilson_interval(100, 100)
+    assert 95 < low < 100 and high == pytest.approx(100)
+    low, high = _wilson_interval(50, 100)
+    assert low < 50 < high and abs((50 - low) - (high - 50)) < 1e-9
+
+
+@pytest.mark.parametrize('mode', ['random', 'reservoir'])
+def test_confidence_intervals_contain_full_scan(tmp_path, mode):
+    path = _write(tmp_path / 'mots.txt', _corpus(20000, 1))
+    full = analyze_wordlist(path)
+    stats = analyze_wordlist(path, sample_size=2000, sample_mode=mode, seed=0)
+    assert stats['sampling']['mode'] == mode
+    confidence = stats['sampling']['confidence']
+    for name in ('weak', 'medium', 'strong'):
+        low, high = confidence[name]
+        assert low <= full[f'{name}_percent'] <= high
+    for name in ('length', 'entropy'):
+        assert abs(stats[f'avg_{name}'] - full[f'avg_{name}']) <= confidence[f'avg_{name}']
+
+
+@pytest.mark.parametrize('mode', ['random', 'reservoir'])
+def test_confidence_interval_coverage(tmp_path, mode):
+    # Un intervalle à 95 % manque la vraie proportion une fois sur vingt environ
+    passwords = _corpus(20000, 2)
+    path = _write(tmp_path / 'mots.txt', passwords)
+    weak = {password for password in passwords if score_password(password)[1] == 0}
+    ratio = 100 * sum(password in weak for password in passwords) / len(passwords)
+    misses = 0
+    for seed in range(200):
+        rng = random.Random(seed)
+        sample = sample_random_offsets(path, 500, rng) if mode == 'random' else sample_reservoir(passwords, 500, rng)
+        low, high = _wilson_interval(sum(password in weak for password in sample), len(sample))
+        misses += not low <= ratio <= high
+    assert misses <= 20
@@ -0,0 +1,142 @@
+# Scoring par lots de l'analyseur, comparé à l'implémentation d'origine (expressions régulières), pour MatrixSec - By ScriptSeinsei
+
+import gzip
+import math
+import random
+import re
+import string
+
+import pytest
+
+from password_analyzer import analyze_password_strength, analyze_wordlist, calculate_entropy, score_batch, score_password, STRENGTHS
+
+
+def _reference_entropy(password):
+    # calculate_entropy d'origine
+    pool_size = 0
+    if re.search(r'[a-z]', password):
+        pool_size += 26
+    if re.search(r'[A-Z]', password):
+        pool_size += 26
+    if re.search(r'[0-9]', password):
+        pool_size += 10
+    if re.search(r'[^a-zA-Z0-9]', password):
+        pool_size += 33
+    if pool_size == 0:
+        pool_size = 10
+    return math.log2(pool_size) * len(password)
+
+
+def _reference_strength(password):
+    # analyze_password_strength d'origine
+    score = 0
+    comments = []
+    if len(password) < 8:
+        comments.append("Trop court")
+    elif len(password) >= 12:
+        score += 2
+        comments.append("Bonne longueur")
+    else:
+        score += 1
+    if re.search(r'[a-z]', password) and re.search(r'[A-Z]', password):
+        score += 1
+    else:
+        comments.append("Manque de variation de casse")
+    if re.search(r'[0-9]', password):
+        score += 1
+    else:
+        comments.append("Pas de chiffres")
+    if re.search(r'[^a-zA-Z0-9]', password):
+        score += 1
+    else:
+        comments.append("Pas de caractères spéciaux")
+    if re.search(r'(.)\1\1', password):
+        score -= 1
+        comments.append("Répétitions de caractères")
+    if re.search(r'(123|abc|qwerty|password|admin)', password.lower()):
+        score -= 1
+        comments.append("Contient des séquences communes")
+    entropy = _reference_entropy(password)
+    if entropy < 40:
+        comments.append(f"Faible entropie ({entropy:.1f} bits)")
+    elif entropy > 60:
+        score += 1
+        comments.append(f"Bonne entropie ({entropy:.1f} bits)")
+    else:
+        comments.append(f"Entropie moyenne ({entropy:.1f} bits)")
+    strength = "Faible"
+    if score >= 4:
+        strength = "Fort"
+    elif score >= 2:
+        strength = "Moyen"
+    return {"score": score, "strength": strength, "comments": comments, "entropy": entropy}
+
+
+PASSWORDS = [
+    '', 'a', 'Z', '7', '!', 'é', 'ß', 'É', '٣', '密码',
+    'abcdefgh', 'ABCDEFGHIJKL', '0123456789', '!@#$%^&*()',
+    'aaa', 'AAAAAAAAAAAA', '1111', '   ', 'ééé', '\t\t\t',
+    'Password123!', 'QWERTYuiop', 'Admin2024#', 'Motdepasseé1', 'İstanbul99', 'grOSS1234567',
+]
+
+
+def _random_passwords(count, seed=0):
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + '!#- éßÉ€密'
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 20))) for _ in range(count)]
+
+
+@pytest.mark.parametrize('password', PASSWORDS + _random_passwords(300))
+def test_scorer_matches_reference(password):
+    expected = _reference_strength(password)
+    assert analyze_password_strength(password) == expected
+    assert calculate_entropy(password) == expected['entropy']
+    score, strength, _, entropy, _ = score_password(password)
+    assert (score, STRENGTHS[strength], entropy) == (expected['score'], expected['strength'], expected['entropy'])
+
+
+def test_batch_matches_reference():
+    passwords = [password for password in PASSWORDS + _random_passwords(2000, 1) if password]
+    rows = []
+    stats = score_batch(passwords, rows=rows)
+    assert stats['total'] == len(passwords)
+    assert stats['strengths'] == [sum(_reference_strength(p)['strength'] == name for p in passwords) for name in STRENGTHS]
+    assert [row[0] for row in rows] == passwords
+    assert [row[1] for row in rows] == [_reference_strength(p)['score'] for p in passwords]
+
+
+def _stats(path, **options):
+    stats = analyze_wordlist(str(path), **options)
+    stats.pop('analysis_time')
+    return stats
+
+
+@pytest.fixture
+def wordlist(tmp_path):
+    passwords = _random_passwords(5000, 2)
+    path = tmp_path / 'mots.txt'
+    path.write_bytes('\n'.join(passwords).encode('utf-8') + b'\n')
+    return path
+
+
+@pytest.mark.parametrize('workers', [2, 3])
+def test_workers_give_identical_stats(wordlist, workers):
+    assert _stats(wordlist, workers=workers, batch_size=700) == _stats(wordlist, workers=1, batch_size=700)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_gzip_input_matches_plain(wordlist, tmp_path, workers):
+    compressed = tmp_path / 'mots.txt.gz'
+    compressed.write_bytes(gzip.compress(wordlist.read_bytes()))
+    assert _stats(compressed, workers=workers) == _stats(wordlist)
+
+
+def test_latin1_input_is_read(tmp_path):
+    passwords = ['café', 'Ñandú2024!', 'plain', 'Straße99']
+    path = tmp_path / 'latin1.txt'
+    path.write_bytes(b'\n'.join(password.encode('latin-1') for password in passwords) + b'\n')
+    stats = _stats(path, workers=2)
+    assert stats['total'] == len(passwords)
+    expected = [_reference_strength(password)['strength'] for password in passwords]
+    assert [stats['weak'], stats['medium'], stats['strong']] == [expected.count(name) for name in STRENGTHS]
+    assert stats['avg_length'] == sum(map(len, passwords)) / len(passwords)
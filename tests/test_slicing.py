@@ -0,0 +1,27 @@
+# Découpage de l'espace des candidats (--skip/--limit, --node) pour MatrixSec - By ScriptSeinsei
+
+import pytest
+
+from conftest import BASE_OPTIONS
+
+TEMPLATE_OPTIONS = {'template': '{word}?d', 'case_variants': True, 'min_char_length': 0}
+
+
+@pytest.mark.parametrize('options', [BASE_OPTIONS, dict(BASE_OPTIONS, min_char_length=7), TEMPLATE_OPTIONS])
+@pytest.mark.parametrize('count', [1, 3, 7])
+def test_nodes_concatenate_to_single_process_output(generate, options, count):
+    expected = generate(engine='str', **options)
+    parts = [generate(node=(index, count), **options) for index in range(1, count + 1)]
+    assert b''.join(parts) == expected
+
+
+def test_nodes_with_workers_match_serial_nodes(generate):
+    for index in range(1, 4):
+        assert generate(node=(index, 3), workers=2, **BASE_OPTIONS) == generate(node=(index, 3), engine='str', **BASE_OPTIONS)
+
+
+def test_skip_and_limit_cover_the_keyspace(generate):
+    expected = generate(engine='str', **BASE_OPTIONS)
+    parts = [generate(skip=0, limit=1000, **BASE_OPTIONS), generate(skip=1000, limit=2500, **BASE_OPTIONS),
+             generate(skip=3500, **BASE_OPTIONS)]
+    assert b''.join(parts) == expected
@@ -0,0 +1,89 @@
+# Sources de dates et de nombres, comparées à une énumération du calendrier, pour MatrixSec - By ScriptSeinsei
+
+import datetime
+
+import pytest
+
+from sources import DATE_FORMATS, DateSource, NumberSource, parse_number_range, parse_source, parse_year_range
+
+
+def _calendar(start_year, end_year, fmt):
+    """Toutes les dates de la plage, formatées sans astuce, dans l'ordre chronologique."""
+    day = datetime.date(start_year, 1, 1)
+    dates = []
+    while day.year <= end_year:
+        dates.append(fmt.replace('YYYY', f'{day.year:04d}').replace('YY', f'{day.year % 100:02d}')
+                     .replace('MM', f'{day.month:02d}').replace('DD', f'{day.day:02d}'))
+        day += datetime.timedelta(days=1)
+    return dates
+
+
+@pytest.mark.parametrize('fmt', DATE_FORMATS + ('YY', 'DD-MM', 'MM/YYYY', 'MMYY', 'DD', 'YYYYDD'))
+@pytest.mark.parametrize('years', [(1900, 1900), (2000, 2000), (1899, 1901), (1996, 2004), (2000, 2100), (1900, 2025)])
+def test_dates_match_calendar(fmt, years):
+    source = DateSource(*years, fmt)
+    dates = list(source)
+    expected = _calendar(*years, fmt)
+    assert len(source) == len(dates) == len(set(dates))
+    assert set(dates) == set(expected)
+    if 'YYYY' in fmt:
+        assert dates == list(dict.fromkeys(expected))
+
+
+@pytest.mark.parametrize('years, leap', [((1900, 1900), False), ((2000, 2000), True), ((2100, 2100), False),
+                                         ((1900, 1999), True), ((1901, 1903), False), ((2000, 2100), True)])
+def test_february_29_only_in_leap_years(years, leap):
+    assert any(date.startswith('2902') for date in DateSource(*years, 'DDMMYYYY')) == leap
+    assert any(date.startswith('2902') for date in DateSource(*years, 'DDMMYY')) == leap
+    assert ('2902' in set(DateSource(*years, 'DDMM'))) == leap
+
+
+def test_yy_keeps_leap_century():
+    # 1900 n'est pas bissextile, 2000 l'est : '290200' existe dès que 2000 est dans la plage
+    assert '290200' not in set(DateSource(1900, 1999, 'DDMMYY'))
+    assert '290200' in set(DateSource(1900, 2000, 'DDMMYY'))
+    assert '290200' in set(DateSource(2000, 2100, 'DDMMYY'))
+    assert '290200' not in set(DateSource(2100, 2100, 'DDMMYY'))
+
+
+@pytest.mark.parametrize('spec, expected', [
+    ('num:00-99', [f'{n:02d}' for n in range(100)]),
+    ('num:0-99', [str(n) for n in range(100)]),
+    ('num:007-012', ['007', '008', '009', '010', '011', '012']),
+    ('num:00-100', [f'{n:02d}' for n in range(101)]),
+    ('num:5-5', ['5']),
+])
+def test_number_ranges(spec, expected):
+    source = parse_source(spec)
+    assert isinstance(source, NumberSource)
+    assert list(source) == expected and len(source) == len(expected)
+
+
+def test_named_sources():
+    assert list(parse_source('year', 1998, 2001)) == ['1998', '1999', '2000', '2001']
+    assert len(parse_source('date', 2000, 2000)) == 366
+    assert list(parse_source('date:YYYY-MM', 2001, 2001))[:2] == ['2001-01', '2001-02']
+    assert parse_year_range('1990-2000') == (1990, 2000)
+
+
+@pytest.mark.parametrize('spec', ['num', 'num:', 'num:5', 'num:a-b', 'num:9-1', 'num:-1-5', 'num:1-2-3',
+                                  'date:XXXX', 'date:', 'jour', 'year:2000', ''])
+def test_malformed_specs(spec):
+    if spec in ('date:', 'year:2000'):
+        # Argument vide ou ignoré : source par défaut
+        parse_source(spec)
+        return
+    with pytest.raises(ValueError):
+        parse_source(spec)
+
+
+@pytest.mark.parametrize('years', ['2000', '2000-', 'a-b', '2000-1990', '1990-2000-2010'])
+def test_malformed_year_ranges(years):
+    with pytest.raises(ValueError):
+        parse_year_range(years)
+
+
+@pytest.mark.parametrize('years', [(2001, 2000), (0, 10), (9999, 10000)])
+def test_invalid_date_ranges(years):
+    with pytest.raises(ValueError):
+        DateSource(*years)
@@ -0,0 +1,70 @@
+# Top-K et histogrammes de l'analyseur, fusionnés par lots et par processus, pour MatrixSec - By ScriptSeinsei
+
+import collections
+import random
+import string
+
+import pytest
+
+from password_analyzer import (ENTROPY_BUCKET, _merge_stats, _new_partial_stats, analyze_password_strength, analyze_wordlist,
+                               character_classes, class_mix_label, finalize_stats, score_batch, score_password)
+
+
+def _passwords(count, seed=0):
+    rng = random.Random(seed)
+    # Peu de formes distinctes : beaucoup d'égalités de score et d'entropie
+    alphabet = string.ascii_lowercase[:4] + 'AB' + '12' + '!é'
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 14))) for _ in range(count)]
+
+
+def _naive(passwords, top_k):
+    """Statistiques recalculées sans tas ni fusion : Counter.most_common et tri stable."""
+    results = [analyze_password_strength(password) for password in passwords]
+    strong = [(password, result['score'], result['entropy']) for password, result in zip(passwords, results) if result['score'] >= 4]
+    return {
+        'top_passwords': sorted(strong, key=lambda entry: (entry[1], entry[2]), reverse=True)[:top_k],
+        'common_issues': collections.Counter(comment for result in results for comment in result['comments']).most_common(),
+        'length_histogram': sorted(collections.Counter(map(len, passwords)).items()),
+        'entropy_buckets': sorted(collections.Counter(int(result['entropy'] // ENTROPY_BUCKET) for result in results).items()),
+        'class_histogram': collections.Counter(class_mix_label(character_classes(password)) for password in passwords).most_common(),
+    }
+
+
+def _batched(passwords, batch_size, top_k):
+    stats = _new_partial_stats(top_k)
+    for i in range(0, len(passwords), batch_size):
+        _merge_stats(stats, score_batch(passwords[i:i + batch_size], top_k))
+    return finalize_stats(stats)
+
+
+def _check(stats, expected):
+    assert stats['top_passwords'] == expected['top_passwords']
+    assert stats['common_issues'] == expected['common_issues']
+    assert stats['length_histogram'] == expected['length_histogram']
+    assert [count for _, count in stats['entropy_histogram']] == [count for _, count in expected['entropy_buckets']]
+    assert stats['class_histogram'] == expected['class_histogram']
+
+
+@pytest.mark.parametrize('batch_size', [1, 7, 100, 10 ** 6])
+@pytest.mark.parametrize('top_k', [0, 1, 10, 50])
+def test_batches_match_naive_statistics(batch_size, top_k):
+    passwords = _passwords(3000)
+    _check(_batched(passwords, batch_size, top_k), _naive(passwords, top_k))
+
+
+def test_top_k_ties_keep_first_seen():
+    # Mêmes score et entropie : les premiers rencontrés gagnent, quel que soit le découpage
+    passwords = [f'Wx!9{a}{b}Kq7' for a in 'defgh' for b in 'mnoprstu']
+    assert len({score_password(password)[::3] for password in passwords}) == 1
+    expected = [(password, *score_password(password)[::3]) for password in passwords[:10]]
+    for batch_size in (1, 3, 40):
+        assert _batched(passwords, batch_size, 10)['top_passwords'] == expected
+
+
+@pytest.mark.parametrize('workers', [1, 2, 4])
+def test_workers_match_naive_statistics(tmp_path, workers):
+    passwords = _passwords(5000, 1)
+    path = tmp_path / 'mots.txt'
+    path.write_bytes('\n'.join(passwords).encode('utf-8') + b'\n')
+    stats = analyze_wordlist(str(path), workers=workers, batch_size=333, top_k=25)
+    _check(stats, _naive(passwords, 25))
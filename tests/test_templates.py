@@ -0,0 +1,94 @@
+# Gabarits et masques hashcat (--template), comparés à une expansion directe, pour MatrixSec - By ScriptSeinsei
+
+import itertools
+import string
+
+import pytest
+
+from conftest import WORDS
+from templates import MASK_CHARSETS, compile_template, parse_template
+
+# Jeux de caractères de hashcat (?s : les 33 caractères ASCII imprimables ni lettres ni chiffres, espace compris)
+HASHCAT_CHARSETS = {
+    'l': 'abcdefghijklmnopqrstuvwxyz',
+    'u': 'ABCDEFGHIJKLMNOPQRSTUVWXYZ',
+    'd': '0123456789',
+    's': ''.join(chr(c) for c in range(32, 127) if not chr(c).isalnum()),
+}
+HASHCAT_CHARSETS['a'] = HASHCAT_CHARSETS['l'] + HASHCAT_CHARSETS['u'] + HASHCAT_CHARSETS['d'] + HASHCAT_CHARSETS['s']
+
+
+def _lines(template):
+    return [''.join(line) for line in template.iter()]
+
+
+@pytest.mark.parametrize('mask', list(HASHCAT_CHARSETS))
+def test_mask_charsets_match_hashcat(mask):
+    assert MASK_CHARSETS[mask] == HASHCAT_CHARSETS[mask]
+    assert _lines(compile_template('?' + mask, {})) == list(HASHCAT_CHARSETS[mask])
+    assert len(HASHCAT_CHARSETS['s']) == 33 and len(HASHCAT_CHARSETS['a']) == 95
+
+
+def test_masks_in_order():
+    # Comme hashcat : la dernière position varie le plus vite
+    assert _lines(compile_template('?d?d', {})) == [f'{n:02d}' for n in range(100)]
+    assert _lines(compile_template('x?u?d!', {}))[:3] == ['xA0!', 'xA1!', 'xA2!']
+    assert compile_template('?l?u?d?s', {}).size == 26 * 26 * 10 * 33
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('??', ['?']),
+    ('a??b', ['a?b']),
+    ('????', ['??']),
+    ('?d??', [f'{n}?' for n in range(10)]),
+    ('??{special}', ['?!', '?#']),
+])
+def test_literal_question_mark(text, expected):
+    assert _lines(compile_template(text, {'special': ['!', '#']})) == expected
+
+
+@pytest.mark.parametrize('text', ['?', 'abc?', '?x', '?L', '?h', '?1', '{mot}', '{word', 'word}', '{', '', '{num}', '{date:XX}'])
+def test_invalid_placeholders(text):
+    with pytest.raises(ValueError):
+        compile_template(text, {'word': WORDS})
+
+
+def test_missing_source():
+    with pytest.raises(ValueError, match='aucun candidat'):
+        compile_template('{word}', {'word': []})
+
+
+def test_parse_template_tokens():
+    assert parse_template('{word}-{date:DDMM}?d??') == [('slot', 'word'), ('literal', '-'), ('slot', 'date:DDMM'),
+                                                      ('mask', 'd'), ('literal', '?')]
+
+
+@pytest.mark.parametrize('text', ['{word}?d', '?u{word}{special}', '{word}{num:00-03}?s', '{year}{word}', 'ab?d{word}??'])
+def test_template_matches_direct_expansion(text):
+    sources = {'word': WORDS[:5], 'special': ['!', '#']}
+    pools = []
+    for kind, value in parse_template(text):
+        if kind == 'mask':
+            pools.append(list(HASHCAT_CHARSETS[value]))
+        elif kind == 'literal':
+            pools.append([value])
+        elif value in sources:
+            pools.append(sources[value])
+        elif value == 'year':
+            pools.append([str(year) for year in range(2020, 2023)])
+        else:
+            pools.append([f'{n:02d}' for n in range(4)])
+    expected = [''.join(line) for line in itertools.product(*pools)]
+    template = compile_template(text, sources, 2020, 2022)
+    assert _lines(template) == expected and template.size == len(expected)
+    # Accès direct par rang (--workers, --skip, --node)
+    for start, stop in [(0, 1), (3, 17), (len(expected) - 2, None)]:
+        assert [''.join(line) for line in template.iter(start, stop)] == expected[start:stop]
+    _, lines, size = template.estimate(((0, 0), (2, 2)), min_chars=7)
+    assert lines == sum(len(line) + growth >= 7 for line in expected for growth in (0, 2))
+    assert size == sum(len(line.encode('utf-8')) + growth + 1 for line in expected for growth in (0, 2) if len(line) + growth >= 7)
+
+
+def test_template_generation(generate):
+    output = generate(template='{word}?d', min_char_length=0)
+    assert output.decode('utf-8').splitlines() == [word + digit for word in WORDS for digit in string.digits]
@@ -3,11 +3,27 @@
 
 import itertools
 import argparse
+import contextlib
+import hashlib
+import io
+import json
 import os
+import shutil
+import sys
+import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
 from pathlib import Path
 import re
+from compression import CODECS, CompressedWriter, check_codec, codec_from_path
+from combinatorics import count_combinations, estimate_output, iter_combinations, iter_combinations_pruned, line_length_counts, split_ranks
+from dedupe import BloomDedupWriter, ExternalSortDedupWriter
+from metrics import BATCH_MASK, BatchClock, Metrics, MetricsReporter, TimedWriter
+from probability import BEAM_WIDTH, PROBE_WORD, iter_by_probability, learn_model
+from rules import compile_block, compile_rules, default_rules, load_rules, rule_growth, rules_are_ascii, write_rule_file
+from sources import DATE_FORMATS, DateSource, parse_source, parse_year_range
+from templates import Template, compile_template
 
 def print_banner():
     banner = """
@@ -30,7 +46,8 @@ def collect_additional_inputs(args):
     Demande à l'utilisateur s'il veut ajouter des caractères spéciaux, des dates, ou d'autres mots.
     À la fin, demande si l'utilisateur veut utiliser --no-interactive.
     :param args: Arguments de la ligne de commande pour construire la commande --no-interactive.
-    :return: Tuple (special_chars, dates, extra_words)
+    :return: Tuple (special_chars, dates, extra_words), dates étant une liste de
+             sources (voir sources.DateSource) et non de chaînes.
     """
     special_chars = []
     dates = []
@@ -45,7 +62,9 @@ def collect_additional_inputs(args):
         custom_special = input("Ajoutez vos propres caractères ou appuyez sur Entrée pour utiliser ceux par défaut : ").strip()
         special_chars = list(custom_special or default_special)
 
-    # Dates
+    # Dates : des sources de dates, ajoutées en suffixe (ou aux emplacements
+    # {year}/{date} d'un gabarit) plutôt que combinées comme des mots
+    date_specs = []
     print("\nVoulez-vous ajouter des dates (ex. années comme 2023, ou formats comme 01/01/2000) ?")
     add_dates = input("Tapez 'oui' ou 'non' [non] : ").lower().strip() or 'non'
     if add_dates == 'oui':
@@ -55,20 +74,22 @@ def collect_additional_inputs(args):
         try:
             start_year = int(start_year)
             end_year = int(end_year)
-            if start_year <= end_year:
-                dates.extend(str(year) for year in range(start_year, end_year + 1))
-            else:
-                print("Erreur : l'année de début doit être inférieure ou égale à l'année de fin.")
-        except ValueError:
-            print("Erreur : veuillez entrer des années valides.")
-
-        print("Générer des dates au format DD/MM/YYYY (ex. 01/01/2000) ?")
-        add_full_dates = input("Tapez 'oui' ou 'non' [non] : ").lower().strip() or 'non'
-        if add_full_dates == 'oui':
-            for year in range(max(1900, start_year), min(end_year + 1, 2026)):
-                for month in range(1, 13):
-                    for day in range(1, 29):  # Limité à 28 pour simplifier
-                        dates.append(f"{day:02d}/{month:02d}/{year}")
+            dates.append(DateSource(start_year, end_year, 'YYYY'))
+            date_specs.append('year')
+        except ValueError as e:
+            print(f"Erreur : veuillez entrer des années valides ({e}).")
+
+        if date_specs:
+            print("Générer des dates complètes (ex. 01/01/2000) ?")
+            add_full_dates = input("Tapez 'oui' ou 'non' [non] : ").lower().strip() or 'non'
+            if add_full_dates == 'oui':
+                print(f"Formats : {', '.join(DATE_FORMATS)} (ou tout motif avec DD, MM, YY, YYYY)")
+                date_format = input("Format [DD/MM/YYYY] : ").strip() or 'DD/MM/YYYY'
+                try:
+                    dates.append(DateSource(start_year, end_year, date_format))
+                    date_specs.append(f"date:{date_format}")
+                except ValueError as e:
+                    print(f"Erreur : format de date invalide ({e}).")
 
     # Autres mots
     print("\nVoulez-vous ajouter d'autres mots (ex. noms, numéros, 'admin', 'password') ?")
@@ -86,7 +107,8 @@ def collect_additional_inputs(args):
     print("\nVoulez-vous générer la wordlist sans questions interactives la prochaine fois ?")
     use_no_interactive = input("Tapez 'oui' ou 'non' [non] : ").lower().strip() or 'non'
     if use_no_interactive == 'oui':
-        command = f"python ultimate_wordlist_gen.py --input {args.input} --output {args.output} --no-interactive"
+        output_option = f"--fifo {args.fifo}" if args.fifo else f"--output {args.output}"
+        command = f"python ultimate_wordlist_gen.py --input {args.input} {output_option} --no-interactive"
         if args.max_combinations != 1000000:
             command += f" --max-combinations {args.max_combinations}"
         if args.min_length != 1:
@@ -97,64 +119,1170 @@ def collect_additional_inputs(args):
             command += f" --separator \"{args.separator}\""
         if args.case_variants:
             command += " --case-variants"
+        if args.rules:
+            command += f" --rules {args.rules}"
+        if args.engine != 'bytes':
+            command += f" --engine {args.engine}"
+        if args.workers != 1:
+            command += f" --workers {args.workers}"
+        if args.keep_shards:
+            command += " --keep-shards"
+        if args.resume:
+            command += " --resume"
+        if args.node:
+            command += f" --node {args.node}"
+        if args.dedupe:
+            command += f" --dedupe {args.dedupe}"
+        if args.config:
+            command += f" --config {args.config}"
+        if args.formats != ['plain']:
+            command += f" --formats {' '.join(args.formats)}"
+        if args.template:
+            command += f" --template \"{args.template}\""
+        if dates:
+            command += f" --years {dates[0].start_year}-{dates[0].end_year}"
+            command += ''.join(f" --suffix {spec}" for spec in date_specs)
+        elif args.years != '1900-2025':
+            command += f" --years {args.years}"
+        for spec in args.suffix or []:
+            command += f" --suffix {spec}"
         print(f"\nUtilisez cette commande pour éviter les questions :")
         print(f"{command}")
 
     return special_chars, dates, extra_words
 
-def generate_wordlist(words, output_file, max_combinations=1000000, min_length=1, max_length=None, separator='', case_variants=False, special_chars=None, append_special=False):
+def _sample_stages(steps, value):
+    """
+    Chronomètre les étapes d'un élément témoin (un par lot) : chaque étape reçoit
+    le résultat de la précédente.
+    :param steps: Tuple de (étape, fonction).
+    :return: Dict {étape: secondes pour cet élément}
+    """
+    timings = {}
+    for stage, step in steps:
+        start = time.perf_counter()
+        value = step(value)
+        timings[stage] = time.perf_counter() - start
+    return timings
+
+def _write_combinations(f_out, combos, settings, total_generated, max_combinations, pbar=None, checkpoint=None, variant_slice=None, metrics=None):
+    """
+    Écrit les variantes des combinaisons dans f_out (binaire), avec le moteur
+    choisi dans settings['engine'] ('bytes' ou 'str').
+    :param combos: Tuples (rang depuis le début de la plage, combinaison), voir _iter_source.
+    :param variant_slice: Tuple (début, fin) pour ne garder qu'une partie des variantes de chaque combinaison.
+    :param checkpoint: Fonction appelée tous les 1024 rangs, tampon vidé,
+                       avec (combinaisons_traitées, total_generated).
+    :param pbar: Barre de progression, avancée par lots de 1024 combinaisons.
+    :param metrics: Metrics facultatif, mis à jour par lots (voir metrics.BatchClock).
+    :return: Tuple (total_generated, limite_atteinte)
+    """
+    if settings.get('suffixes'):
+        return _write_suffixed(f_out, combos, settings, total_generated, max_combinations, pbar, checkpoint, variant_slice, metrics)
+    if settings['engine'] == 'bytes':
+        return _write_combinations_bytes(f_out, combos, settings, total_generated, max_combinations, pbar, checkpoint, variant_slice, metrics)
+    separator = settings['separator']
+    min_char_length = settings['min_char_length']
+    max_char_length = settings.get('max_char_length', sys.maxsize)
+    transform = compile_rules(tuple(settings['rules']))
+    buffer = []
+    buffer_size = 1000
+    limit_reached = False
+    clock = BatchClock(metrics, total_generated) if metrics is not None else None
+    steps = (('mutate', lambda combination: transform(combination)[slice(*variant_slice or (None,))]),
+             ('filter', lambda variations: [var + '\n' for var in variations if min_char_length <= len(var) <= max_char_length]))
+    reported = 0
+    consumed = -1
+    boundary = 0
+
+    for consumed, combo in combos:
+        if total_generated >= max_combinations:
+            limit_reached = True
+            break
+        if consumed >= boundary:
+            boundary = (consumed | BATCH_MASK) + 1
+            if checkpoint is not None and consumed:
+                if buffer:
+                    f_out.write(''.join(buffer).encode('utf-8'))
+                    buffer.clear()
+                checkpoint(consumed, total_generated)
+            if pbar is not None:
+                pbar.update(consumed - reported)
+            if clock is not None:
+                clock.batch(consumed - reported, total_generated, _sample_stages(steps, separator.join(combo)))
+            reported = consumed
+        # Concaténer les éléments en un seul mot
+        combination = separator.join(combo) if separator else ''.join(combo)
+
+        variations = transform(combination)
+        if variant_slice is not None:
+            variations = variations[variant_slice[0]:variant_slice[1]]
+
+        # Filtrer les combinaisons hors de [min_char_length, max_char_length] caractères
+        for var in variations:
+            if min_char_length <= len(var) <= max_char_length:
+                buffer.append(var + '\n')
+                total_generated += 1
+                if len(buffer) >= buffer_size:
+                    f_out.write(''.join(buffer).encode('utf-8'))
+                    buffer.clear()
+
+    if buffer:
+        f_out.write(''.join(buffer).encode('utf-8'))
+    _finish_batches(consumed if limit_reached else consumed + 1, reported, total_generated, pbar, clock)
+    return total_generated, limit_reached
+
+# Étapes chronométrées de la génération (voir metrics.BatchClock)
+GENERATE_STAGES = ('combine', 'mutate', 'filter', 'write')
+
+def _finish_batches(processed, reported, total_generated, pbar, clock):
+    """Reporte dans la progression et les métriques le dernier lot, incomplet."""
+    if pbar is not None and processed > reported:
+        pbar.update(processed - reported)
+    if clock is not None:
+        clock.batch(processed - reported, total_generated)
+
+OUTPUT_CHUNK_SIZE = 4 * 1024 * 1024
+
+def _write_combinations_bytes(f_out, combos, settings, total_generated, max_combinations, pbar=None, checkpoint=None, variant_slice=None, metrics=None):
+    """
+    Variante de _write_combinations sur des mots déjà encodés (voir _candidate_pool).
+    Quand les règles ajoutent une longueur fixe, les variantes retenues ne dépendent
+    que de la longueur de la combinaison : une fonction compilée par longueur
+    produit directement le bloc d'octets (variantes et retours à la ligne).
+    Les blocs s'accumulent dans un bytearray écrit par morceaux de plusieurs Mo.
+    """
+    separator = settings['separator'].encode('utf-8')
+    min_char_length = settings['min_char_length']
+    max_char_length = settings.get('max_char_length', sys.maxsize)
+    rules = tuple(settings['rules'])
+    growths = _variant_growths(settings)
+    selected = range(len(rules))[slice(*variant_slice)] if variant_slice is not None else range(len(rules))
+    transform = compile_rules(rules, 'utf-8') if growths is None else None
+    blocks = {}
+    chunk = bytearray()
+    limit_reached = False
+    clock = BatchClock(metrics, total_generated) if metrics is not None else None
+    def block_for(length):
+        # Variantes retenues pour cette longueur, compilées en une seule fonction
+        keep = tuple(index in selected and min_char_length <= length + growth <= max_char_length
+                     for index, (growth, _) in enumerate(growths))
+        block = blocks[length] = (compile_block(rules, keep, 'utf-8'), sum(keep))
+        return block
+
+    if transform is None:
+        # Règles et filtre réunis dans une seule fonction par longueur : le filtre ne coûte rien à l'exécution
+        steps = (('mutate', lambda combination: blocks[len(combination)][0](combination)),)
+    else:
+        steps = (('mutate', lambda combination: transform(combination)[slice(*variant_slice or (None,))]),
+                 ('filter', lambda variations: [var for var in variations if min_char_length <= len(var) <= max_char_length]))
+    reported = 0
+    consumed = -1
+    boundary = 0
+
+    for consumed, combo in combos:
+        if total_generated >= max_combinations:
+            limit_reached = True
+            break
+        if consumed >= boundary:
+            boundary = (consumed | BATCH_MASK) + 1
+            if checkpoint is not None and consumed:
+                f_out.write(chunk)
+                chunk.clear()
+                checkpoint(consumed, total_generated)
+            if pbar is not None:
+                pbar.update(consumed - reported)
+            if clock is not None:
+                combination = separator.join(combo)
+                if transform is None and len(combination) not in blocks:
+                    block_for(len(combination))  # Compiler hors de la mesure
+                clock.batch(consumed - reported, total_generated, _sample_stages(steps, combination))
+            reported = consumed
+        combination = separator.join(combo)
+
+        if transform is None:
+            length = len(combination)
+            block = blocks.get(length) or block_for(length)
+            chunk += block[0](combination)
+            total_generated += block[1]
+        else:
+            variations = transform(combination)
+            if variant_slice is not None:
+                variations = variations[variant_slice[0]:variant_slice[1]]
+            kept = [var for var in variations if min_char_length <= len(var) <= max_char_length]
+            if kept:
+                chunk += b'\n'.join(kept)
+                chunk += b'\n'
+                total_generated += len(kept)
+        if len(chunk) >= OUTPUT_CHUNK_SIZE:
+            f_out.write(chunk)
+            chunk.clear()
+
+    if chunk:
+        f_out.write(chunk)
+    _finish_batches(consumed if limit_reached else consumed + 1, reported, total_generated, pbar, clock)
+    return total_generated, limit_reached
+
+def _write_suffixed(f_out, combos, settings, total_generated, max_combinations, pbar=None, checkpoint=None, variant_slice=None, metrics=None):
+    """
+    Variante de _write_combinations avec un étage de suffixes (settings['suffixes'] :
+    dates, nombres...) : chaque variante est écrite seule, puis suivie de chaque
+    suffixe. Les suffixes ne sont pas combinés avec les mots : l'espace ne croît
+    que linéairement avec leur nombre. Pour une variante v, v + v.join(suffixes)
+    produit toutes ses lignes en une seule opération.
+    """
+    as_bytes = settings['engine'] == 'bytes'
+    encode = (lambda text: text.encode('utf-8')) if as_bytes else (lambda text: text)
+    newline = encode('\n')
+    empty = newline[:0]
+    separator = encode(settings['separator'])
+    min_char_length = settings['min_char_length']
+    max_char_length = settings.get('max_char_length', sys.maxsize)
+    transform = compile_rules(tuple(settings['rules']), 'utf-8' if as_bytes else None)
+    suffixes = [encode(suffix) for suffix in settings['suffixes']]
+    every_suffix = [suffix + newline for suffix in suffixes]
+    longest = max(len(suffix) for suffix in suffixes)
+    # Pour une variante trop courte ou trop longue, par longueur : (variante seule gardée, suffixes gardés)
+    partial = {}
+    parts = []
+    pending = 0
+    limit_reached = False
+
+    clock = BatchClock(metrics, total_generated) if metrics is not None else None
+    # Témoin : règles puis suffixes (les autres variantes sont filtrées par longueur, via partial)
+    steps = (('mutate', lambda combination: [var + var.join(every_suffix) for var in transform(combination)]),)
+    reported = 0
+    consumed = -1
+    boundary = 0
+
+    def flush():
+        data = empty.join(parts)
+        f_out.write(data if as_bytes else data.encode('utf-8'))
+        parts.clear()
+
+    for consumed, combo in combos:
+        if total_generated >= max_combinations:
+            limit_reached = True
+            break
+        if consumed >= boundary:
+            boundary = (consumed | BATCH_MASK) + 1
+            if checkpoint is not None and consumed:
+                flush()
+                pending = 0
+                checkpoint(consumed, total_generated)
+            if pbar is not None:
+                pbar.update(consumed - reported)
+            if clock is not None:
+                clock.batch(consumed - reported, total_generated, _sample_stages(steps, separator.join(combo)))
+            reported = consumed
+        combination = separator.join(combo)
+        variations = transform(combination)
+
+        if variant_slice is not None:
+            # Tranche au milieu d'une combinaison : énumérer ses lignes dans l'ordre
+            lines = [line for var in variations for line in (var, *(var + suffix for suffix in suffixes))]
+            kept = [line for line in lines[variant_slice[0]:variant_slice[1]] if min_char_length <= len(line) <= max_char_length]
+            if kept:
+                parts.append(newline.join(kept) + newline)
+                pending += len(parts[-1])
+                total_generated += len(kept)
+        else:
+            for var in variations:
+                length = len(var)
+                if min_char_length <= length and length + longest <= max_char_length:
+                    parts.append(var + newline + var + var.join(every_suffix))
+                    total_generated += 1 + len(every_suffix)
+                else:
+                    keep_var, kept = partial.get(length) or partial.setdefault(length, (
+                        min_char_length <= length <= max_char_length,
+                        [suffix + newline for suffix in suffixes if min_char_length <= length + len(suffix) <= max_char_length]))
+                    if kept:
+                        parts.append(var + newline + var + var.join(kept) if keep_var else var + var.join(kept))
+                    elif keep_var:
+                        parts.append(var + newline)
+                    else:
+                        continue
+                    total_generated += keep_var + len(kept)
+                pending += len(parts[-1])
+        if pending >= OUTPUT_CHUNK_SIZE:
+            flush()
+            pending = 0
+
+    if parts:
+        flush()
+    _finish_batches(consumed if limit_reached else consumed + 1, reported, total_generated, pbar, clock)
+    return total_generated, limit_reached
+
+def _write_by_probability(f_out, words, settings, model, min_length, max_length, max_combinations, beam_width=BEAM_WIDTH, pbar=None):
+    """
+    Écrit les candidats du plus probable au moins probable selon model (voir
+    probability.ProbabilityModel) : combinaison de mots, règle et suffixe sont
+    choisis d'après leurs fréquences dans la fuite de référence, par une file
+    de priorité bornée à beam_width états (voir probability.iter_by_probability).
+    Les candidats sont pris parmi ceux du mode habituel, dans un autre ordre ;
+    si la file déborde, les états abandonnés et leurs successeurs ne sont pas
+    écrits : l'ensemble n'est complet que si aucun état n'a été abandonné.
+    :param pbar: Barre de progression en lignes, avancée par lots de 1024 lignes.
+    :return: Tuple (nombre de lignes écrites, nombre d'états abandonnés par la file).
+    """
+    separator = settings['separator']
+    min_char_length = settings['min_char_length']
+    max_char_length = settings.get('max_char_length', sys.maxsize)
+    rules = settings['rules']
+    # Mots et règles triés par probabilité décroissante (ordre d'origine à égalité)
+    word_logps = [model.word_logp(word) for word in words]
+    order = sorted(range(len(words)), key=lambda index: -word_logps[index])
+    rule_logps = [model.variant_logp(variant) for variant in compile_rules(tuple(rules))(PROBE_WORD)]
+    rule_order = sorted(range(len(rules)), key=lambda index: -rule_logps[index])
+    transforms = [compile_rules((rules[index],)) for index in rule_order]
+    suffixes = sorted([None] + list(settings.get('suffixes') or ()), key=lambda suffix: -model.suffix_logp(suffix))
+    length_logps = {k: model.length_logp(k, min_length, max_length) for k in range(min_length, max_length + 1)}
+    dimensions = [[rule_logps[index] for index in rule_order], [model.suffix_logp(suffix) for suffix in suffixes]]
+
+    buffer = []
+    total_generated = 0
+    reported = 0
+    stats = {'dropped': 0}
+    for _, indices, (rule, suffix) in iter_by_probability([word_logps[index] for index in order], length_logps,
+                                                           dimensions, beam_width, stats):
+        # Les mots de la combinaison restent dans l'ordre du fichier, comme en mode habituel
+        combination = separator.join([words[index] for index in sorted(order[i] for i in indices)])
+        line = transforms[rule](combination)[0]
+        if suffixes[suffix] is not None:
+            line += suffixes[suffix]
+        if not min_char_length <= len(line) <= max_char_length:
+            continue
+        buffer.append(line + '\n')
+        total_generated += 1
+        if not total_generated & BATCH_MASK:
+            f_out.write(''.join(buffer).encode('utf-8'))
+            buffer.clear()
+            if pbar is not None:
+                pbar.update(total_generated - reported)
+                reported = total_generated
+        if total_generated >= max_combinations:
+            break
+    if buffer:
+        f_out.write(''.join(buffer).encode('utf-8'))
+    if pbar is not None:
+        pbar.update(total_generated - reported)
+    return total_generated, stats['dropped']
+
+def _candidate_pool(words, settings):
+    """
+    Mots (ou gabarit compilé) tels que les attend le moteur : encodés une seule fois en mode bytes.
+    """
+    if settings['engine'] == 'bytes':
+        if isinstance(words, Template):
+            return words.encoded('utf-8')
+        return [word.encode('utf-8') for word in words]
+    return words
+
+def _iter_source(source, length, settings, start=0, stop=None):
+    """
+    Combinaisons de `length` mots de rang start à stop, ou lignes d'un gabarit
+    compilé, numérotées depuis start : tuples (rang - start, combinaison).
+    Si les bornes de longueur des lignes écartent des combinaisons entières, elles
+    sont élaguées avant d'être assemblées (voir _length_bounds) ; les rangs des
+    autres ne changent pas.
+    """
+    if isinstance(source, Template):
+        return enumerate(source.iter(start, stop))
+    lengths = [len(word) for word in source]
+    bounds = _length_bounds(settings, length, lengths)
+    if bounds is None:
+        return enumerate(iter_combinations(source, length, start, stop))
+    return iter_combinations_pruned(source, length, lengths, *bounds, start, stop)
+
+def _length_bounds(settings, length, lengths):
+    """
+    Bornes de la somme des longueurs des mots d'une combinaison de `length` mots,
+    hors desquelles aucune de ses variantes ne passe le filtre de longueur.
+    :param lengths: Longueur en caractères de chaque mot.
+    :return: Tuple (minimum, maximum ou None), ou None si aucune combinaison n'est écartée
+             (ou si une règle produit une longueur variable).
+    """
+    growths = _variant_growths(settings)
+    if growths is None or length > len(lengths):
+        return None
+    separators = len(settings['separator']) * max(0, length - 1)
+    low = settings['min_char_length'] - max(growth for growth, _ in growths) - separators
+    high = settings.get('max_char_length')
+    if high is not None:
+        high -= min(growth for growth, _ in growths) + separators
+    ordered = sorted(lengths)
+    if low <= sum(ordered[:length]) and (high is None or sum(ordered[len(ordered) - length:]) <= high):
+        return None
+    return low, high
+
+def ascii_input(words, separator, rules):
+    """
+    Indique si les mots, le séparateur et les constantes des règles sont tous ASCII :
+    la casse et les positions ne dépendent alors pas de l'encodage.
+    """
+    return all(word.isascii() for word in words) and separator.isascii() and rules_are_ascii(rules)
+
+def select_engine(engine, ascii):
     """
-    Génère une wordlist en concaténant les mots, dates, et caractères spéciaux en un seul mot, avec un minimum de 6 caractères.
+    Le moteur bytes n'est exact que si tout est ASCII (casse et positions en octets) :
+    sinon, revenir au moteur str.
+    """
+    if engine == 'bytes' and not ascii:
+        print("Mots ou règles non ASCII : utilisation du moteur str.")
+        return 'str'
+    return engine
+
+def _variant_count(settings):
+    """
+    Nombre de lignes produites par combinaison avant filtrage : une par règle,
+    multipliée par l'étage de suffixes (la variante seule, puis chaque suffixe).
+    """
+    return len(settings['rules']) * (1 + len(settings.get('suffixes') or ()))
+
+def _variant_growths(settings):
+    """
+    Nombre de caractères et d'octets ajoutés par chaque variante, dans l'ordre
+    des variantes (règles, puis suffixes de chaque règle).
+    :return: Liste de tuples, ou None si une règle produit une longueur variable.
+    """
+    growths = [rule_growth(rule, ascii=settings.get('ascii', False)) for rule in settings['rules']]
+    if None in growths:
+        return None
+    suffixes = settings.get('suffixes')
+    if suffixes:
+        extra = [(0, 0)] + [(len(suffix), len(suffix.encode('utf-8'))) for suffix in suffixes]
+        growths = [(chars + suffix_chars, size + suffix_size)
+                   for chars, size in growths for suffix_chars, suffix_size in extra]
+    return growths
+
+def _levels(word_count, min_length, max_length, template=None):
+    """
+    Nombre de combinaisons de chaque longueur : tuples (longueur, combinaisons).
+    Un gabarit compilé forme un seul niveau, de longueur son nombre de pools.
+    """
+    if template is not None:
+        return [(len(template.pools), template.size)]
+    return [(i, count_combinations(word_count, i)) for i in range(min_length, max_length + 1)]
+
+def keyspace_size(word_count, settings, min_length, max_length, template=None):
+    """
+    Taille de l'espace des candidats (combinaisons x variantes, avant filtrage par longueur).
+    """
+    variant_count = _variant_count(settings)
+    return sum(combos * variant_count for _, combos in _levels(word_count, min_length, max_length, template))
+
+def keyspace_segments(word_count, settings, min_length, max_length, skip=0, limit=None, template=None):
+    """
+    Traduit la tranche [skip, skip + limit) de l'espace des candidats en segments
+    de combinaisons, sans rien énumérer (comme -s/-l de hashcat). Les candidats
+    sont ordonnés par longueur, rang de combinaison puis variante.
+    :return: Liste de tuples (longueur, rang_début, rang_fin, variant_slice)
+    """
+    variant_count = _variant_count(settings)
+    end = skip + limit if limit is not None else float('inf')
+    segments = []
+    offset = 0
+    for i, combos in _levels(word_count, min_length, max_length, template):
+        size = combos * variant_count
+        low, high = max(skip, offset) - offset, min(end, offset + size) - offset
+        offset += size
+        if low >= high:
+            continue
+        first, first_variant = divmod(low, variant_count)
+        last, last_variant = divmod(high, variant_count)
+        if first == last:
+            segments.append((i, first, first + 1, (first_variant, last_variant)))
+            continue
+        if first_variant:
+            segments.append((i, first, first + 1, (first_variant, variant_count)))
+            first += 1
+        if first < last:
+            segments.append((i, first, last, None))
+        if last_variant:
+            segments.append((i, last, last + 1, (0, last_variant)))
+    return segments
+
+def parse_node(node):
+    """
+    Convertit 'K/N' (nœud K sur N, à partir de 1) en tuple (K, N).
+    """
+    try:
+        index, count = (int(part) for part in node.split('/'))
+    except ValueError:
+        raise ValueError(f"--node attend la forme K/N, pas {node!r}")
+    if not 1 <= index <= count:
+        raise ValueError(f"--node {node} : K doit être compris entre 1 et N")
+    return index, count
+
+# Nombre de longueurs de ligne détaillées dans l'estimation, à partir de la longueur minimale
+LENGTH_BANDS = 16
+
+def plan_wordlist(words, settings, min_length, max_length, max_combinations, template=None):
+    """
+    Calcule, sans rien générer, le nombre de combinaisons, de lignes et d'octets
+    de chaque longueur, en s'arrêtant à la longueur où tombe max_combinations,
+    ou à partir de laquelle toutes les lignes dépassent la longueur maximale.
+    Si une règle produit une longueur variable, les lignes sont un maximum
+    (avant filtrage), la taille est inconnue et aucune longueur n'est écartée.
+    Un gabarit compilé donne une seule étape (clé 'template' renseignée).
+    Les étapes exactes détaillent aussi leurs lignes par longueur (clé 'bands' :
+    liste de tuples (caractères, lignes), les LENGTH_BANDS premières longueurs).
+    :return: Liste de dicts {length, combinations, lines, bytes, exact}
+    """
+    growths = _variant_growths(settings)
+    min_chars, max_chars = settings['min_char_length'], settings.get('max_char_length')
+    top = min_chars + LENGTH_BANDS - 1 if max_chars is None else min(max_chars, min_chars + LENGTH_BANDS - 1)
+
+    def bands(counts):
+        return [(length, counts[length]) for length in range(min_chars, top + 1) if counts[length]]
+
+    if template is not None:
+        length = len(template.pools)
+        if growths is None:
+            return [{'length': length, 'combinations': template.size, 'lines': template.size * _variant_count(settings),
+                     'bytes': None, 'exact': False, 'template': template.text}]
+        combos, lines, size = template.estimate(growths, min_chars, max_chars=max_chars)
+        return [{'length': length, 'combinations': combos, 'lines': lines, 'bytes': size, 'exact': True,
+                 'template': template.text, 'bands': bands(template.line_length_counts(growths, top + 1))}]
+    ordered = sorted(len(word) for word in words)
+    plan = []
+    planned_lines = 0
+    for i in range(min_length, max_length + 1):
+        if planned_lines >= max_combinations:
+            break
+        if growths is None:
+            combos = count_combinations(len(words), i)
+            plan.append({'length': i, 'combinations': combos, 'lines': combos * _variant_count(settings), 'bytes': None, 'exact': False})
+            continue
+        if max_chars is not None and sum(ordered[:i]) + len(settings['separator']) * (i - 1) + min(growth for growth, _ in growths) > max_chars:
+            break  # Même les mots les plus courts donnent des lignes trop longues, ici comme au-delà
+        combos, lines, size = estimate_output(words, i, settings['separator'], growths, min_chars, max_chars=max_chars)
+        plan.append({'length': i, 'combinations': combos, 'lines': lines, 'bytes': size, 'exact': True,
+                     'bands': bands(line_length_counts(words, i, settings['separator'], growths, top + 1))})
+        planned_lines += lines
+    return plan
+
+def _measure_rate(words, settings, length, sample=20000):
+    """
+    Mesure le débit (lignes/s) sur un échantillon de combinaisons écrit en mémoire.
+    """
+    sink = io.BytesIO()
+    pool = _candidate_pool(words, settings)
+    start = time.perf_counter()
+    lines, _ = _write_combinations(sink, _iter_source(pool, length, settings, 0, sample), settings, 0, float('inf'))
+    elapsed = time.perf_counter() - start
+    return lines / elapsed if elapsed > 0 and lines else 0
+
+def print_length_bands(plan, cut=False):
+    """
+    Affiche la répartition par longueur (en caractères) des lignes prévues par le plan.
+    :param cut: Le plan dépasse --max-combinations : la répartition est celle d'avant la coupure.
+    """
+    if not plan or not all(step['exact'] for step in plan):
+        return
+    bands = {}
+    for step in plan:
+        for length, lines in step['bands']:
+            bands[length] = bands.get(length, 0) + lines
+    total = sum(step['lines'] for step in plan)
+    if not total:
+        return
+    print(f"Lignes par longueur{' (avant --max-combinations)' if cut else ''} :")
+    for length in sorted(bands):
+        print(f"  • {length} caractères : {bands[length]} lignes ({bands[length] / total:.1%})")
+    others = total - sum(bands.values())
+    if others:
+        print(f"  • plus longues : {others} lignes ({others / total:.1%})")
+
+def print_plan(plan, max_combinations, rate, workers):
+    """Affiche l'estimation de taille et de durée (--dry-run)."""
+    print("\n" + "="*80)
+    print("ESTIMATION (aucun fichier généré) :")
+    print("-"*80)
+    total_lines = 0
+    total_bytes = 0
+    exact = all(step['exact'] for step in plan)
+    for step in plan:
+        lines, size = step['lines'], step['bytes']
+        if total_lines + lines > max_combinations:
+            # Coupure par --max-combinations : estimation au prorata
+            if size is not None:
+                size = size * (max_combinations - total_lines) // lines
+            lines = max_combinations - total_lines
+        total_lines += lines
+        label = f"Gabarit {step['template']}" if step.get('template') else f"{step['length']} éléments"
+        if step['exact']:
+            total_bytes += size
+            print(f"  • {label} : {step['combinations']} combinaisons, {lines} lignes, {size / (1024 * 1024):.2f} Mo")
+        else:
+            print(f"  • {label} : {step['combinations']} combinaisons, au plus {lines} lignes")
+    print("-"*80)
+    if exact:
+        print(f"Total : {total_lines} lignes, {total_bytes / (1024 * 1024):.2f} Mo")
+    else:
+        print(f"Total : au plus {total_lines} lignes (règles de longueur variable, taille inconnue)")
+    print_length_bands(plan, sum(step['lines'] for step in plan) > total_lines)
+    if rate:
+        print(f"Temps estimé : {total_lines / (rate * workers):.2f} secondes ({rate:.0f} lignes/s par processus)")
+    print("="*80)
+
+def _fingerprint(words, settings, segments, max_combinations, workers, keep_shards, codec=None):
+    """
+    Empreinte des paramètres de génération : une reprise n'est valable que si elle est identique.
+    :param codec: Compression de la sortie : un fichier compressé ne se reprend pas en clair, ni l'inverse.
+    """
+    params = [words, settings, segments, max_combinations, workers, keep_shards]
+    if codec is not None:
+        # Sans compression, l'empreinte reste celle des points de reprise existants
+        params.append(codec)
+    data = json.dumps(params, sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+def _load_checkpoint(checkpoint_file, fingerprint):
+    """
+    Charge le point de reprise s'il existe et correspond aux paramètres actuels.
+    :return: Dict du point de reprise, None s'il n'y en a pas.
+    """
+    if not os.path.isfile(checkpoint_file):
+        return None
+    with open(checkpoint_file, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('fingerprint') != fingerprint:
+        raise ValueError(f"le point de reprise {checkpoint_file} ne correspond pas aux paramètres actuels")
+    return state
+
+def _save_checkpoint(checkpoint_file, state, f_out=None):
+    """
+    Enregistre le point de reprise de façon atomique, après avoir synchronisé la sortie sur disque.
+    """
+    if f_out is not None:
+        f_out.flush()
+        os.fsync(f_out.fileno())
+        state['offset'] = f_out.tell()
+    tmp_file = checkpoint_file + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, checkpoint_file)
+
+OUTPUT_BUFFER_SIZE = 8 * 1024 * 1024
+
+def is_stream(output_file):
+    """
+    Indique si la sortie est un flux (stdout ou tube nommé) plutôt qu'un fichier ordinaire.
+    """
+    return output_file == '-' or (os.path.exists(output_file) and not os.path.isfile(output_file))
+
+def _open_output(output_file):
     """
-    if not words and not special_chars:
+    Ouvre la sortie en binaire avec un grand tampon ; '-' désigne la sortie standard.
+    """
+    if output_file == '-':
+        return open(sys.__stdout__.fileno(), 'wb', buffering=OUTPUT_BUFFER_SIZE, closefd=False)
+    return open(output_file, 'wb', buffering=OUTPUT_BUFFER_SIZE)
+
+def _open_resumed(output_file, state):
+    """
+    Ouvre la sortie pour une reprise, tronquée au dernier offset cohérent.
+    """
+    if state is None:
+        return _open_output(output_file)
+    if not os.path.isfile(output_file) or os.path.getsize(output_file) < state['offset']:
+        raise ValueError(f"{output_file} est plus court que le point de reprise")
+    f_out = open(output_file, 'r+b')
+    f_out.truncate(state['offset'])
+    f_out.seek(state['offset'])
+    return f_out
+
+def _open_sink(output_file, state, dedupe=None, compress=None):
+    """
+    Ouvre la sortie, derrière un écrivain de dédoublonnage si demandé, puis
+    derrière un compresseur. Les écrivains sont conservés dans dedupe['writer']
+    et compress['writer'] pour le bilan final.
+    """
+    f_out = _open_resumed(output_file, state)
+    if compress is not None:
+        f_out = compress['writer'] = CompressedWriter(f_out, compress['codec'], compress.get('level'), compress.get('threads'))
+    if dedupe is None:
+        return f_out
+    if dedupe['mode'] == 'bloom':
+        writer = BloomDedupWriter(f_out, dedupe['expected'], dedupe['fp_rate'])
+    else:
+        tmp_dir = None if is_stream(output_file) else os.path.dirname(os.path.abspath(output_file))
+        writer = ExternalSortDedupWriter(f_out, dedupe['memory'], tmp_dir)
+    dedupe['writer'] = writer
+    return writer
+
+def _count_lines(path):
+    """Compte les lignes d'un fichier binaire par blocs."""
+    count = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(16 * 1024 * 1024), b''):
+            count += block.count(b'\n')
+    return count
+
+_worker_words = None
+_worker_settings = None
+_worker_instrumented = False
+
+def _init_worker(words, settings, instrumented=False):
+    global _worker_words, _worker_settings, _worker_instrumented
+    _worker_words = words
+    _worker_settings = settings
+    _worker_instrumented = instrumented
+
+def _generate_shard(task):
+    """
+    Génère une plage de combinaisons dans son propre fichier (processus fils).
+    :return: Tuple (lignes écrites, métriques de la plage ou None)
+    """
+    length, start, stop, variant_slice, shard_path, max_combinations = task
+    combos = _iter_source(_worker_words, length, _worker_settings, start, stop)
+    metrics = Metrics('matrixsec_generate', GENERATE_STAGES) if _worker_instrumented else None
+    # Écrire sous un nom temporaire : un fichier sans suffixe est toujours complet
+    with open(shard_path + '.tmp', 'wb') as f_shard:
+        sink = TimedWriter(f_shard, metrics) if metrics is not None else f_shard
+        total, _ = _write_combinations(sink, combos, _worker_settings, 0, max_combinations, variant_slice=variant_slice,
+                                       metrics=metrics)
+    os.replace(shard_path + '.tmp', shard_path)
+    return total, metrics.snapshot() if metrics is not None else None
+
+def _generate_parallel(words, output_file, settings, segments, max_combinations, workers, keep_shards, checkpoint_file=None, state=None, checkpoint_interval=30, fingerprint=None, dedupe=None, metrics=None, compress=None):
+    """
+    Répartit la génération sur plusieurs processus, un fichier par plage, puis
+    fusionne les fichiers dans l'ordre (ou les conserve numérotés). La sortie
+    est identique octet pour octet à celle du mode mono-processus.
+    Avec checkpoint_file, les plages terminées sont conservées et la fusion est
+    enregistrée au fil de l'eau pour permettre une reprise.
+    Avec metrics, les mesures de chaque plage y sont ajoutées à sa fin (durées
+    cumulées sur les processus) ; la fusion des fichiers compte dans 'write'.
+    :return: Tuple (total_generated, limite_atteinte, fichiers_produits)
+    """
+    if is_stream(output_file):
+        shard_dir = tempfile.mkdtemp(prefix='matrixsec-shards-')
+    else:
+        shard_dir = f"{output_file}.shards"
+        if state is None:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+        os.makedirs(shard_dir, exist_ok=True)
+    tasks = []
+    for length, seg_start, seg_stop, variant_slice in segments:
+        for start, stop in split_ranks(seg_stop - seg_start, workers * 4):
+            shard_path = os.path.join(shard_dir, f"{len(tasks):06d}")
+            tasks.append(((length, seg_start + start, seg_start + stop, variant_slice, shard_path, max_combinations), stop - start))
+
+    first_shard = state['shard'] if state else 0
+    total_generated = state['total_generated'] if state else 0
+    limit_reached = False
+    produced = [f"{output_file}.part{n:04d}" for n in range(first_shard)] if keep_shards else []
+    f_out = None if keep_shards else _open_sink(output_file, state, dedupe, compress)
+    next_checkpoint = time.monotonic() + checkpoint_interval
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(words, settings, metrics is not None))
+    try:
+        # Les plages déjà terminées lors d'une exécution précédente ne sont pas relancées
+        futures = [None if os.path.isfile(task[4]) else executor.submit(_generate_shard, task)
+                   for task, _ in tasks[first_shard:]]
+        with tqdm(total=sum(count for _, count in tasks), initial=sum(count for _, count in tasks[:first_shard]),
+                  desc=f"Création ({workers} processus)", unit="combinaison") as pbar:
+            for shard_index, (task, count), future in zip(itertools.count(first_shard), tasks[first_shard:], futures):
+                if total_generated >= max_combinations:
+                    limit_reached = True
+                    break
+                length, start, stop, variant_slice, shard_path, _ = task
+                shard_total, snapshot = future.result() if future is not None else (_count_lines(shard_path), None)
+                if snapshot is not None:
+                    metrics.merge(snapshot)
+                if total_generated + shard_total >= max_combinations:
+                    # La limite tombe dans cette plage : la régénérer ici pour couper
+                    # exactement à la même combinaison que le mode mono-processus.
+                    with open(shard_path, 'wb') as f_shard:
+                        combos = _iter_source(words, length, settings, start, stop)
+                        shard_total, limit_reached = _write_combinations(f_shard, combos, settings, total_generated, max_combinations,
+                                                                         variant_slice=variant_slice)
+                        shard_total -= total_generated
+                total_generated += shard_total
+
+                if keep_shards:
+                    target = f"{output_file}.part{len(produced):04d}"
+                    os.replace(shard_path, target)
+                    produced.append(target)
+                else:
+                    copy_start = time.perf_counter()
+                    with open(shard_path, 'rb') as f_shard:
+                        shutil.copyfileobj(f_shard, f_out, 16 * 1024 * 1024)
+                    os.remove(shard_path)
+                    if metrics is not None:
+                        metrics.add_time('write', time.perf_counter() - copy_start)
+                pbar.update(count)
+                if checkpoint_file and time.monotonic() >= next_checkpoint:
+                    _save_checkpoint(checkpoint_file, {'fingerprint': fingerprint, 'shard': shard_index + 1,
+                                                       'total_generated': total_generated}, f_out)
+                    next_checkpoint = time.monotonic() + checkpoint_interval
+                if limit_reached:
+                    break
+    finally:
+        # Ne pas attendre les plages restantes (limite atteinte, lecteur fermé...)
+        executor.shutdown(wait=True, cancel_futures=True)
+        if checkpoint_file is None:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+        if f_out is not None:
+            f_out.close()
+            produced.append(output_file)
+    # Génération terminée : les plages conservées pour la reprise ne servent plus
+    shutil.rmtree(shard_dir, ignore_errors=True)
+    return total_generated, limit_reached, produced
+
+def resolve_rules(rules, case_variants=False, special_chars=None, append_special=False):
+    """
+    Règles appliquées à chaque combinaison : celles fournies, sinon les règles
+    équivalentes à case_variants et aux caractères spéciaux.
+    """
+    return list(rules) if rules else default_rules(case_variants, special_chars, append_special)
+
+class WordlistOptions:
+    """
+    Réglages de generate_wordlist, regroupés en un seul objet : chaque option
+    est un attribut, initialisé depuis DEFAULTS si elle n'est pas fournie.
+    - combinaisons : max_combinations, min_length, max_length (None : tous les
+      mots), separator, template, years, suffixes ;
+    - variantes et filtre : case_variants, special_chars, append_special, rules,
+      min_char_length, max_char_length ;
+    - exécution : engine, workers, keep_shards, dry_run, resume,
+      checkpoint_interval, skip, limit, node, probability ;
+    - sortie : dedupe, compress, metrics.
+    Le détail de chaque option est donné par generate_wordlist.
+    """
+
+    DEFAULTS = {
+        'max_combinations': 1000000,
+        'min_length': 1,
+        'max_length': None,
+        'separator': '',
+        'template': None,
+        'years': (1900, 2025),
+        'suffixes': None,
+        'case_variants': False,
+        'special_chars': None,
+        'append_special': False,
+        'rules': None,
+        'min_char_length': 6,
+        'max_char_length': None,
+        'engine': 'bytes',
+        'workers': 1,
+        'keep_shards': False,
+        'dry_run': False,
+        'resume': False,
+        'checkpoint_interval': 30,
+        'skip': 0,
+        'limit': None,
+        'node': None,
+        'probability': None,
+        'dedupe': None,
+        'compress': None,
+        'metrics': None,
+    }
+
+    def __init__(self, **options):
+        unknown = set(options) - set(self.DEFAULTS)
+        if unknown:
+            raise TypeError(f"option inconnue : {', '.join(sorted(unknown))}")
+        for name, default in self.DEFAULTS.items():
+            setattr(self, name, options.get(name, default))
+
+    def replace(self, **changes):
+        """Copie des réglages, avec les options données remplacées."""
+        return WordlistOptions(**dict(vars(self), **changes))
+
+    def __repr__(self):
+        changed = ', '.join(f"{name}={value!r}" for name, value in vars(self).items() if value != self.DEFAULTS[name])
+        return f"WordlistOptions({changed})"
+
+
+# Ordre des réglages quand generate_wordlist les recevait en arguments positionnels
+LEGACY_POSITIONAL = ('max_combinations', 'min_length', 'max_length', 'separator', 'case_variants',
+                     'special_chars', 'append_special', 'rules', 'engine', 'workers', 'keep_shards',
+                     'dry_run', 'resume', 'checkpoint_interval', 'skip', 'limit', 'node', 'dedupe',
+                     'template', 'years', 'suffixes', 'min_char_length', 'metrics', 'compress',
+                     'max_char_length', 'probability')
+
+
+def _legacy_options(options, args, kwargs):
+    """
+    Construit les réglages de generate_wordlist à partir de ses arguments :
+    options tel quel, ou un appel à l'ancienne signature, où chaque réglage
+    était un argument positionnel ou nommé.
+    :param options: troisième argument reçu : WordlistOptions, None ou max_combinations
+    :param args: arguments positionnels suivants
+    :param kwargs: arguments nommés
+    :return: WordlistOptions correspondant
+    """
+    if isinstance(options, WordlistOptions):
+        if args:
+            raise TypeError("réglages positionnels donnés en plus de options")
+        return options.replace(**kwargs) if kwargs else options
+    values = args if options is None else (options,) + args
+    if len(values) > len(LEGACY_POSITIONAL):
+        raise TypeError(f"trop d'arguments positionnels ({len(values) + 2})")
+    settings = dict(zip(LEGACY_POSITIONAL, values))
+    repeated = set(settings) & set(kwargs)
+    if repeated:
+        raise TypeError(f"option donnée deux fois : {', '.join(sorted(repeated))}")
+    return WordlistOptions(**settings, **kwargs)
+
+def export_rule_attack(words, output_file, formats, options):
+    """
+    Écrit, au lieu de toutes les variantes, une liste de base (les combinaisons
+    sans règles ni suffixes) et un fichier de règles par outil demandé, qui
+    reproduit les variantes à l'attaque :
+    <sortie>.base.txt, <sortie>.hashcat.rule et/ou <sortie>.john.rule.
+    Si la sortie est compressée, la liste de base l'est aussi et l'extension du
+    codec passe à la fin : wordlist.gz donne wordlist.base.txt.gz et wordlist.hashcat.rule.
+    :param options: Réglages de generate_wordlist (WordlistOptions).
+    """
+    rules = resolve_rules(options.rules, options.case_variants,
+                          None if options.template else options.special_chars, options.append_special)
+    suffixes = list(dict.fromkeys(value for source in options.suffixes or () for value in source))
+    min_char_length = options.min_char_length
+    max_char_length = options.max_char_length
+    stem, extension = output_file, ''
+    codec = (options.compress or {}).get('codec') or codec_from_path(output_file)
+    if codec:
+        extension = CODECS[codec][0]
+        if output_file.lower().endswith(extension):
+            stem = output_file[:-len(extension)]
+    for fmt in formats:
+        if fmt not in ('hashcat', 'john'):
+            continue
+        rule_file = f"{stem}.{fmt}.rule"
+        count = write_rule_file(rule_file, rules, fmt, suffixes, min_char_length, max_char_length=max_char_length)
+        print(f"Fichier de règles {fmt} : {rule_file} ({count} règles)")
+    # Liste de base : le filtre de longueur s'applique après les règles, à l'attaque
+    base_options = options.replace(rules=[':'], suffixes=None, min_char_length=0, max_char_length=None)
+    generate_wordlist(words, f"{stem}.base.txt{extension}", base_options)
+
+def generate_wordlist(words, output_file, options=None, *args, **kwargs):
+    """
+    Génère une wordlist en concaténant les mots, dates, et caractères spéciaux en un seul mot, avec un minimum de min_char_length caractères.
+    Les réglages sont ceux de options (voir WordlistOptions, valeurs par défaut si None).
+    Les appels à l'ancienne signature, où chaque réglage est passé en argument
+    (positionnel, dans l'ordre de LEGACY_POSITIONAL, ou nommé), restent acceptés ;
+    des arguments nommés donnés avec options remplacent les réglages correspondants.
+    Les variantes de chaque combinaison sont produites par des règles hashcat :
+    `rules` si fourni, sinon les règles équivalentes à case_variants/special_chars.
+    Le moteur 'bytes' assemble les lignes en octets ; 'str' est le chemin historique.
+    Avec workers > 1, les combinaisons sont réparties sur plusieurs processus.
+    Avec dry_run, affiche seulement la taille et la durée estimées.
+    Avec resume, la progression est enregistrée dans <sortie>.ckpt et une
+    exécution interrompue reprend là où elle s'était arrêtée.
+    Avec skip/limit (ou node=(K, N)), seule la tranche correspondante de l'espace
+    des candidats est générée, sans énumérer ce qui précède.
+    Avec dedupe={'mode': 'exact'|'bloom', 'memory': octets, 'fp_rate': taux}, les
+    doublons sont supprimés à l'écriture (tri externe exact, ou filtre de Bloom).
+    Avec template (ex. '{word}{year}?s'), les lignes suivent le gabarit au lieu
+    de combiner les mots : chaque emplacement prend ses candidats dans les mots,
+    les caractères spéciaux, une source de dates ou de nombres (années `years`)
+    ou un masque hashcat. Les caractères spéciaux ne sont alors ajoutés que par le gabarit.
+    Avec suffixes (sources de dates ou de nombres, voir sources.py), chaque
+    variante est aussi écrite suivie de chaque valeur, sans que ces valeurs
+    soient combinées avec les mots.
+    Avec metrics={'file': chemin, 'port': port, 'interval': secondes}, les compteurs
+    et durées par étape (combine, mutate, filter, write) sont publiés pendant la
+    génération (voir metrics.MetricsReporter).
+    Avec compress={'codec': 'gzip'|'zstd'|'lz4', 'level': niveau, 'threads': nombre},
+    ou une extension .gz, .zst ou .lz4, la sortie est compressée par blocs dans
+    des threads, en parallèle de la génération (voir compression.CompressedWriter).
+    Avec max_char_length, les lignes de plus de max_char_length caractères sont
+    écartées ; les combinaisons dont aucune variante ne tombe entre les deux
+    bornes sont élaguées avant d'être assemblées, et les longueurs de combinaison
+    entièrement trop longues ne sont pas parcourues.
+    Avec probability={'file': fuite, 'sample': lignes, 'beam_width': états}, les
+    mêmes candidats sont écrits du plus probable au moins probable, d'après les
+    fréquences apprises sur une fuite de référence (voir probability.py).
+    """
+    options = _legacy_options(options, args, kwargs)
+    # Réglages que la suite ajuste (gabarit, tranche --node) ou copie avant d'y ranger ses écrivains
+    separator, special_chars = options.separator, options.special_chars
+    skip, limit = options.skip, options.limit
+    dedupe, compress = options.dedupe, options.compress
+    if options.max_char_length is not None and options.max_char_length < options.min_char_length:
+        print(f"Erreur : la longueur maximale ({options.max_char_length}) est inférieure à la longueur minimale ({options.min_char_length}).")
+        return
+    if options.probability is not None:
+        conflicts = [option for option, used in (('--workers', options.workers > 1), ('--resume', options.resume),
+                                                  ('--skip/--limit/--node', bool(skip) or limit is not None or options.node is not None),
+                                                  ('--template', options.template is not None), ('--keep-shards', options.keep_shards)) if used]
+        if conflicts:
+            print(f"Erreur : l'ordre par probabilité (--model) ne peut pas être combiné avec {', '.join(conflicts)}.")
+            return
+    if compress is None and codec_from_path(output_file):
+        compress = {'codec': codec_from_path(output_file)}
+    if compress is not None:
+        compress = dict(compress)
+        try:
+            check_codec(compress['codec'])
+        except ValueError as e:
+            print(f"Erreur : {e}")
+            return
+        if options.keep_shards:
+            print("Erreur : --keep-shards ne peut pas être combiné avec la compression.")
+            return
+
+    compiled = None
+    if options.template is not None:
+        try:
+            compiled = compile_template(options.template, {'word': words, 'special': special_chars}, *options.years)
+        except ValueError as e:
+            print(f"Erreur : {e}")
+            return
+        # Le gabarit fixe la structure : ni séparateur ni ajout automatique de caractères spéciaux
+        separator = ''
+        special_chars = None
+    elif not words and not special_chars:
         print("Erreur : aucune donnée à combiner.")
         return
 
     print_banner()
     start_time = time.time()
 
-    max_length = max_length or len(words)
+    max_length = options.max_length or len(words)
     max_length = min(max_length, len(words))
 
+    settings = {
+        'separator': separator,
+        'rules': resolve_rules(options.rules, options.case_variants, special_chars, options.append_special),
+        'engine': options.engine,
+        'min_char_length': options.min_char_length,  # Longueur minimale des combinaisons
+    }
+    if options.max_char_length is not None:
+        settings['max_char_length'] = options.max_char_length
+    if options.suffixes:
+        # L'étage de suffixes parcourt les valeurs pour chaque variante : les sources
+        # sont développées une seule fois ici, dédoublonnées dans l'ordre
+        settings['suffixes'] = list(dict.fromkeys(value for source in options.suffixes for value in source))
+    # Sans ASCII, la casse peut changer la longueur des mots : pas d'élagage ni d'estimation exacte
+    settings['ascii'] = ascii_input(itertools.chain(compiled.candidates() if compiled else words, settings.get('suffixes', ())),
+                                    separator, settings['rules'])
+    settings['engine'] = select_engine(options.engine, settings['ascii'])
+    pool = _candidate_pool(compiled or words, settings)
+    keyspace = keyspace_size(len(words), settings, options.min_length, max_length, compiled)
+    if compiled is not None:
+        print(f"Gabarit {options.template} : {compiled.size} lignes avant variantes")
+    if options.node is not None:
+        index, count = options.node
+        skip = keyspace * (index - 1) // count
+        limit = keyspace * index // count - skip
+    sliced = bool(skip) or limit is not None
+    if sliced:
+        print(f"Tranche de l'espace des candidats : {skip} à {skip + limit if limit is not None else keyspace} sur {keyspace}")
+    plan = plan_wordlist(words, settings, options.min_length, max_length, options.max_combinations, compiled)
+    if options.dry_run:
+        rate = _measure_rate(compiled or words, settings, plan[-1]['length']) if plan else 0
+        print_plan(plan, options.max_combinations, rate, options.workers)
+        return
+
+    model = None
+    if options.probability is not None:
+        try:
+            model = learn_model(options.probability['file'], words, options.probability.get('sample'))
+        except (OSError, ValueError) as e:
+            print(f"Erreur : impossible d'apprendre le modèle sur {options.probability['file']} : {e}")
+            return
+        print(f"Modèle appris sur {model.total} mots de passe de {options.probability['file']}")
+
+    if sliced:
+        segments = keyspace_segments(len(words), settings, options.min_length, max_length, skip, limit, compiled)
+    else:
+        # Les longueurs au-delà de la coupure prévue par le plan, ou sans aucune ligne retenue, ne sont pas parcourues
+        segments = [(step['length'], 0, step['combinations'], None) for step in plan if step['lines'] or not step['exact']]
+    if options.min_char_length > 0 or options.max_char_length is not None:
+        print_length_bands(plan, sum(step['lines'] for step in plan) > options.max_combinations)
+
+    if dedupe is not None:
+        dedupe = dict(dedupe)
+        # Nombre de lignes attendu, pour dimensionner le filtre de Bloom
+        expected = min(limit, keyspace - skip) if sliced and limit is not None else sum(step['lines'] for step in plan)
+        dedupe['expected'] = min(options.max_combinations, expected)
+
     total_generated = 0
-    buffer = []
-    buffer_size = 1000
-    min_char_length = 6  # Longueur minimale des combinaisons
+    limit_reached = False
+    produced = [output_file]
+    checkpoint_file = f"{output_file}.ckpt" if options.resume else None
+    fingerprint = _fingerprint(compiled.pools if compiled else words, settings, segments, options.max_combinations, options.workers, options.keep_shards,
+                               compress['codec'] if compress is not None else None)
+    instrument = Metrics('matrixsec_generate', GENERATE_STAGES) if options.metrics is not None else None
+    reporter = MetricsReporter(instrument, options.metrics.get('file'), options.metrics.get('port'), options.metrics.get('interval', 10)) \
+        if options.metrics is not None else contextlib.nullcontext()
 
     try:
-        with open(output_file, 'w', encoding='utf-8') as f_out:
-            for i in range(min_length, max_length + 1):
-                total_combinations = sum(1 for _ in itertools.combinations(words, i))
-                with tqdm(total=total_combinations, desc=f"Création de {i} éléments", unit="combinaison") as pbar:
-                    for combo in itertools.combinations(words, i):
-                        if total_generated >= max_combinations:
-                            print(f"\nLimite de {max_combinations} combinaisons atteinte.")
+        with reporter:
+            state = _load_checkpoint(checkpoint_file, fingerprint) if options.resume else None
+            if state is not None:
+                print(f"Reprise depuis {checkpoint_file} ({state['total_generated']} combinaisons déjà écrites)")
+            if options.workers > 1:
+                total_generated, limit_reached, produced = _generate_parallel(
+                    pool, output_file, settings, segments, options.max_combinations, options.workers, options.keep_shards,
+                    checkpoint_file, state, options.checkpoint_interval, fingerprint, dedupe, instrument, compress)
+            elif model is not None:
+                beam_width = options.probability.get('beam_width') or BEAM_WIDTH
+                with _open_sink(output_file, None, dedupe, compress) as f_out, \
+                        tqdm(total=min(options.max_combinations, sum(step['lines'] for step in plan)),
+                             desc=f"Création par probabilité (faisceau de {beam_width})", unit="ligne") as pbar:
+                    sink = TimedWriter(f_out, instrument) if instrument is not None else f_out
+                    total_generated, dropped = _write_by_probability(sink, words, settings, model, options.min_length, max_length,
+                                                                     options.max_combinations, beam_width, pbar)
+                    limit_reached = total_generated >= options.max_combinations
+                if dropped:
+                    print(f"Attention : la file de priorité a abandonné {dropped} états (et leurs successeurs) : "
+                          f"la liste est incomplète. Augmente --beam-width pour les garder.")
+            else:
+                with _open_sink(output_file, state, dedupe, compress) as f_out:
+                    if state is not None:
+                        total_generated = state['total_generated']
+                    sink = TimedWriter(f_out, instrument) if instrument is not None else f_out
+                    progress = {'length': 0, 'start': 0, 'due': time.monotonic() + options.checkpoint_interval}
+
+                    def checkpoint(consumed, generated):
+                        if time.monotonic() < progress['due']:
                             return
-                        # Concaténer les éléments en un seul mot
-                        combination = separator.join(combo) if separator else ''.join(combo)
-                        variations = [combination.lower(), combination.capitalize(), combination.upper()] if case_variants else [combination]
-
-                        # Ajouter des caractères spéciaux si demandé
-                        final_variations = []
-                        if special_chars and append_special:
-                            for var in variations:
-                                for char in special_chars:
-                                    final_variations.extend([var + char, char + var])
-                            final_variations.extend(variations)  # Inclure la version sans caractère spécial
-                        else:
-                            final_variations = variations
-
-                        # Filtrer les combinaisons de moins de 6 caractères
-                        for var in final_variations:
-                            if len(var) >= min_char_length:
-                                buffer.append(var + '\n')
-                                total_generated += 1
-                                if len(buffer) >= buffer_size:
-                                    f_out.writelines(buffer)
-                                    buffer.clear()
-                        pbar.update(1)
-            if buffer:
-                f_out.writelines(buffer)
+                        _save_checkpoint(checkpoint_file, {'fingerprint': fingerprint, 'length': progress['length'],
+                                                           'index': progress['start'] + consumed, 'total_generated': generated}, f_out)
+                        progress['due'] = time.monotonic() + options.checkpoint_interval
+
+                    for i, length_segments in itertools.groupby(segments, key=lambda segment: segment[0]):
+                        length_segments = list(length_segments)
+                        with tqdm(total=sum(stop - start for _, start, stop, _ in length_segments),
+                                  desc=f"Création de {i} éléments", unit="combinaison") as pbar:
+                            for _, start, stop, variant_slice in length_segments:
+                                if state is not None:
+                                    # Sauter ce qui a déjà été écrit avant l'interruption
+                                    if (i, stop) <= (state['length'], state['index']):
+                                        pbar.update(stop - start)
+                                        continue
+                                    if i == state['length'] and start < state['index']:
+                                        pbar.update(state['index'] - start)
+                                        start = state['index']
+                                progress['length'], progress['start'] = i, start
+                                done = pbar.n
+                                total_generated, limit_reached = _write_combinations(
+                                    sink, _iter_source(pool, i, settings, start, stop), settings, total_generated, options.max_combinations, pbar,
+                                    checkpoint if options.resume else None, variant_slice, instrument)
+                                if limit_reached:
+                                    break
+                                # Combinaisons élaguées en fin de plage : jamais vues par l'écriture
+                                pbar.update(stop - start - (pbar.n - done))
+                        if limit_reached:
+                            break
+        if checkpoint_file and os.path.isfile(checkpoint_file):
+            os.remove(checkpoint_file)
+    except BrokenPipeError:
+        # Le lecteur (hashcat, john, head...) a fermé le tube : arrêter sans bruit.
+        # Rediriger stdout vers /dev/null évite une seconde erreur à la fermeture.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.__stdout__.fileno())
+        os.close(devnull)
+        print("\nSortie fermée par le lecteur, génération arrêtée.")
+        return
     except PermissionError:
         print(f"Erreur : impossible d'écrire dans {output_file}. Vérifie les permissions.")
         return
@@ -162,11 +1290,38 @@ def generate_wordlist(words, output_file, max_combinations=1000000, min_length=1
         print(f"Erreur : {e}")
         return
 
+    if limit_reached:
+        print(f"\nLimite de {options.max_combinations} combinaisons atteinte.")
+
     end_time = time.time()
-    file_size = os.path.getsize(output_file) / (1024 * 1024)  # Taille en Mo
     print(f"\nWordlist créée avec succès !")
-    print(f"Total : {total_generated} combinaisons (au moins {min_char_length} caractères)")
-    print(f"Fichier : {output_file} ({file_size:.2f} Mo)")
+    if options.max_char_length is not None:
+        print(f"Total : {total_generated} combinaisons ({options.min_char_length} à {options.max_char_length} caractères)")
+    else:
+        print(f"Total : {total_generated} combinaisons (au moins {settings['min_char_length']} caractères)")
+    if dedupe is not None and 'writer' in dedupe:
+        duplicates = dedupe['writer'].duplicates
+        if dedupe['mode'] == 'bloom':
+            method = f"filtre de Bloom, {dedupe['writer'].size // 8 / (1024 * 1024):.1f} Mo, faux positifs ≤ {dedupe['fp_rate']:.2%}"
+        else:
+            method = "tri externe exact, sortie triée"
+        print(f"Doublons supprimés : {duplicates} ({method}), {total_generated - duplicates} lignes écrites")
+    if compress is not None and 'writer' in compress:
+        writer = compress['writer']
+        ratio = writer.uncompressed / writer.compressed if writer.compressed else 0
+        print(f"Compression {writer.codec} : {writer.uncompressed / (1024 * 1024):.2f} Mo -> "
+              f"{writer.compressed / (1024 * 1024):.2f} Mo (÷{ratio:.1f}, {writer.threads} threads)")
+    if instrument is not None:
+        print(f"Étapes : {instrument.summary()}")
+    if is_stream(output_file):
+        print(f"Sortie : {'sortie standard' if output_file == '-' else output_file}")
+        print(f"Temps : {end_time - start_time:.2f} secondes")
+        return
+    file_size = sum(os.path.getsize(path) for path in produced) / (1024 * 1024)  # Taille en Mo
+    if len(produced) > 1:
+        print(f"Fichiers : {produced[0]} ... {produced[-1]} ({len(produced)} fichiers, {file_size:.2f} Mo)")
+    else:
+        print(f"Fichier : {produced[0]} ({file_size:.2f} Mo)")
     print(f"Temps : {end_time - start_time:.2f} secondes")
 
 def load_words_from_file(file_path):
@@ -179,7 +1334,8 @@ def load_words_from_file(file_path):
         return []
     try:
         with file_path.open('r', encoding='utf-8') as f:
-            words = {line.strip() for line in f if line.strip()}
+            # Dédoublonner en conservant l'ordre du fichier (nécessaire pour --resume)
+            words = dict.fromkeys(line.strip() for line in f if line.strip())
         return list(words)
     except UnicodeDecodeError:
         print(f"Erreur : problème avec l'encodage du fichier {file_path}.")
@@ -188,52 +1344,284 @@ def load_words_from_file(file_path):
         print(f"Erreur : {e}")
         return []
 
+# Clés de default_settings reconnues dans le fichier de configuration : option correspondante et type attendu
+CONFIG_SETTINGS = {
+    'max_combinations': ('max_combinations', int),
+    'min_length': ('min_length', int),
+    'max_length': ('max_length', (int, type(None))),
+    'separator': ('separator', str),
+    'case_variants': ('case_variants', bool),
+    'min_char_length': ('min_chars', int),
+    'max_char_length': ('max_chars', (int, type(None))),
+}
+
+# Noms des types JSON, pour les messages d'erreur de la configuration
+_JSON_TYPES = {dict: 'un objet', list: 'une liste', str: 'une chaîne', int: 'un entier', bool: 'un booléen'}
+
+def _check_config_type(value, kinds, name):
+    """
+    Vérifie le type d'une valeur de la configuration (un booléen JSON n'est pas un entier).
+    """
+    kinds = kinds if isinstance(kinds, tuple) else (kinds,)
+    if not isinstance(value, kinds) or (isinstance(value, bool) and bool not in kinds):
+        expected = ' ou '.join(_JSON_TYPES.get(kind, 'null') for kind in kinds)
+        raise ValueError(f"{name} doit être {expected}, pas {json.dumps(value, ensure_ascii=False)}")
+    return value
+
+OUTPUT_FORMATS = ('plain', 'hashcat', 'john')
+
+def load_config(file_path):
+    """
+    Charge un fichier de configuration (voir config.json) et le traduit en valeurs
+    par défaut des options de la ligne de commande, qui restent prioritaires.
+    Une configuration vaut réponses aux questions : le mode devient non interactif.
+    :return: Dict {option: valeur}
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        try:
+            config = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON invalide, ligne {e.lineno} colonne {e.colno} : {e.msg}")
+    if not isinstance(config, dict):
+        raise ValueError("un objet JSON est attendu")
+    defaults = {'no_interactive': True}
+    settings = _check_config_type(config.get('default_settings') or {}, dict, 'default_settings')
+    for key, value in settings.items():
+        if key not in CONFIG_SETTINGS:
+            raise ValueError(f"paramètre inconnu default_settings.{key}")
+        option, kinds = CONFIG_SETTINGS[key]
+        defaults[option] = _check_config_type(value, kinds, f"default_settings.{key}")
+
+    special_chars = config.get('special_chars')
+    if isinstance(special_chars, dict):
+        for name, chars in special_chars.items():
+            _check_config_type(chars, str, f"special_chars.{name}")
+        defaults['special_sets'] = special_chars
+        if 'default' in special_chars:
+            defaults['special_chars'] = special_chars['default']
+    elif special_chars is not None:
+        defaults['special_chars'] = _check_config_type(special_chars, str, 'special_chars')
+
+    years = _check_config_type(config.get('years') or {}, dict, 'years')
+    if years:
+        start_year = _check_config_type(years.get('start_year', 1900), int, 'years.start_year')
+        end_year = _check_config_type(years.get('end_year', 2025), int, 'years.end_year')
+        defaults['years'] = f"{start_year}-{end_year}"
+        # Suffixes seulement sur demande explicite ; --suffix les remplace (voir main)
+        if years.get('suffixes'):
+            defaults['config_suffix'] = list(_check_config_type(years['suffixes'], list, 'years.suffixes'))
+
+    common_words = _check_config_type(config.get('common_words') or [], list, 'common_words')
+    defaults['extra_words'] = [_check_config_type(word, str, 'common_words') for word in common_words]
+
+    formats = _check_config_type(config.get('output_formats') or {}, dict, 'output_formats')
+    if formats:
+        unknown = set(formats) - set(OUTPUT_FORMATS)
+        if unknown:
+            raise ValueError(f"format de sortie inconnu {', '.join(sorted(unknown))}")
+        defaults['formats'] = [fmt for fmt in OUTPUT_FORMATS if formats.get(fmt)]
+    return defaults
+
 def main():
+    # Le fichier de configuration fournit les valeurs par défaut : le lire avant le reste
+    config_parser = argparse.ArgumentParser(add_help=False)
+    config_parser.add_argument('--config', type=str)
+    config_args, _ = config_parser.parse_known_args()
+    config_defaults = {}
+    if config_args.config:
+        try:
+            config_defaults = load_config(config_args.config)
+        except (OSError, ValueError) as e:
+            print(f"Erreur : configuration {config_args.config} : {e}")
+            return
+
     parser = argparse.ArgumentParser(
         description="Script Wordlist Generator - By ScriptSeinsei",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
     )
     parser.add_argument('--input', type=str, required=True, help='Fichier avec les mots (un par ligne)')
-    parser.add_argument('--output', type=str, required=True, help='Fichier de sortie pour la wordlist')
+    parser.add_argument('--output', type=str, help='Fichier de sortie pour la wordlist ("-" pour la sortie standard)')
+    parser.add_argument('--fifo', type=str, help='Écrire dans un tube nommé (créé s\'il n\'existe pas) au lieu d\'un fichier')
     parser.add_argument('--max-combinations', type=int, default=1000000, help='Nombre maximum de combinaisons')
     parser.add_argument('--min-length', type=int, default=1, help='Longueur minimale des combinaisons (nombre d\'éléments)')
     parser.add_argument('--max-length', type=int, help='Longueur maximale des combinaisons (nombre d\'éléments)')
+    parser.add_argument('--min-chars', type=int, help='Longueur minimale des lignes, en caractères')
+    parser.add_argument('--max-chars', type=int, help='Longueur maximale des lignes, en caractères (les combinaisons trop longues sont élaguées sans être assemblées)')
     parser.add_argument('--separator', type=str, default='', help='Caractère entre les éléments (ex. "-", "_"; vide par défaut)')
     parser.add_argument('--case-variants', action='store_true', help='Ajouter des variations majuscules/minuscules')
+    parser.add_argument('--rules', type=str, help='Fichier de règles hashcat appliquées à chaque combinaison (remplace --case-variants et les caractères spéciaux)')
+    parser.add_argument('--engine', choices=['bytes', 'str'], default='bytes', help='Moteur de génération : bytes (rapide) ou str (chemin historique, pour comparer)')
     parser.add_argument('--no-interactive', action='store_true', help='Désactiver les questions interactives')
+    parser.add_argument('--workers', type=int, default=1, help='Nombre de processus de génération (1 = mono-processus)')
+    parser.add_argument('--dry-run', action='store_true', help='Afficher le nombre de lignes, la taille et la durée estimées sans générer')
+    parser.add_argument('--resume', action='store_true', help='Enregistrer la progression dans <sortie>.ckpt et reprendre une génération interrompue')
+    parser.add_argument('--checkpoint-interval', type=int, default=30, help='Intervalle entre deux points de reprise (secondes)')
+    parser.add_argument('--skip', type=int, default=0, help='Nombre de candidats à sauter au début de l\'espace (comme -s de hashcat)')
+    parser.add_argument('--limit', type=int, help='Nombre de candidats à parcourir après --skip (comme -l de hashcat)')
+    parser.add_argument('--node', type=str, help='Générer seulement la partie K de l\'espace découpé en N (forme K/N)')
+    parser.add_argument('--dedupe', choices=['exact', 'bloom'], help='Supprimer les doublons : tri externe exact (sortie triée) ou filtre de Bloom (ordre conservé)')
+    parser.add_argument('--dedupe-memory', type=int, default=512, help='Mémoire maximale du tri externe (Mo)')
+    parser.add_argument('--bloom-fp-rate', type=float, default=0.001, help='Taux de faux positifs du filtre de Bloom')
+    parser.add_argument('--keep-shards', action='store_true', help='Avec --workers, conserver les fichiers numérotés (sortie.partNNNN) au lieu de les fusionner')
+    parser.add_argument('--template', type=str, help='Gabarit des lignes au lieu des combinaisons, ex. "{word}{year}?s" (emplacements {word}, {year}, {date}, {special} ; masques ?l ?u ?d ?s ?a)')
+    parser.add_argument('--config', type=str, help='Fichier de configuration JSON (voir config.json) : valeurs par défaut des options, sans questions')
+    parser.add_argument('--special-chars', type=str, help='Caractères spéciaux ajoutés au début/à la fin en mode non interactif (ou nom d\'un jeu du fichier de configuration)')
+    parser.add_argument('--formats', nargs='+', choices=OUTPUT_FORMATS, default=['plain'], help='Sorties : plain (wordlist complète), hashcat/john (liste de base + fichier de règles)')
+    parser.add_argument('--years', type=str, default='1900-2025', help='Années des emplacements {year}/{date} et des suffixes de dates (forme AAAA-AAAA)')
+    parser.add_argument('--suffix', action='append', help='Ajouter après chaque variante les valeurs d\'une source : year, date:FORMAT (ex. date:DDMMYYYY), num:A-B (répétable)')
+    parser.add_argument('--compress', choices=list(CODECS), help='Compresser la sortie (par défaut, selon l\'extension : .gz, .zst, .lz4)')
+    parser.add_argument('--compress-level', type=int, help='Niveau de compression (défaut : 6 pour gzip, 3 pour zstd, 0 pour lz4)')
+    parser.add_argument('--compress-threads', type=int, help='Nombre de threads de compression (défaut : nombre de processeurs)')
+    parser.add_argument('--metrics-file', type=str, help='Écrire les métriques (compteurs, durées par étape) dans ce fichier pendant la génération (JSON si .json, sinon texte Prometheus)')
+    parser.add_argument('--metrics-port', type=int, help='Publier les métriques au format Prometheus sur http://127.0.0.1:PORT/metrics')
+    parser.add_argument('--metrics-interval', type=float, default=10, help='Intervalle entre deux écritures de --metrics-file, en secondes')
+    parser.add_argument('--model', type=str, help='Fuite de référence (un mot de passe par ligne, compressée ou non) : écrire les candidats du plus probable au moins probable')
+    parser.add_argument('--model-sample', type=int, help='Nombre de lignes de --model à apprendre (défaut : toutes)')
+    parser.add_argument('--beam-width', type=int, default=BEAM_WIDTH, help='Nombre d\'états gardés dans la file de priorité de --model (mémoire bornée, ordre approché au-delà)')
 
+    parser.set_defaults(min_chars=6, special_sets={}, extra_words=[], config_suffix=None)
+    parser.set_defaults(**config_defaults)
     args = parser.parse_args()
+    # --suffix (répétable) remplace les suffixes de la configuration au lieu de s'y ajouter
+    args.suffix = args.suffix or args.config_suffix
+    if args.fifo:
+        args.output = args.fifo
+    elif not args.output:
+        parser.error("l'argument --output (ou --fifo) est requis")
+
+    # En mode flux, stdout ne transporte que la wordlist : tout le reste passe par stderr
+    if args.output == '-':
+        with contextlib.redirect_stdout(sys.stderr):
+            run(args)
+    else:
+        run(args)
 
-    output_dir = os.path.dirname(args.output) or '.'
-    if not os.access(output_dir, os.W_OK):
-        print(f"Erreur : impossible d'écrire dans {output_dir}.")
+def run(args):
+    """
+    Exécute la génération à partir des arguments de la ligne de commande.
+    """
+    if args.workers < 1:
+        print("Erreur : --workers doit être supérieur ou égal à 1.")
+        return
+    if args.metrics_interval <= 0:
+        print("Erreur : --metrics-interval doit être positif.")
         return
+    if args.compress_threads is not None and args.compress_threads < 1:
+        print("Erreur : --compress-threads doit être supérieur ou égal à 1.")
+        return
+    if args.skip < 0 or (args.limit is not None and args.limit < 0):
+        print("Erreur : --skip et --limit doivent être positifs.")
+        return
+    node = None
+    if args.node:
+        if args.skip or args.limit is not None:
+            print("Erreur : --node ne peut pas être combiné avec --skip/--limit.")
+            return
+        try:
+            node = parse_node(args.node)
+        except ValueError as e:
+            print(f"Erreur : {e}")
+            return
 
-    # Charger les mots du fichier
+    if args.fifo and not os.path.exists(args.fifo):
+        try:
+            os.mkfifo(args.fifo)
+        except OSError as e:
+            print(f"Erreur : impossible de créer le tube {args.fifo} : {e}")
+            return
+    if args.dedupe and (args.resume or args.keep_shards):
+        print("Erreur : --dedupe ne peut pas être combiné avec --resume ou --keep-shards.")
+        return
+    if not 0 < args.bloom_fp_rate < 1:
+        print("Erreur : --bloom-fp-rate doit être compris entre 0 et 1.")
+        return
+    if is_stream(args.output):
+        if args.resume or args.keep_shards:
+            print("Erreur : --resume et --keep-shards nécessitent un fichier de sortie ordinaire.")
+            return
+        if set(args.formats) - {'plain'}:
+            print("Erreur : les formats hashcat et john nécessitent un fichier de sortie ordinaire.")
+            return
+    else:
+        output_dir = os.path.dirname(args.output) or '.'
+        if not os.access(output_dir, os.W_OK):
+            print(f"Erreur : impossible d'écrire dans {output_dir}.")
+            return
+
+    try:
+        years = parse_year_range(args.years)
+        suffixes = [parse_source(spec, *years) for spec in args.suffix or []]
+    except ValueError as e:
+        print(f"Erreur : {e}")
+        return
+
+    rules = None
+    if args.rules:
+        try:
+            rules = load_rules(args.rules)
+        except (OSError, ValueError) as e:
+            print(f"Erreur : {e}")
+            return
+
+    # Charger les mots du fichier (et ceux du fichier de configuration)
     words = load_words_from_file(args.input)
+    words = list(dict.fromkeys(words + args.extra_words))
 
     # Collecter des entrées supplémentaires (caractères spéciaux, dates, mots)
     special_chars = []
+    dates = []
     if not args.no_interactive:
         special_chars, dates, extra_words = collect_additional_inputs(args)
-        words.extend(dates)
         words.extend(extra_words)
-        words.extend(special_chars)  # Les caractères spéciaux sont aussi des "mots" combinables
+        if args.template:
+            # Avec un gabarit, dates et caractères spéciaux ont leurs propres emplacements
+            if dates:
+                years = (dates[0].start_year, dates[0].end_year)
+        else:
+            suffixes.extend(dates)  # Les dates sont un étage de suffixes, pas des mots combinables
+            words.extend(special_chars)  # Les caractères spéciaux sont aussi des "mots" combinables
+    elif args.special_chars is not None:
+        # Un nom de jeu du fichier de configuration, ou les caractères eux-mêmes
+        special_chars = list(dict.fromkeys(args.special_sets.get(args.special_chars, args.special_chars)))
     else:
         special_chars = ['!', '@', '#', '$', '%']  # Par défaut si non interactif
 
-    if words or special_chars:
-        generate_wordlist(
-            words,
-            args.output,
-            args.max_combinations,
-            args.min_length,
-            args.max_length,
-            args.separator,
-            args.case_variants,
-            special_chars,
-            append_special=bool(special_chars)  # Ajouter les caractères spéciaux au début/fin
+    if words or special_chars or args.template:
+        options = WordlistOptions(
+            max_combinations=args.max_combinations,
+            min_length=args.min_length,
+            max_length=args.max_length,
+            separator=args.separator,
+            case_variants=args.case_variants,
+            special_chars=special_chars,
+            append_special=bool(special_chars),  # Ajouter les caractères spéciaux au début/fin
+            rules=rules,
+            engine=args.engine,
+            workers=args.workers,
+            keep_shards=args.keep_shards,
+            dry_run=args.dry_run,
+            resume=args.resume,
+            checkpoint_interval=args.checkpoint_interval,
+            skip=args.skip,
+            limit=args.limit,
+            node=node,
+            dedupe={'mode': args.dedupe, 'memory': args.dedupe_memory * 1024 * 1024, 'fp_rate': args.bloom_fp_rate} if args.dedupe else None,
+            template=args.template,
+            years=years,
+            suffixes=suffixes,
+            min_char_length=args.min_chars,
+            max_char_length=args.max_chars,
+            probability={'file': args.model, 'sample': args.model_sample, 'beam_width': args.beam_width} if args.model else None,
+            metrics={'file': args.metrics_file, 'port': args.metrics_port, 'interval': args.metrics_interval}
+            if args.metrics_file or args.metrics_port is not None else None,
+            compress={'codec': args.compress or codec_from_path(args.output), 'level': args.compress_level,
+                      'threads': args.compress_threads}
+            if args.compress or codec_from_path(args.output) else None
         )
+        if 'plain' in args.formats:
+            generate_wordlist(words, args.output, options)
+        if set(args.formats) - {'plain'}:
+            export_rule_attack(words, args.output, args.formats, options)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file